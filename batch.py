@@ -0,0 +1,167 @@
+import argparse
+import json
+import time
+
+import numpy as np
+
+from scheduler_engine import NullSink, SchedulerEngine
+from workload import WorkloadGenerator
+
+# Per-process result arrays, each shaped like the workloads
+RESULT_COLUMNS = ('start_time', 'finish_time', 'waiting_time', 'turnaround_time', 'response_time')
+
+
+def generate(workloads, n, seed=0, **options):
+    # `workloads` independent workloads of n processes each, as 2-D
+    # (workloads, n) arrays of arrivals, bursts and priorities. Workload i is
+    # the one WorkloadGenerator(seed=(seed, i), **options) gives, as in the
+    # sweep.
+    columns = [WorkloadGenerator(seed=(seed, i), **options).columns(n) for i in range(workloads)]
+    return tuple(np.array([column[name] for column in columns]).reshape(workloads, n)
+                 for name in ('arrival_times', 'burst_times', 'priorities'))
+
+
+def _as_batch(values, name):
+    values = np.asarray(values)
+    if values.ndim == 1:
+        values = values[np.newaxis]
+    if values.ndim != 2:
+        raise ValueError(f"{name} must be a (workloads, processes) array")
+    return values
+
+
+def fcfs(arrivals, bursts, context_switch=0):
+    # Non-preemptive FCFS over many workloads at once. arrivals and bursts
+    # are (workloads, processes) arrays (one row per workload); returns a
+    # dict of RESULT_COLUMNS arrays of the same shape. Ties in arrival go to
+    # the earlier column, as the engine breaks them by pid.
+    #
+    # In arrival order, each process finishes at F[k] = max(F[k-1], a[k]) +
+    # b[k], where b includes the context switch before it. With S the running
+    # sum of b, that is F[k] = S[k] + max over j <= k of (a[j] - S[j-1]): a
+    # cumulative sum and a running maximum along each row.
+    arrivals, bursts = _as_batch(arrivals, "arrivals"), _as_batch(bursts, "bursts")
+    if arrivals.shape != bursts.shape:
+        raise ValueError("arrivals and bursts must have the same shape")
+    # Rows already in arrival order (generated workloads, most traces) skip
+    # the permutation
+    ordered = (np.diff(arrivals, axis=1) >= 0).all()
+    if ordered:
+        arrival, burst = arrivals, bursts
+    else:
+        order = np.argsort(arrivals, axis=1, kind='stable')
+        arrival = np.take_along_axis(arrivals, order, axis=1)
+        burst = np.take_along_axis(bursts, order, axis=1)
+    charged = burst + context_switch if context_switch else burst
+    total = np.cumsum(charged, axis=1)
+    finish = arrival - total
+    finish += charged
+    np.maximum.accumulate(finish, axis=1, out=finish)
+    finish += total
+
+    results = {}
+    for name, values in (('start_time', finish - burst), ('finish_time', finish)):
+        if ordered:
+            results[name] = values
+        else:
+            results[name] = np.empty_like(values)
+            np.put_along_axis(results[name], order, values, axis=1)
+    results['turnaround_time'] = results['finish_time'] - arrivals
+    results['waiting_time'] = results['turnaround_time'] - bursts
+    results['response_time'] = results['start_time'] - arrivals
+    return results
+
+
+def simulate(algorithm, arrivals, bursts, priorities=None, preemptive=None, quantum=2, context_switch=0):
+    # Any registered algorithm over a batch of workloads, with results shaped
+    # as fcfs() returns them. FCFS is vectorized; every other algorithm runs
+    # one workload at a time through the engine.
+    arrivals, bursts = _as_batch(arrivals, "arrivals"), _as_batch(bursts, "bursts")
+    if algorithm == "FCFS":
+        return fcfs(arrivals, bursts, context_switch)
+    priorities = np.zeros(arrivals.shape, dtype=np.int64) if priorities is None else _as_batch(priorities, "priorities")
+    results = {name: [] for name in RESULT_COLUMNS}
+    pids = np.arange(arrivals.shape[1], dtype=np.int64)
+    for arrival, burst, priority in zip(arrivals, bursts, priorities):
+        engine = SchedulerEngine()
+        engine.sink = NullSink()
+        engine.context_switch = context_switch
+        engine.add_processes(pids, arrival, burst, priority)
+        # Results are in pid order, which is column order here
+        columns = engine.run(algorithm, preemptive=preemptive, quantum=quantum)['processes'].columns()
+        for name in RESULT_COLUMNS:
+            results[name].append(columns[name])
+    return {name: np.array(rows).reshape(arrivals.shape) for name, rows in results.items()}
+
+
+def metrics(results, bursts, context_switch=0):
+    # The engine's scalar metrics for every workload at once, as arrays with
+    # one value per workload. Every process counts as a context switch,
+    # which holds for FCFS; other algorithms switch more often, so their
+    # overhead-based metrics are lower bounds.
+    bursts = _as_batch(bursts, "bursts")
+    n = bursts.shape[1]
+    total_time = results['finish_time'].max(axis=1) if n else np.zeros(len(bursts))
+    busy_time = bursts.sum(axis=1)
+    overhead = np.full(len(bursts), n * context_switch)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        span = np.where(total_time > 0, total_time, 1)
+        summary = {
+            'total_time': total_time,
+            'busy_time': busy_time,
+            'idle_time': total_time - busy_time - overhead,
+            'throughput': np.where(total_time > 0, n / span, 0),
+            'cpu_utilization': np.where(total_time > 0, busy_time / span, 0),
+            'context_switches': np.full(len(bursts), n),
+            'switch_overhead': overhead,
+            'overhead_share': np.where(total_time > 0, overhead / span, 0),
+        }
+    latencies = np.stack([results['waiting_time'], results['turnaround_time'], results['response_time']])
+    if n:
+        percentiles = np.percentile(latencies, [50, 95, 99], axis=2)
+        turnaround = latencies[1]
+        share = np.divide(turnaround - latencies[0], turnaround, out=np.ones(turnaround.shape, dtype=np.float64),
+                          where=turnaround > 0)
+        squares = (share ** 2).sum(axis=1)
+        fairness = np.where(share.any(axis=1), share.sum(axis=1) ** 2 / (n * np.where(squares > 0, squares, 1)), 1.0)
+    for row, name in enumerate(('waiting_time', 'turnaround_time', 'response_time')):
+        values = latencies[row]
+        if n:
+            summary[f'avg_{name}'] = values.mean(axis=1)
+            summary[f'std_{name}'] = values.std(axis=1)
+            summary[f'p50_{name}'] = percentiles[0][row]
+            summary[f'p95_{name}'] = percentiles[1][row]
+            summary[f'p99_{name}'] = percentiles[2][row]
+            summary[f'max_{name}'] = values.max(axis=1)
+        else:
+            for stat in ('avg', 'std', 'p50', 'p95', 'p99', 'max'):
+                summary[f'{stat}_{name}'] = np.zeros(len(bursts))
+    summary['fairness_index'] = fairness if n else np.zeros(len(bursts))
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Monte-Carlo FCFS over many generated workloads at once")
+    parser.add_argument('--workloads', type=int, default=1000)
+    parser.add_argument('--processes', type=int, default=100, help="processes per workload")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--rate', type=float, default=0.1, help="arrivals per time unit")
+    parser.add_argument('--burst-mean', type=float, default=8.0)
+    parser.add_argument('--context-switch', type=float, default=0.0, help="time lost per context switch")
+    args = parser.parse_args(argv)
+
+    arrivals, bursts, _ = generate(args.workloads, args.processes, seed=args.seed, rate=args.rate,
+                                   burst_mean=args.burst_mean)
+    context_switch = int(args.context_switch) if args.context_switch.is_integer() else args.context_switch
+    start = time.perf_counter()
+    summary = metrics(fcfs(arrivals, bursts, context_switch), bursts, context_switch)
+    seconds = time.perf_counter() - start
+    # Distribution of each metric across the workloads
+    report = {name: {'mean': values.mean().item(), 'p5': np.percentile(values, 5).item(),
+                     'p95': np.percentile(values, 95).item()} for name, values in summary.items()}
+    report['seconds'] = seconds
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
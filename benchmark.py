@@ -0,0 +1,174 @@
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+
+from scheduler_engine import ScheduleSink, SchedulerEngine
+from sweep import default_configs
+from workload import WorkloadGenerator
+
+SIZES = (10, 100, 1_000, 10_000, 100_000, 1_000_000)
+
+# Arrival/burst shapes, each offered at about 90% CPU load
+SHAPES = {
+    'poisson-exponential': dict(arrival='poisson', burst='exponential'),
+    'poisson-pareto': dict(arrival='poisson', burst='pareto'),
+    'uniform-lognormal': dict(arrival='uniform', burst='lognormal'),
+    'batch-bimodal': dict(arrival='batch', burst='bimodal'),
+}
+LOAD = 0.9
+BURST_MEAN = 8.0
+
+
+class CountingSink(ScheduleSink):
+    # Counts slices without keeping them, so runs measure the engine itself
+    online_metrics = False
+
+    def open(self, table, code):
+        super().open(table, code)
+        self.slices = 0
+
+    def emit(self, index, start, end):
+        self.slices += 1
+
+
+def _workload(shape, size, seed):
+    generator = WorkloadGenerator(seed=seed, rate=LOAD / BURST_MEAN, burst_mean=BURST_MEAN, **SHAPES[shape])
+    return generator.table(size)
+
+
+def _run(engine, algorithm, preemptive, quantum):
+    engine.run(algorithm, preemptive=preemptive, quantum=quantum)
+    return engine.sink.slices
+
+
+def run_benchmarks(sizes=SIZES, shapes=tuple(SHAPES), configs=None, repeat=3, memory=True, seed=0, log=None):
+    # Time every configuration on every (shape, size) workload. Wall time is
+    # the best of `repeat` untraced runs; peak memory comes from one extra
+    # run under tracemalloc, which is much slower.
+    configs = default_configs(quanta=[4]) if configs is None else configs
+    results = []
+    for shape in shapes:
+        for size in sizes:
+            engine = SchedulerEngine()
+            engine.table = _workload(shape, size, seed)
+            engine.sink = CountingSink()
+            for label, algorithm, preemptive, quantum in configs:
+                seconds = float('inf')
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    slices = _run(engine, algorithm, preemptive, quantum)
+                    seconds = min(seconds, time.perf_counter() - start)
+
+                peak = None
+                if memory:
+                    tracemalloc.start()
+                    _run(engine, algorithm, preemptive, quantum)
+                    peak = tracemalloc.get_traced_memory()[1]
+                    tracemalloc.stop()
+
+                result = {
+                    'algorithm': label,
+                    'shape': shape,
+                    'processes': size,
+                    'seconds': seconds,
+                    'peak_bytes': peak,
+                    'slices': slices,
+                    'slices_per_second': slices / seconds if seconds else None,
+                }
+                results.append(result)
+                if log:
+                    log(result)
+    return results
+
+
+def _key(result):
+    return result['algorithm'], result['shape'], result['processes']
+
+
+def compare(results, baseline, threshold=0.10, min_seconds=0.001):
+    # Flag runs whose wall time or peak memory grew by more than threshold
+    # (a fraction) over the matching baseline run. Wall times under
+    # min_seconds are too noisy to compare.
+    previous = {_key(result): result for result in baseline}
+    regressions = []
+    for result in results:
+        before = previous.get(_key(result))
+        if before is None:
+            continue
+        for metric in ('seconds', 'peak_bytes'):
+            old, new = before.get(metric), result.get(metric)
+            if metric == 'seconds' and old is not None and new is not None and max(old, new) < min_seconds:
+                continue
+            if old and new and new > old * (1 + threshold):
+                regressions.append({
+                    'algorithm': result['algorithm'],
+                    'shape': result['shape'],
+                    'processes': result['processes'],
+                    'metric': metric,
+                    'baseline': old,
+                    'current': new,
+                    'change': new / old - 1,
+                })
+    return regressions
+
+
+def save(path, results):
+    report = {
+        'created': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'results': results,
+    }
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2)
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)['results']
+
+
+def _print_result(result):
+    peak = f"{result['peak_bytes'] / 1e6:9.1f} MB" if result['peak_bytes'] is not None else '        - MB'
+    rate = result['slices_per_second'] or 0
+    print(f"{result['algorithm']:<14} {result['shape']:<20} {result['processes']:>9} "
+          f"{result['seconds']:10.4f} s {peak} {rate:14,.0f} slices/s", flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark every SchedulerEngine algorithm")
+    parser.add_argument('--sizes', default=','.join(map(str, SIZES)), help="comma-separated process counts")
+    parser.add_argument('--shapes', default=','.join(SHAPES), help=f"comma-separated, from {', '.join(SHAPES)}")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--no-memory', action='store_true', help="skip the tracemalloc run")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-o', '--output', help="write results as JSON")
+    parser.add_argument('--baseline', help="JSON from an earlier run to compare against")
+    parser.add_argument('--threshold', type=float, default=0.10, help="allowed slowdown, as a fraction")
+    parser.add_argument('--min-seconds', type=float, default=0.001, help="ignore wall times below this")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(sizes=[int(size) for size in args.sizes.split(',')], shapes=args.shapes.split(','),
+                             repeat=args.repeat, memory=not args.no_memory, seed=args.seed, log=_print_result)
+    if args.output:
+        save(args.output, results)
+
+    if args.baseline:
+        regressions = compare(results, load(args.baseline), args.threshold, args.min_seconds)
+        for regression in regressions:
+            print(f"REGRESSION {regression['algorithm']} {regression['shape']} {regression['processes']} "
+                  f"{regression['metric']}: {regression['baseline']:.4g} -> {regression['current']:.4g} "
+                  f"(+{regression['change']:.0%})")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
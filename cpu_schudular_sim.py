@@ -2,285 +2,156 @@ import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
 import numpy as np
 import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import matplotlib.patches as patches
-from collections import deque
-import random
-import copy
-
-class Process:
-    def __init__(self, pid, arrival_time, burst_time, priority=0):
-        self.pid = pid
-        self.arrival_time = arrival_time
-        self.burst_time = burst_time
-        self.priority = priority
-        self.remaining_time = burst_time
-        self.start_time = None
-        self.finish_time = None
-        self.waiting_time = 0
-        self.turnaround_time = 0
-        self.response_time = None
-        self.execution_history = []
-
-    def reset(self):
-        self.remaining_time = self.burst_time
-        self.start_time = None
-        self.finish_time = None
-        self.waiting_time = 0
-        self.turnaround_time = 0
-        self.response_time = None
-        self.execution_history = []
-
-    def __str__(self):
-        return f"P{self.pid}"
-
-class SchedulerEngine:
-    def __init__(self):
-        self.processes = []
-        self.current_time = 0
-        self.schedule = []
-        self.completed_processes = []
-        self.quantum = 2  # Default quantum for Round Robin
-
-    def add_process(self, pid, arrival_time, burst_time, priority=0):
-        self.processes.append(Process(pid, arrival_time, burst_time, priority))
-
-    def reset(self):
-        self.current_time = 0
-        self.schedule = []
-        self.completed_processes = []
-        for process in self.processes:
-            process.reset()
-
-    def clear_all_processes(self):
-        self.processes = []
-        self.reset()
-
-    def fcfs(self):
-        self.reset()
-        remaining_processes = sorted(copy.deepcopy(self.processes), key=lambda p: (p.arrival_time, p.pid))
-
-        while remaining_processes:
-            # Find the process that has arrived
-            available_process = None
-            for process in remaining_processes:
-                if process.arrival_time <= self.current_time:
-                    available_process = process
-                    break
-
-            if available_process:
-                # If process is starting for the first time
-                if available_process.start_time is None:
-                    available_process.start_time = self.current_time
-                    available_process.response_time = self.current_time - available_process.arrival_time
-
-                # Execute the process
-                time_slice = available_process.remaining_time
-                available_process.execution_history.append((self.current_time, self.current_time + time_slice))
-                self.schedule.append((str(available_process), self.current_time, self.current_time + time_slice))
-
-                # Update times
-                self.current_time += time_slice
-                available_process.remaining_time = 0
-                available_process.finish_time = self.current_time
-                available_process.turnaround_time = available_process.finish_time - available_process.arrival_time
-                available_process.waiting_time = available_process.turnaround_time - available_process.burst_time
-
-                # Add to completed and remove from remaining
-                self.completed_processes.append(available_process)
-                remaining_processes.remove(available_process)
-            else:
-                # No process available, advance time to next arrival
-                self.current_time = min(p.arrival_time for p in remaining_processes)
-
-        return self.get_results()
-
-    def sjf(self, preemptive=False):
-        self.reset()
-        remaining_processes = copy.deepcopy(self.processes)
-
-        while remaining_processes:
-            # Find processes that have arrived
-            available_processes = [p for p in remaining_processes if p.arrival_time <= self.current_time]
-
-            if available_processes:
-                # Sort by remaining time
-                available_processes.sort(key=lambda p: (p.remaining_time, p.arrival_time, p.pid))
-                current_process = available_processes[0]
-
-                # If process is starting for the first time
-                if current_process.start_time is None:
-                    current_process.start_time = self.current_time
-                    current_process.response_time = self.current_time - current_process.arrival_time
-
-                # Determine how long to run
-                if preemptive:
-                    # Find next arrival time or completion time
-                    next_event_time = float('inf')
-                    for p in remaining_processes:
-                        if p.arrival_time > self.current_time and p.arrival_time < next_event_time:
-                            next_event_time = p.arrival_time
-
-                    run_time = min(current_process.remaining_time, next_event_time - self.current_time)
-                    if run_time == float('inf'):  # No future arrivals
-                        run_time = current_process.remaining_time
-                else:
-                    run_time = current_process.remaining_time
-
-                # Execute the process
-                current_process.execution_history.append((self.current_time, self.current_time + run_time))
-                self.schedule.append((str(current_process), self.current_time, self.current_time + run_time))
-                self.current_time += run_time
-                current_process.remaining_time -= run_time
-
-                # Check if process is complete
-                if current_process.remaining_time == 0:
-                    current_process.finish_time = self.current_time
-                    current_process.turnaround_time = current_process.finish_time - current_process.arrival_time
-                    current_process.waiting_time = current_process.turnaround_time - current_process.burst_time
-                    self.completed_processes.append(current_process)
-
-                    # Find corresponding process in remaining_processes
-                    for i, p in enumerate(remaining_processes):
-                        if p.pid == current_process.pid:
-                            remaining_processes.pop(i)
-                            break
-            else:
-                # No process available, advance time to next arrival
-                self.current_time = min(p.arrival_time for p in remaining_processes)
-
-        return self.get_results()
-
-    def round_robin(self):
-        self.reset()
-        remaining_processes = copy.deepcopy(self.processes)
-        ready_queue = deque()
-
-        # Initial queue setup
-        current_process = None
-
-        while remaining_processes or ready_queue or current_process:
-            # Check for new arrivals
-            new_arrivals = [p for p in remaining_processes if p.arrival_time <= self.current_time]
-            for process in new_arrivals:
-                ready_queue.append(process)
-                remaining_processes.remove(process)
-
-            # If no process is running, get one from the queue
-            if current_process is None:
-                if ready_queue:
-                    current_process = ready_queue.popleft()
-                    # If process is starting for the first time
-                    if current_process.start_time is None:
-                        current_process.start_time = self.current_time
-                        current_process.response_time = self.current_time - current_process.arrival_time
-                else:
-                    # No process available, advance time to next arrival
-                    if remaining_processes:
-                        self.current_time = min(p.arrival_time for p in remaining_processes)
-                        continue
-                    else:
-                        break  # No more processes to execute
-
-            # Execute for quantum or remaining time
-            run_time = min(self.quantum, current_process.remaining_time)
-            current_process.execution_history.append((self.current_time, self.current_time + run_time))
-            self.schedule.append((str(current_process), self.current_time, self.current_time + run_time))
-            self.current_time += run_time
-            current_process.remaining_time -= run_time
-
-            # Check for new arrivals again after execution
-            new_arrivals = [p for p in remaining_processes if p.arrival_time <= self.current_time]
-            for process in new_arrivals:
-                ready_queue.append(process)
-                remaining_processes.remove(process)
-
-            # Process the current process
-            if current_process.remaining_time == 0:
-                # Process completed
-                current_process.finish_time = self.current_time
-                current_process.turnaround_time = current_process.finish_time - current_process.arrival_time
-                current_process.waiting_time = current_process.turnaround_time - current_process.burst_time
-                self.completed_processes.append(current_process)
-                current_process = None
-            else:
-                # Process needs more time, back to ready queue
-                ready_queue.append(current_process)
-                current_process = None
-
-        return self.get_results()
-
-    def priority_scheduling(self, preemptive=True):
-        self.reset()
-        remaining_processes = copy.deepcopy(self.processes)
-
-        while remaining_processes:
-            # Find processes that have arrived
-            available_processes = [p for p in remaining_processes if p.arrival_time <= self.current_time]
-
-            if available_processes:
-                # Sort by priority (lower value = higher priority)
-                available_processes.sort(key=lambda p: (p.priority, p.arrival_time, p.pid))
-                current_process = available_processes[0]
-
-                # If process is starting for the first time
-                if current_process.start_time is None:
-                    current_process.start_time = self.current_time
-                    current_process.response_time = self.current_time - current_process.arrival_time
-
-                # Determine how long to run
-                if preemptive:
-                    # Find next arrival time
-                    next_event_time = float('inf')
-                    for p in remaining_processes:
-                        if p.arrival_time > self.current_time and p.arrival_time < next_event_time:
-                            next_event_time = p.arrival_time
-
-                    run_time = min(current_process.remaining_time, next_event_time - self.current_time)
-                    if run_time == float('inf'):  # No future arrivals
-                        run_time = current_process.remaining_time
-                else:
-                    run_time = current_process.remaining_time
-
-                # Execute the process
-                current_process.execution_history.append((self.current_time, self.current_time + run_time))
-                self.schedule.append((str(current_process), self.current_time, self.current_time + run_time))
-                self.current_time += run_time
-                current_process.remaining_time -= run_time
-
-                # Check if process is complete
-                if current_process.remaining_time == 0:
-                    current_process.finish_time = self.current_time
-                    current_process.turnaround_time = current_process.finish_time - current_process.arrival_time
-                    current_process.waiting_time = current_process.turnaround_time - current_process.burst_time
-                    self.completed_processes.append(current_process)
-
-                    # Find corresponding process in remaining_processes
-                    for i, p in enumerate(remaining_processes):
-                        if p.pid == current_process.pid:
-                            remaining_processes.pop(i)
-                            break
-            else:
-                # No process available, advance time to next arrival
-                self.current_time = min(p.arrival_time for p in remaining_processes)
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+from matplotlib.collections import PolyCollection
+from matplotlib.ticker import MaxNLocator
+import queue
+import threading
+
+# The engine lives in scheduler_engine, which imports without Tk,
+# matplotlib or NumPy; its public names are re-exported here for scripts
+# written against this module
+from scheduler_engine import (FINISHED, NICE_0_WEIGHT, PENDING, POLICIES, STARTED, SWITCH_LABEL, BinaryFileSink,
+                              CallbackSink, CFSPolicy, EDFPolicy, FCFSPolicy, GeneratorSink, ListSink, MLFQPolicy,
+                              NullSink, OnlineMetrics, PriorityPolicy, Process, ProcessList, ProcessTable,
+                              ProgressSink, RateMonotonicPolicy, ResultCache, RoundRobinPolicy, Schedule, ScheduleSink,
+                              SchedulerEngine, SchedulingPolicy, SimulationCancelled, SJFPolicy, read_schedule,
+                              register_policy)
+
+
+class GanttChart:
+    # Draws a schedule on one lane of an Axes, or one lane per CPU. Slices
+    # are grouped into one bar collection per lane and process color, and
+    # bars and labels are re-decimated to the visible range on every zoom or
+    # pan, so huge schedules stay interactive.
+    LABEL_MIN_PIXELS = 30  # Narrower bars are not labelled
+    MAX_LABELS = 200
+
+    def __init__(self, ax, y=0, height=0.8):
+        self.ax = ax
+        self.y = y
+        self.height = height
+        self.names = []
+        self.groups = []  # (lane y, starts, ends, process ids, collection), per lane and color
+        self.texts = []
+
+    def draw(self, schedule, lanes=None, lane_names=None):
+        # lanes optionally gives the lane (CPU) of every schedule entry, and
+        # lane_names the tick label of every lane
+        self.draw_columns(*self.columns(schedule), lanes, lane_names)
+
+    @staticmethod
+    def columns(schedule):
+        # (labels, starts, ends) arrays of a Schedule or list of slices
+        if isinstance(schedule, Schedule):
+            # Straight from the columns, with one label per distinct row, so
+            # the jobs of a periodic task share a color
+            owners, starts, ends = schedule.arrays()
+            starts, ends = starts.astype(np.float64), ends.astype(np.float64)
+            rows, inverse = np.unique(owners, return_inverse=True)
+            labels = np.array([schedule.label(row) for row in rows.tolist()], dtype=str)[inverse]
+        else:
+            labels = np.array([label for label, _, _ in schedule], dtype=str)
+            starts = np.array([start for _, start, _ in schedule], dtype=np.float64)
+            ends = np.array([end for _, _, end in schedule], dtype=np.float64)
+        return labels, starts, ends
+
+    def draw_columns(self, labels, starts, ends, lanes=None, lane_names=None):
+        self.ax.clear()
+        self.groups = []
+        self.texts = []
+        if not len(labels):
+            return
 
-        return self.get_results()
+        # Number processes in order of first appearance; colors follow that.
+        # Context-switch segments get id -1 and are drawn gray.
+        switching = labels == SWITCH_LABEL
+        names, first, inverse = np.unique(labels[~switching], return_index=True, return_inverse=True)
+        order = np.argsort(first)
+        rank = np.empty(len(names), dtype=np.int64)
+        rank[order] = np.arange(len(names))
+        ids = np.full(len(labels), -1, dtype=np.int64)
+        ids[~switching] = rank[inverse]
+        self.names = names[order]
+
+        # Each lane's slices never overlap and are emitted in time order
+        lanes = np.zeros(len(ids), dtype=np.int64) if lanes is None else np.asarray(lanes, dtype=np.int64)
+        lane_count = lanes.max() + 1 if lane_names is None else len(lane_names)
+        colors = plt.cm.tab10.colors + ('lightgray',)
+        slice_colors = np.where(switching, len(colors) - 1, ids % (len(colors) - 1))
+        for lane in range(lane_count):
+            in_lane = lanes == lane
+            for color in range(len(colors)):
+                mask = in_lane & (slice_colors == color)
+                if not mask.any():
+                    continue
+                collection = PolyCollection([], facecolors=colors[color], edgecolors='black',
+                                            linewidths=0.5, alpha=0.7)
+                self.ax.add_collection(collection)
+                self.groups.append((self.y + lane, starts[mask], ends[mask], ids[mask], collection))
 
-    def get_results(self):
-        # Sort by PID for consistent display
-        self.completed_processes.sort(key=lambda p: p.pid)
+        # Set labels and grid
+        if lane_names is not None:
+            self.ax.set_yticks(self.y + np.arange(lane_count) + self.height / 2, lane_names, fontsize=8)
+        elif lane_count > 1:
+            self.ax.set_yticks(self.y + np.arange(lane_count) + self.height / 2,
+                               [f"CPU {lane}" for lane in range(lane_count)], fontsize=8)
+        else:
+            self.ax.set_yticks([])
+        self.ax.set_xlabel('Time', fontsize=10)
+        self.ax.set_ylim(self.y - 0.1, self.y + lane_count - 1 + self.height + 0.1)
+        self.ax.grid(True, axis='x', linestyle='--', alpha=0.7)
 
-        avg_waiting_time = np.mean([p.waiting_time for p in self.completed_processes]) if self.completed_processes else 0
-        avg_turnaround_time = np.mean([p.turnaround_time for p in self.completed_processes]) if self.completed_processes else 0
-        avg_response_time = np.mean([p.response_time for p in self.completed_processes]) if self.completed_processes else 0
+        # A bounded number of integer time markers, re-picked on zoom
+        self.ax.xaxis.set_major_locator(MaxNLocator(nbins='auto', integer=True))
+        self.ax.tick_params(axis='x', labelsize=8, pad=2)
+        self.ax.figure.subplots_adjust(bottom=0.2)
+
+        # clear() drops callbacks, so reconnect every time
+        self.ax.callbacks.connect('xlim_changed', lambda ax: self._decimate())
+        self.ax.set_xlim(0, max(ends.max(), 1))
+
+    def _decimate(self):
+        x0, x1 = self.ax.get_xlim()
+        pixel = (x1 - x0) / max(self.ax.get_window_extent().width, 1)
+        for text in self.texts:
+            text.remove()
+        self.texts = []
+
+        for y0, starts, ends, ids, collection in self.groups:
+            y1 = y0 + self.height
+            # Slices are chronological, so the visible ones are a contiguous run
+            lo = np.searchsorted(ends, x0, side='right')
+            hi = np.searchsorted(starts, x1, side='left')
+            if lo >= hi:
+                collection.set_verts([])
+                continue
+            visible_starts, visible_ends, visible_ids = starts[lo:hi], ends[lo:hi], ids[lo:hi]
+
+            # Merge runs of sub-pixel slices separated by less than a pixel
+            # into one bar; wider slices keep their own bars
+            narrow = visible_ends - visible_starts < pixel
+            gaps = np.flatnonzero((visible_starts[1:] - visible_ends[:-1] >= pixel) | ~(narrow[1:] | narrow[:-1]))
+            first = np.r_[0, gaps + 1]
+            bar_starts = visible_starts[first]
+            bar_ends = visible_ends[np.r_[gaps, len(visible_ends) - 1]]
+
+            verts = np.empty((len(first), 4, 2))
+            verts[:, :, 0] = np.column_stack([bar_starts, bar_starts, bar_ends, bar_ends])
+            verts[:, :, 1] = [y0, y1, y1, y0]
+            collection.set_verts(verts)
+            if visible_ids[0] < 0:
+                continue  # Context switches are not labelled
+
+            # Add process labels only to bars of a single process that are
+            # wide enough to hold one
+            single = np.minimum.reduceat(visible_ids, first) == np.maximum.reduceat(visible_ids, first)
+            wide = np.flatnonzero(single & (bar_ends - bar_starts >= self.LABEL_MIN_PIXELS * pixel))
+            for k in wide[:max(0, self.MAX_LABELS - len(self.texts))]:
+                self.texts.append(self.ax.text((bar_starts[k] + bar_ends[k]) / 2, (y0 + y1) / 2,
+                                               self.names[visible_ids[first[k]]], ha='center', va='center',
+                                               color='black', fontweight='bold', clip_on=True))
 
-        return {
-            'schedule': self.schedule,
-            'processes': self.completed_processes,
-            'avg_waiting_time': avg_waiting_time,
-            'avg_turnaround_time': avg_turnaround_time,
-            'avg_response_time': avg_response_time
-        }
 
 class CPUSchedulerApp:
     def __init__(self, root):
@@ -290,10 +161,16 @@ class CPUSchedulerApp:
         self.root.config(bg="#f5f5f5")
 
         self.scheduler = SchedulerEngine()
+        self.scheduler.cache = ResultCache()  # Re-running an earlier setup is instant
         self.results = {}
         self.algorithm_var = tk.StringVar(value="FCFS")
         self.preemptive_var = tk.BooleanVar(value=False)
         self.quantum_var = tk.IntVar(value=2)
+        self.cpus_var = tk.IntVar(value=1)
+        self.per_cpu_var = tk.BooleanVar(value=False)
+        self.switch_var = tk.IntVar(value=0)
+        self.worker = None  # Thread running the current simulation
+        self.details_job = None  # Pending after() batch of detail rows
 
         self.create_widgets()
         self.setup_demo_processes()
@@ -327,27 +204,44 @@ class CPUSchedulerApp:
         self.priority_var = tk.IntVar()
         ttk.Entry(process_frame, textvariable=self.priority_var, width=10).grid(row=3, column=1, padx=5, pady=2)
 
+        # Optional; blank for none
+        ttk.Label(process_frame, text="Deadline:").grid(row=4, column=0, sticky=tk.W, padx=5, pady=2)
+        self.deadline_var = tk.StringVar()
+        ttk.Entry(process_frame, textvariable=self.deadline_var, width=10).grid(row=4, column=1, padx=5, pady=2)
+
+        ttk.Label(process_frame, text="Period:").grid(row=5, column=0, sticky=tk.W, padx=5, pady=2)
+        self.period_var = tk.StringVar()
+        ttk.Entry(process_frame, textvariable=self.period_var, width=10).grid(row=5, column=1, padx=5, pady=2)
+
         # Buttons for process management
         btn_frame = ttk.Frame(left_frame)
         btn_frame.pack(fill=tk.X, pady=5)
 
-        ttk.Button(btn_frame, text="Add Process", command=self.add_process).grid(row=0, column=0, padx=5, pady=5)
-        ttk.Button(btn_frame, text="Clear All", command=self.clear_processes).grid(row=0, column=1, padx=5, pady=5)
-        ttk.Button(btn_frame, text="Load Demo", command=self.setup_demo_processes).grid(row=0, column=2, padx=5, pady=5)
+        self.process_buttons = [
+            ttk.Button(btn_frame, text="Add Process", command=self.add_process),
+            ttk.Button(btn_frame, text="Clear All", command=self.clear_processes),
+            ttk.Button(btn_frame, text="Load Demo", command=self.setup_demo_processes),
+            ttk.Button(btn_frame, text="Random", command=self.setup_random_processes),
+        ]
+        for column, button in enumerate(self.process_buttons):
+            button.grid(row=0, column=column, padx=5, pady=5)
 
         # Process table
-        self.process_tree = ttk.Treeview(left_frame, columns=("PID", "Arrival", "Burst", "Priority"), show="headings", height=10)
+        self.process_tree = ttk.Treeview(left_frame, columns=("PID", "Arrival", "Burst", "Priority", "Deadline"),
+                                         show="headings", height=10)
         self.process_tree.pack(fill=tk.BOTH, expand=True, pady=5)
 
         self.process_tree.heading("PID", text="PID")
         self.process_tree.heading("Arrival", text="Arrival Time")
         self.process_tree.heading("Burst", text="Burst Time")
         self.process_tree.heading("Priority", text="Priority")
+        self.process_tree.heading("Deadline", text="Deadline")
 
         self.process_tree.column("PID", width=50)
         self.process_tree.column("Arrival", width=80)
         self.process_tree.column("Burst", width=80)
         self.process_tree.column("Priority", width=80)
+        self.process_tree.column("Deadline", width=80)
 
         # Algorithm selection
         algo_frame = ttk.LabelFrame(left_frame, text="Algorithm Selection", padding=10)
@@ -375,8 +269,37 @@ class CPUSchedulerApp:
         self.priority_preemptive_var = tk.BooleanVar(value=True)
         ttk.Checkbutton(prio_preemp_frame, text="Preemptive", variable=self.priority_preemptive_var).pack(side=tk.LEFT, padx=20)
 
+        ttk.Radiobutton(algo_frame, text="Multilevel Feedback Queue (MLFQ)", variable=self.algorithm_var, value="MLFQ").pack(anchor=tk.W)
+        ttk.Radiobutton(algo_frame, text="Completely Fair Scheduler (CFS)", variable=self.algorithm_var, value="CFS").pack(anchor=tk.W)
+        ttk.Radiobutton(algo_frame, text="Earliest Deadline First (EDF)", variable=self.algorithm_var, value="EDF").pack(anchor=tk.W)
+        ttk.Radiobutton(algo_frame, text="Rate-Monotonic (RM)", variable=self.algorithm_var, value="RM").pack(anchor=tk.W)
+
+        # Processors
+        cpu_frame = ttk.LabelFrame(left_frame, text="Processors", padding=10)
+        cpu_frame.pack(fill=tk.X, pady=5)
+        ttk.Label(cpu_frame, text="CPUs:").pack(side=tk.LEFT)
+        ttk.Spinbox(cpu_frame, from_=1, to=64, textvariable=self.cpus_var, width=5).pack(side=tk.LEFT, padx=5)
+        ttk.Checkbutton(cpu_frame, text="Per-CPU queues (work stealing)", variable=self.per_cpu_var).pack(side=tk.LEFT, padx=10)
+
+        switch_frame = ttk.Frame(left_frame)
+        switch_frame.pack(fill=tk.X, pady=2)
+        ttk.Label(switch_frame, text="Context Switch Time:").pack(side=tk.LEFT, padx=10)
+        ttk.Spinbox(switch_frame, from_=0, to=10, textvariable=self.switch_var, width=5).pack(side=tk.LEFT)
+
         # Run simulation button
-        ttk.Button(left_frame, text="Run Simulation", command=self.run_simulation, style="Accent.TButton").pack(fill=tk.X, pady=10)
+        self.run_button = ttk.Button(left_frame, text="Run Simulation", command=self.run_simulation, style="Accent.TButton")
+        self.run_button.pack(fill=tk.X, pady=10)
+
+        # Progress of a running simulation
+        progress_frame = ttk.Frame(left_frame)
+        progress_frame.pack(fill=tk.X)
+        self.progress = ttk.Progressbar(progress_frame, maximum=1.0)
+        self.progress.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        self.cancel_button = ttk.Button(progress_frame, text="Cancel", command=self.cancel_simulation, state=tk.DISABLED)
+        self.cancel_button.pack(side=tk.LEFT, padx=5)
+
+        self.compare_button = ttk.Button(left_frame, text="Compare Algorithms...", command=self.open_comparison)
+        self.compare_button.pack(fill=tk.X, pady=5)
 
         # Right panel (results)
         right_frame = ttk.LabelFrame(main_frame, text="Simulation Results", padding=10)
@@ -389,6 +312,12 @@ class CPUSchedulerApp:
         self.fig, self.ax = plt.subplots(figsize=(8, 3))
         self.canvas = FigureCanvasTkAgg(self.fig, master=gantt_frame)
         self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.gantt = GanttChart(self.ax)
+
+        # Toolbar for zooming and panning the chart
+        toolbar = NavigationToolbar2Tk(self.canvas, gantt_frame, pack_toolbar=False)
+        toolbar.update()
+        toolbar.pack(fill=tk.X)
 
         # Metrics
         metrics_frame = ttk.LabelFrame(right_frame, text="Performance Metrics", padding=10)
@@ -404,6 +333,9 @@ class CPUSchedulerApp:
         self.details_tree = ttk.Treeview(details_frame,
                                          columns=("PID", "Start", "Finish", "Turnaround", "Waiting", "Response"),
                                          show="headings", height=6)
+        details_scroll = ttk.Scrollbar(details_frame, orient=tk.VERTICAL, command=self.details_tree.yview)
+        self.details_tree.configure(yscrollcommand=details_scroll.set)
+        details_scroll.pack(side=tk.RIGHT, fill=tk.Y)
         self.details_tree.pack(fill=tk.BOTH, expand=True)
 
         self.details_tree.heading("PID", text="PID")
@@ -430,34 +362,42 @@ class CPUSchedulerApp:
             arrival = self.arrival_var.get()
             burst = self.burst_var.get()
             priority = self.priority_var.get()
+            deadline, period = (self._optional_number(var.get()) for var in (self.deadline_var, self.period_var))
 
             if not pid or burst <= 0:
                 messagebox.showerror("Error", "Process ID must not be empty and Burst Time must be positive")
                 return
 
-            self.scheduler.add_process(pid, arrival, burst, priority)
+            self.scheduler.add_process(pid, arrival, burst, priority, deadline, period)
 
             # Add to treeview
-            self.process_tree.insert("", "end", values=(pid, arrival, burst, priority))
+            self.process_tree.insert("", "end", values=(pid, arrival, burst, priority, "" if deadline is None else deadline))
 
             # Clear inputs
             self.pid_var.set("")
             self.arrival_var.set(0)
             self.burst_var.set(0)
             self.priority_var.set(0)
+            self.deadline_var.set("")
+            self.period_var.set("")
 
         except Exception as e:
             messagebox.showerror("Error", f"Failed to add process: {str(e)}")
 
+    @staticmethod
+    def _optional_number(text):
+        text = text.strip()
+        if not text:
+            return None
+        value = float(text)
+        return int(value) if value.is_integer() else value
+
     def clear_processes(self):
         self.scheduler.clear_all_processes()
 
         # Clear treeviews
-        for item in self.process_tree.get_children():
-            self.process_tree.delete(item)
-
-        for item in self.details_tree.get_children():
-            self.details_tree.delete(item)
+        self.process_tree.delete(*self.process_tree.get_children())
+        self.clear_details()
 
         # Clear Gantt chart
         self.ax.clear()
@@ -481,24 +421,78 @@ class CPUSchedulerApp:
             self.scheduler.add_process(pid, arrival, burst, priority)
             self.process_tree.insert("", "end", values=(pid, arrival, burst, priority))
 
+    def setup_random_processes(self, count=8):
+        from workload import WorkloadGenerator
+
+        self.clear_processes()
+
+        # A small random workload: about one arrival every two time units
+        columns = WorkloadGenerator(rate=0.5, burst_mean=5, priority_levels=5).columns(count)
+        for pid, arrival, burst, priority in zip(columns['pids'].tolist(), columns['arrival_times'].tolist(),
+                                                 columns['burst_times'].tolist(), columns['priorities'].tolist()):
+            pid = f"P{pid + 1}"
+            self.scheduler.add_process(pid, arrival, burst, priority)
+            self.process_tree.insert("", "end", values=(pid, arrival, burst, priority))
+
     def run_simulation(self):
-        # Clear previous results
-        for item in self.details_tree.get_children():
-            self.details_tree.delete(item)
+        if self.worker is not None:
+            return
+        self.clear_details()
 
-        # Get selected algorithm
+        # Read the settings here; Tk variables belong to the main thread
         algorithm = self.algorithm_var.get()
-        self.scheduler.quantum = self.quantum_var.get()
-
-        # Run simulation
-        if algorithm == "FCFS":
-            self.results = self.scheduler.fcfs()
-        elif algorithm == "SJF":
-            self.results = self.scheduler.sjf(preemptive=self.sjf_preemptive_var.get())
-        elif algorithm == "RR":
-            self.results = self.scheduler.round_robin()
+        if algorithm == "SJF":
+            preemptive = self.sjf_preemptive_var.get()
         elif algorithm == "Priority":
-            self.results = self.scheduler.priority_scheduling(preemptive=self.priority_preemptive_var.get())
+            preemptive = self.priority_preemptive_var.get()
+        else:
+            preemptive = None
+        quantum = self.quantum_var.get()
+        self.scheduler.context_switch = self.switch_var.get()
+        options = {}
+        if self.cpus_var.get() > 1:
+            options = {'cpus': self.cpus_var.get(), 'queues': "per-cpu" if self.per_cpu_var.get() else "global"}
+
+        # The controls stay live during the run, so the results are labelled
+        # with the settings it started with
+        self.run_settings = (algorithm, preemptive, quantum)
+
+        # Simulate on a worker thread and poll it from the Tk event loop
+        self.sink = ProgressSink()
+        self.scheduler.sink = self.sink
+        self.outcome = None
+        self.worker = threading.Thread(target=self._simulate, args=(algorithm, preemptive, quantum, options),
+                                       daemon=True)
+        self._set_running(True)
+        self.worker.start()
+        self.root.after(50, self._poll_simulation)
+
+    def _simulate(self, algorithm, preemptive, quantum, options):
+        try:
+            self.outcome = self.scheduler.run(algorithm, preemptive=preemptive, quantum=quantum, **options)
+        except SimulationCancelled:
+            self.outcome = None
+        except Exception as e:
+            self.outcome = e
+
+    def _poll_simulation(self):
+        self.progress['value'] = self.sink.progress
+        if self.worker.is_alive():
+            self.root.after(50, self._poll_simulation)
+            return
+
+        self.worker = None
+        self.scheduler.sink = None
+        self._set_running(False)
+        if not isinstance(self.outcome, dict):
+            # Cancelled or failed; drop the partial run
+            self.scheduler.reset()
+            self.progress['value'] = 0
+            if self.outcome is not None:
+                messagebox.showerror("Error", f"Simulation failed: {self.outcome}")
+            return
+
+        self.results = self.outcome
 
         # Update Gantt chart
         self.update_gantt_chart()
@@ -509,57 +503,24 @@ class CPUSchedulerApp:
         # Update process details
         self.update_process_details()
 
-    def update_gantt_chart(self):
-        self.ax.clear()
+    def cancel_simulation(self):
+        if self.worker is not None:
+            self.sink.cancel()
 
-        schedule = self.results['schedule']
-        if not schedule:
+    def open_comparison(self):
+        if not len(self.scheduler.table):
+            messagebox.showerror("Error", "Add some processes first")
             return
+        ComparisonWindow(self.root, self.scheduler.table, self.switch_var.get(), self.quantum_var.get())
 
-        # Colors for processes
-        colors = plt.cm.tab10.colors
-        pid_colors = {}
-
-        # Assign colors to unique PIDs
-        unique_pids = set(pid for pid, _, _ in schedule)
-        for i, pid in enumerate(unique_pids):
-            pid_colors[pid] = colors[i % len(colors)]
-
-        # Plot Gantt chart
-        y_pos = 0
-        for pid, start, end in schedule:
-            self.ax.broken_barh([(start, end - start)], (y_pos, 0.8),
-                                facecolors=pid_colors[pid], edgecolor='black', alpha=0.7)
-
-            # Add process label
-            self.ax.text(start + (end - start) / 2, y_pos + 0.4, pid,
-                         ha='center', va='center', color='black', fontweight='bold')
-
-        # Set labels and grid
-        self.ax.set_yticks([])
-        self.ax.set_xlabel('Time', fontsize=10)
-
-        # Set x-axis limits
-        max_time = max(end for _, _, end in schedule)
-        self.ax.set_xlim(0, max_time)
-
-        # Add grid
-        self.ax.grid(True, axis='x', linestyle='--', alpha=0.7)
-
-        # Add time markers with improved spacing and smaller font
-        x_ticks = list(range(0, int(max_time) + 1))
-        self.ax.set_xticks(x_ticks)
-
-        # Set smaller font size for x-axis tick labels and increase spacing
-        self.ax.tick_params(axis='x', labelsize=8, pad=2)
-
-        # Improve spacing between tick labels by rotating them slightly if needed
-        if max_time > 15:  # If we have many time units, rotate labels for better spacing
-            plt.setp(self.ax.get_xticklabels(), rotation=30, ha='right')
-
-        # Adjust bottom margin to ensure labels are visible
-        self.fig.subplots_adjust(bottom=0.2)
+    def _set_running(self, running):
+        state = tk.DISABLED if running else tk.NORMAL
+        for button in self.process_buttons + [self.run_button]:
+            button.config(state=state)
+        self.cancel_button.config(state=tk.NORMAL if running else tk.DISABLED)
 
+    def update_gantt_chart(self):
+        self.gantt.draw(self.results['schedule'], self.results.get('cores'))
         self.canvas.draw()
 
     def update_metrics(self):
@@ -567,16 +528,18 @@ class CPUSchedulerApp:
         avg_turnaround = self.results.get('avg_turnaround_time', 0)
         avg_response = self.results.get('avg_response_time', 0)
 
-        algorithm = self.algorithm_var.get()
+        algorithm, preemptive, quantum = self.run_settings
         algo_details = algorithm
 
-        if algorithm == "SJF" and self.sjf_preemptive_var.get():
+        if algorithm == "SJF" and preemptive:
             algo_details += " (Preemptive/SRTF)"
         elif algorithm == "SJF":
             algo_details += " (Non-preemptive)"
         elif algorithm == "RR":
-            algo_details += f" (Quantum={self.quantum_var.get()})"
-        elif algorithm == "Priority" and self.priority_preemptive_var.get():
+            algo_details += f" (Quantum={quantum})"
+        elif algorithm == "MLFQ":
+            algo_details += f" (Base Quantum={quantum})"
+        elif algorithm == "Priority" and preemptive:
             algo_details += " (Preemptive)"
         elif algorithm == "Priority":
             algo_details += " (Non-preemptive)"
@@ -586,24 +549,291 @@ class CPUSchedulerApp:
             f"Average Waiting Time: {avg_waiting:.2f} time units\n"
             f"Average Turnaround Time: {avg_turnaround:.2f} time units\n"
             f"Average Response Time: {avg_response:.2f} time units\n"
-            f"Total Execution Time: {self.scheduler.current_time} time units\n"
+            f"Total Execution Time: {self.scheduler.current_time} time units\n\n"
+            f"Waiting Time p50/p95/p99/max: {self.results.get('p50_waiting_time', 0):.2f} / "
+            f"{self.results.get('p95_waiting_time', 0):.2f} / {self.results.get('p99_waiting_time', 0):.2f} / "
+            f"{self.results.get('max_waiting_time', 0):.2f}\n"
+            f"Response Time p50/p95/p99/max: {self.results.get('p50_response_time', 0):.2f} / "
+            f"{self.results.get('p95_response_time', 0):.2f} / {self.results.get('p99_response_time', 0):.2f} / "
+            f"{self.results.get('max_response_time', 0):.2f}\n"
+            f"CPU Utilization: {self.results.get('cpu_utilization', 0):.1%} "
+            f"(idle {self.results.get('idle_time', 0)} time units)\n"
+            f"Throughput: {self.results.get('throughput', 0):.3f} processes per time unit\n"
+            f"Fairness (Jain's index): {self.results.get('fairness_index', 0):.3f}\n"
+            f"Context Switches: {self.results.get('context_switches', 0)} "
+            f"(overhead {self.results.get('overhead_share', 0):.1%} of the time)\n"
         )
+        if 'cpus' in self.results:
+            utilization = self.results['core_utilization']
+            metrics_text += (
+                f"\nCPUs: {self.results['cpus']}, per-CPU utilization min/avg/max: {min(utilization):.1%} / "
+                f"{sum(utilization) / len(utilization):.1%} / {max(utilization):.1%}\n"
+                f"Migrations: {self.results['migrations']}\n"
+            )
+        if 'miss_ratio' in self.results:
+            metrics_text += (
+                f"\nDeadline Misses: {self.results['deadline_misses']} of {self.results['deadline_processes']} "
+                f"({self.results['miss_ratio']:.1%})\n"
+                f"Lateness p50/p95/p99/max: {self.results['p50_lateness']:.2f} / {self.results['p95_lateness']:.2f} / "
+                f"{self.results['p99_lateness']:.2f} / {self.results['max_lateness']:.2f}\n"
+                f"Tardiness avg/p95/max: {self.results['avg_tardiness']:.2f} / {self.results['p95_tardiness']:.2f} / "
+                f"{self.results['max_tardiness']:.2f}\n"
+            )
 
         self.metrics_text.delete(1.0, tk.END)
         self.metrics_text.insert(tk.END, metrics_text)
 
+    DETAIL_BATCH = 2000  # Rows inserted per event-loop turn
+
     def update_process_details(self):
-        processes = self.results.get('processes', [])
-
-        for p in processes:
-            self.details_tree.insert("", "end", values=(
-                p.pid,
-                p.start_time,
-                p.finish_time,
-                p.turnaround_time,
-                p.waiting_time,
-                p.response_time
-            ))
+        # Insert rows in batches from after() callbacks so the window stays
+        # responsive while large results load
+        columns = self.results['processes'].columns()
+        names = ('pid', 'start_time', 'finish_time', 'turnaround_time', 'waiting_time', 'response_time')
+        self.detail_rows = list(zip(*(columns[name].tolist() for name in names)))
+        self._insert_details(0)
+
+    def _insert_details(self, offset):
+        for values in self.detail_rows[offset:offset + self.DETAIL_BATCH]:
+            self.details_tree.insert("", "end", values=values)
+        offset += self.DETAIL_BATCH
+        if offset < len(self.detail_rows):
+            self.details_job = self.root.after(1, self._insert_details, offset)
+        else:
+            self.details_job = None
+
+    def clear_details(self):
+        if self.details_job is not None:
+            self.root.after_cancel(self.details_job)
+            self.details_job = None
+        self.details_tree.delete(*self.details_tree.get_children())
+
+class ComparisonWindow:
+    # Runs several algorithms over one workload in a process pool and shows
+    # their Gantt lanes, metrics and latency CDFs side by side, updated as
+    # each run finishes
+    ALGORITHMS = (
+        ("FCFS", "FCFS", None),
+        ("SJF", "SJF", False),
+        ("SRTF", "SRTF", True),
+        ("Priority", "Priority", True),
+        ("Priority (NP)", "Priority", False),
+        ("MLFQ", "MLFQ", None),
+        ("CFS", "CFS", None),
+        ("EDF", "EDF", None),
+        ("RM", "RM", None),
+        ("RR", "RR", None),
+    )
+    METRICS = (  # (heading, result key, format)
+        ("Avg Wait", 'avg_waiting_time', "{:.2f}"),
+        ("p95 Wait", 'p95_waiting_time', "{:.2f}"),
+        ("p99 Wait", 'p99_waiting_time', "{:.2f}"),
+        ("Avg Turnaround", 'avg_turnaround_time', "{:.2f}"),
+        ("p99 Turnaround", 'p99_turnaround_time', "{:.2f}"),
+        ("p99 Response", 'p99_response_time', "{:.2f}"),
+        ("CPU Util", 'cpu_utilization', "{:.1%}"),
+        ("Switches", 'context_switches', "{}"),
+        ("Deadline Misses", 'miss_ratio', "{:.1%}"),
+    )
+    CDF_POINTS = 2000  # Points drawn per CDF curve
+
+    def __init__(self, root, table, context_switch=0, quantum=2):
+        self.root = root
+        self.table = table  # The main window's; compare() snapshots it per run
+        self.context_switch = context_switch
+        self.window = tk.Toplevel(root)
+        self.window.title("Algorithm Comparison")
+        self.window.geometry("1100x800")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        self.selected = {label: tk.BooleanVar(value=True) for label, _, _ in self.ALGORITHMS}
+        self.quanta_var = tk.StringVar(value=f"{quantum},{2 * quantum},{4 * quantum}")
+        self.cdf_var = tk.StringVar(value="response_time")
+        self.worker = None  # Thread collecting finished runs
+        self.stopping = threading.Event()
+        self.finished = queue.Queue()
+        self.configs = []
+        self.rows = {}  # Finished runs by configuration index
+        self.lanes = {}  # Their (labels, starts, ends) schedule columns
+
+        self.create_widgets()
+
+    def create_widgets(self):
+        controls = ttk.Frame(self.window, padding=5)
+        controls.pack(fill=tk.X)
+        for label, _, _ in self.ALGORITHMS:
+            ttk.Checkbutton(controls, text=label, variable=self.selected[label]).pack(side=tk.LEFT, padx=2)
+        ttk.Label(controls, text="RR quanta:").pack(side=tk.LEFT, padx=(10, 2))
+        ttk.Entry(controls, textvariable=self.quanta_var, width=10).pack(side=tk.LEFT)
+        self.run_button = ttk.Button(controls, text="Run", command=self.run)
+        self.run_button.pack(side=tk.LEFT, padx=5)
+        self.cancel_button = ttk.Button(controls, text="Cancel", command=self.cancel, state=tk.DISABLED)
+        self.cancel_button.pack(side=tk.LEFT)
+        self.status_var = tk.StringVar()
+        ttk.Label(controls, textvariable=self.status_var).pack(side=tk.LEFT, padx=10)
+
+        # Gantt lanes over the CDFs, with a shared toolbar
+        charts = ttk.Frame(self.window)
+        charts.pack(fill=tk.BOTH, expand=True)
+        self.fig, (self.gantt_ax, self.cdf_ax) = plt.subplots(2, 1, figsize=(10, 6),
+                                                              gridspec_kw={'height_ratios': (3, 2)})
+        self.canvas = FigureCanvasTkAgg(self.fig, master=charts)
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.gantt = GanttChart(self.gantt_ax)
+        toolbar = NavigationToolbar2Tk(self.canvas, charts, pack_toolbar=False)
+        toolbar.update()
+        toolbar.pack(fill=tk.X)
+
+        cdf_frame = ttk.Frame(self.window, padding=5)
+        cdf_frame.pack(fill=tk.X)
+        ttk.Label(cdf_frame, text="CDF of:").pack(side=tk.LEFT)
+        for text, value in (("Response", "response_time"), ("Waiting", "waiting_time"),
+                            ("Turnaround", "turnaround_time")):
+            ttk.Radiobutton(cdf_frame, text=text, variable=self.cdf_var, value=value,
+                            command=self.draw_cdfs).pack(side=tk.LEFT, padx=5)
+
+        # One metrics row per finished run, in configuration order
+        headings = ("Algorithm",) + tuple(heading for heading, _, _ in self.METRICS)
+        self.metrics_tree = ttk.Treeview(self.window, columns=headings, show="headings", height=8)
+        self.metrics_tree.pack(fill=tk.X, padx=5, pady=5)
+        for heading in headings:
+            self.metrics_tree.heading(heading, text=heading)
+            self.metrics_tree.column(heading, width=90, anchor=tk.E if heading != "Algorithm" else tk.W)
+
+    def selected_configs(self):
+        from sweep import default_configs  # Only needed here
+        quanta = [int(part) for part in self.quanta_var.get().replace(' ', '').split(',') if part]
+        if any(q <= 0 for q in quanta):
+            raise ValueError("RR quanta must be positive")
+        configs = []
+        for label, algorithm, preemptive in self.ALGORITHMS:
+            if not self.selected[label].get():
+                continue
+            if algorithm == "RR":
+                configs.extend(config for config in default_configs(quanta) if config[1] == "RR")
+            else:
+                # MLFQ's base quantum is the first RR quantum
+                configs.append((label, algorithm, preemptive, quanta[0] if algorithm == "MLFQ" and quanta else None))
+        return configs
+
+    def run(self):
+        if self.worker is not None:
+            return
+        try:
+            self.configs = self.selected_configs()
+        except ValueError as e:
+            messagebox.showerror("Error", f"Invalid input: {e}", parent=self.window)
+            return
+        if not self.configs:
+            return
+
+        self.rows = {}
+        self.lanes = {}
+        self.metrics_tree.delete(*self.metrics_tree.get_children())
+        self.draw()
+        self.stopping.clear()
+        # compare() takes its read-only copy of the workload here, on the Tk
+        # thread, so the main window can go on editing its processes
+        from sweep import compare  # Only needed here
+        runs = compare(self.table, self.configs, context_switch=self.context_switch)
+        self.worker = threading.Thread(target=self._compare, args=(runs,), daemon=True)
+        self.run_button.config(state=tk.DISABLED)
+        self.cancel_button.config(state=tk.NORMAL)
+        self.status_var.set(f"0 of {len(self.configs)} done")
+        self.worker.start()
+        self.root.after(100, self._poll)
+
+    def _compare(self, runs):
+        try:
+            for row in runs:
+                if self.stopping.is_set():
+                    break
+                self.finished.put(row)
+        except Exception as e:
+            self.finished.put(e)
+        finally:
+            runs.close()
+
+    def _poll(self):
+        if not self.window.winfo_exists():
+            return
+        # Show everything that finished since the last poll in one repaint
+        rows = []
+        while not self.finished.empty():
+            row = self.finished.get()
+            if isinstance(row, Exception):
+                messagebox.showerror("Error", f"Comparison failed: {row}", parent=self.window)
+            else:
+                rows.append(row)
+        for row in rows:
+            self.add_row(row)
+        if rows:
+            self.draw()
+
+        if self.worker.is_alive():
+            self.root.after(100, self._poll)
+            return
+        self.worker = None
+        self.run_button.config(state=tk.NORMAL)
+        self.cancel_button.config(state=tk.DISABLED)
+        if len(self.rows) < len(self.configs):
+            self.status_var.set(f"Stopped, {len(self.rows)} of {len(self.configs)} done")
+
+    def add_row(self, row):
+        self.rows[row['config']] = row
+        self.lanes[row['config']] = GanttChart.columns(row['schedule'])  # Converted once, redrawn often
+        values = [row['label']]
+        for _, key, spec in self.METRICS:
+            values.append(spec.format(row[key]) if key in row else "-")
+        position = sum(config < row['config'] for config in self.rows)
+        self.metrics_tree.insert("", position, values=values)
+        self.status_var.set(f"{len(self.rows)} of {len(self.configs)} done")
+
+    def draw(self):
+        self.draw_lanes()
+        self.draw_cdfs()
+
+    def draw_lanes(self):
+        # One lane per finished run, top to bottom in configuration order
+        order = sorted(self.rows, reverse=True)
+        if not order:
+            self.gantt.draw([])
+            return
+        columns = [self.lanes[config] for config in order]
+        labels, starts, ends = (np.concatenate(parts) for parts in zip(*columns))
+        lanes = np.repeat(np.arange(len(order)), [len(column[0]) for column in columns])
+        self.gantt.draw_columns(labels, starts, ends, lanes, [self.rows[config]['label'] for config in order])
+        self.gantt_ax.set_xlabel('')
+
+    def draw_cdfs(self):
+        self.cdf_ax.clear()
+        name = self.cdf_var.get()
+        for config in sorted(self.rows):
+            values = np.sort(np.asarray(self.rows[config]['latencies'][name], dtype=np.float64))
+            if not len(values):
+                continue
+            # Evenly spaced ranks keep the curve, tail included, at a bounded size
+            ranks = np.unique(np.linspace(0, len(values) - 1, self.CDF_POINTS).astype(np.int64))
+            self.cdf_ax.step(values[ranks], (ranks + 1) / len(values), where='post', label=self.rows[config]['label'])
+        for level in (0.95, 0.99):
+            self.cdf_ax.axhline(level, color='gray', linestyle=':', linewidth=0.8)
+        self.cdf_ax.set_xlabel(name.replace('_', ' ').capitalize(), fontsize=10)
+        self.cdf_ax.set_ylabel('Fraction of processes', fontsize=8)
+        self.cdf_ax.set_ylim(0, 1.02)
+        self.cdf_ax.grid(True, linestyle='--', alpha=0.5)
+        if self.rows:
+            self.cdf_ax.legend(fontsize=7, loc='lower right', ncol=2)
+        self.fig.tight_layout()
+        self.canvas.draw_idle()
+
+    def cancel(self):
+        self.stopping.set()
+
+    def close(self):
+        self.stopping.set()
+        self.window.destroy()
+        plt.close(self.fig)
+
 
 if __name__ == "__main__":
     root = tk.Tk()
@@ -0,0 +1,406 @@
+import argparse
+import asyncio
+import heapq
+import itertools
+import json
+import sys
+from collections import deque
+
+import numpy as np
+
+from scheduler_engine import (PENDING, POLICIES, ListSink, NullSink, OnlineMetrics, ProcessTable, SchedulerEngine,
+                               SchedulingPolicy)
+
+
+def _job(pid, arrival_time=None, burst_time=None, priority=0, deadline=None, period=None):
+    # Normalize a job to (pid, arrival, burst, priority, deadline, period);
+    # burst may be a sequence of alternating CPU and I/O bursts
+    if isinstance(burst_time, (list, tuple)):
+        burst_time = tuple(burst_time)
+        if len(burst_time) % 2 == 0:
+            raise ValueError("Burst sequences alternate CPU and I/O bursts and start and end with CPU")
+    elif burst_time is None:
+        raise ValueError(f"Job {pid} has no burst time")
+    return pid, arrival_time, burst_time, priority, deadline, period
+
+
+class LiveScheduler:
+    # Schedules a stream of jobs as they come in, e.g. to replay an arrival
+    # log or to shadow a real scheduler. Jobs go on `jobs`, an asyncio.Queue
+    # (see submit() and close()), and run() schedules them with any
+    # registered SchedulingPolicy.
+    #
+    # With time_scale=None the clock is simulated: jobs must come in arrival
+    # order, and the clock only moves past a time once every job arriving by
+    # then has been received, so a replay makes the batch engine's
+    # decisions, with two exceptions that matter when the queueing order
+    # does (RR, MLFQ, and CFS's weight sums): jobs admitted at the same
+    # moment, having arrived together or while one slice ran, queue in
+    # arrival order (the batch engine queues them in table order), and jobs
+    # back from I/O at the same time in row order, which here is the order
+    # of admission. With a time_scale, the clock follows the wall clock at
+    # that many time units per second and jobs arrive when they are
+    # received.
+    #
+    # Slices go to the sink as they are decided; finished processes go to
+    # on_complete(record) and into the rolling metrics (see metrics()), and
+    # are then evicted, so memory is bounded by the unfinished processes.
+    def __init__(self, policy="FCFS", quantum=2, context_switch=0, time_scale=None, sink=None, window=1000,
+                 on_complete=None, on_metrics=None, metrics_interval=None, queue_size=1024):
+        if not isinstance(policy, SchedulingPolicy):
+            if policy not in POLICIES:
+                raise ValueError(f"Unknown algorithm: {policy}")
+            engine = SchedulerEngine()
+            engine.quantum = quantum
+            policy = POLICIES[policy](engine)
+        self.policy = policy
+        self.time_scale = time_scale
+        self.jobs = asyncio.Queue(maxsize=queue_size)
+        self.on_complete = on_complete
+        self.on_metrics = on_metrics
+        self.metrics_interval = metrics_interval
+
+        # Rows are slots: a finished process's row goes to the next arrival.
+        # List columns never need widening, so the policy's references to
+        # them stay valid as they grow.
+        self.table = ProcessTable.from_columns([], [], [], [])
+        self.table.phases = []
+        self.table.deadline, self.table.period = [], []  # For EDF and RM; None when a job has none
+        self._run = self.table.new_run(*policy.time_values(), sink=NullSink() if sink is None else sink,
+                                      switch_cost=context_switch)
+        self._run.completed = deque(maxlen=0)  # Finished processes are not kept
+        self._run.online = OnlineMetrics()
+        self.free = []  # Rows of evicted processes
+        # A kept Schedule refers to its processes by row, so with a ListSink
+        # rows are retired instead of reused
+        self.reuse_rows = not isinstance(self._run.sink, ListSink)
+        self.retired = 0
+        self.pending = []  # (arrival, sequence, job) heap of received jobs not yet admitted
+        self.blocked = []  # (time back from I/O, row) heap
+        self.recent = deque(maxlen=window)  # (finish, waiting, turnaround, response) of the latest processes
+        self.deadline_processes = 0
+        self.deadline_misses = 0
+        self.now = 0
+        self.watermark = None  # Latest arrival received (simulated clock)
+        self.closed = False
+        self.busy_time = 0
+        self._sequence = itertools.count()
+        self._origin = None
+        self._next_report = metrics_interval
+        policy.start(self.table, self._run)
+
+    async def submit(self, pid, arrival_time=None, burst_time=None, priority=0, deadline=None, period=None):
+        # Queue a job; without an arrival time it arrives when received. The
+        # deadline is relative to the arrival.
+        await self.jobs.put(_job(pid, arrival_time, burst_time, priority, deadline, period))
+
+    async def close(self):
+        # End the stream; run() returns once every job has finished
+        await self.jobs.put(None)
+
+    def clock(self):
+        # Scaled wall-clock time, starting from the simulation clock
+        loop = asyncio.get_running_loop()
+        if self._origin is None:
+            self._origin = loop.time() - self.now / self.time_scale
+        return (loop.time() - self._origin) * self.time_scale
+
+    def _receive(self, job):
+        # Take a job off the queue; returns its arrival time, or None for the
+        # end of the stream
+        if job is None:
+            self.closed = True
+            return None
+        pid, arrival, burst, priority, deadline, period = job
+        if self.time_scale:
+            arrival = max(self.clock(), self.now)
+        elif arrival is None:
+            arrival = max(self.now, self.watermark or 0)
+        else:
+            arrival = max(arrival, self.now)  # Late jobs arrive now
+        if self.watermark is None or arrival > self.watermark:
+            self.watermark = arrival
+        heapq.heappush(self.pending, (arrival, next(self._sequence), (pid, arrival, burst, priority, deadline, period)))
+        return arrival
+
+    async def _wait(self, time):
+        # Wait until every job arriving by `time` has been received. Returns
+        # early with the arrival time of a job that arrives before `time`,
+        # else None.
+        while not self.closed:
+            if self.time_scale:
+                ahead = time - self.clock()
+                if ahead < 0:
+                    return None
+                try:
+                    job = await asyncio.wait_for(self.jobs.get(), ahead / self.time_scale)
+                except asyncio.TimeoutError:
+                    continue
+            else:
+                if self.watermark is not None and self.watermark > time:
+                    return None
+                job = await self.jobs.get()
+            arrival = self._receive(job)
+            if arrival is not None and arrival < time:
+                return arrival
+        return None
+
+    async def _sync(self, time):
+        while await self._wait(time) is not None:
+            pass
+
+    def _place(self, job):
+        # Give an arriving job a row, reusing an evicted one when possible
+        pid, arrival, burst, priority, deadline, period = job
+        phases = burst if isinstance(burst, tuple) else None
+        table, run = self.table, self._run
+        if self.free:
+            row = self.free.pop()
+        else:
+            row = len(table)
+            for column in (table.pid, table.arrival, table.burst, table.priority, run.remaining, run.start,
+                           run.finish, run.response):
+                column.append(0)
+            for column in (table.phases, table.deadline, table.period):
+                column.append(None)
+            run.state.append(PENDING)
+            run.phase.append(0)
+            self.policy.resize(len(table))
+        table.pid[row] = pid
+        table.arrival[row] = arrival
+        table.burst[row] = sum(phases[::2]) if phases else burst
+        table.priority[row] = priority
+        table.phases[row] = phases
+        table.deadline[row] = deadline
+        table.period[row] = period
+        run.reset_row(row)
+        return row
+
+    def _admit(self, time, on_arrival, on_wake):
+        while self.pending and self.pending[0][0] <= time:
+            on_arrival(self._place(heapq.heappop(self.pending)[2]), time)
+        while self.blocked and self.blocked[0][0] <= time:
+            on_wake(heapq.heappop(self.blocked)[1], time)
+
+    def _next_incoming(self):
+        next_time = self.pending[0][0] if self.pending else None
+        if self.blocked and (next_time is None or self.blocked[0][0] < next_time):
+            next_time = self.blocked[0][0]
+        return next_time
+
+    def _evict(self, row, time):
+        table, run = self.table, self._run
+        phases = table.phases[row]
+        turnaround = time - table.arrival[row]
+        waiting = turnaround - table.burst[row] - (sum(phases[1::2]) if phases else 0)
+        self.recent.append((time, waiting, turnaround, run.response[row]))
+        deadline = table.deadline[row]
+        if deadline is not None:
+            self.deadline_processes += 1
+            self.deadline_misses += time > table.arrival[row] + deadline
+        if self.on_complete:
+            self.on_complete({
+                'pid': table.pid[row],
+                'arrival_time': table.arrival[row],
+                'burst_time': table.burst[row],
+                'priority': table.priority[row],
+                'start_time': run.start[row],
+                'finish_time': time,
+                'waiting_time': waiting,
+                'turnaround_time': turnaround,
+                'response_time': run.response[row],
+                'deadline': deadline,
+                'period': table.period[row],
+            })
+        if run.last == row:
+            run.last = -1  # The next process in this row is a different one
+        if self.reuse_rows:
+            table.pid[row] = table.phases[row] = None
+            self.free.append(row)
+        else:
+            self.retired += 1
+
+    def metrics(self):
+        # Totals so far (OnlineMetrics) plus recent_* statistics over the
+        # last `window` finished processes
+        run = self._run
+        metrics = run.online.snapshot()
+        metrics.update({
+            'time': self.now,
+            'active': len(self.table) - len(self.free) - self.retired,
+            'cpu_utilization': self.busy_time / self.now if self.now else 0,
+            'context_switches': run.switches,
+            'switch_overhead': run.overhead,
+        })
+        if self.deadline_processes:
+            metrics['deadline_misses'] = self.deadline_misses
+            metrics['miss_ratio'] = self.deadline_misses / self.deadline_processes
+        if self.recent:
+            finish, *latencies = np.array(self.recent, dtype=np.float64).T
+            span = finish[-1] - finish[0]
+            metrics['recent_throughput'] = (len(finish) - 1) / span if span else 0
+            for name, values in zip(OnlineMetrics.NAMES, latencies):
+                metrics[f'recent_avg_{name}'] = values.mean().item()
+                metrics[f'recent_p95_{name}'] = np.percentile(values, 95).item()
+        return metrics
+
+    async def run(self):
+        # Schedule until the stream is closed and every job has finished;
+        # returns the final metrics. The loop mirrors SchedulerEngine.simulate.
+        policy, run = self.policy, self._run
+        kind = type(policy)
+        on_arrival, pick_next = policy.on_arrival, policy.pick_next
+        time_slice, on_complete = policy.time_slice, policy.on_complete
+        on_wake = policy.on_wake if kind.on_wake is not SchedulingPolicy.on_wake else on_arrival
+        on_preempt = policy.on_preempt if kind.on_preempt is not SchedulingPolicy.on_preempt else on_arrival
+        sliced = kind.time_slice is not SchedulingPolicy.time_slice
+        remaining, state = run.remaining, run.state
+
+        while True:
+            await self._sync(self.now)
+            self._admit(self.now, on_arrival, on_wake)
+
+            i = pick_next(self.now)
+            next_time = self._next_incoming()
+            if i is None:
+                if next_time is None:
+                    if self.closed:
+                        break
+                    self._receive(await self.jobs.get())
+                    continue
+                # Idle until the next arrival, or an earlier one still to come
+                arrival = await self._wait(next_time)
+                self.now = next_time if arrival is None else arrival
+                continue
+
+            now = run.switch(i, self.now)
+            if state[i] == PENDING:
+                run.begin(i, now)
+
+            left = remaining[i]
+            run_time = time_slice(i, now, next_time) if sliced else None
+            if run_time is None or run_time >= left:
+                run_time = left
+            elif run_time < 0:
+                run_time = 0
+
+            # Wait the slice out. An arrival before it ends, earlier than any
+            # known one, is the policy's next_time now and may cut it short.
+            while True:
+                arrival = await self._wait(now + run_time)
+                if arrival is None:
+                    break
+                if sliced and (next_time is None or arrival < next_time):
+                    next_time = arrival
+                    cut = time_slice(i, now, next_time)
+                    if cut is not None and cut < run_time:
+                        run_time = max(cut, 0)
+
+            if run_time or not left:
+                run.record(i, now, now + run_time)
+            self.busy_time += run_time
+            self.now = now = now + run_time
+            remaining[i] = left - run_time
+
+            await self._sync(now)
+            self._admit(now, on_arrival, on_wake)
+
+            if remaining[i] == 0:
+                # CPU burst done: the process completes or blocks on I/O
+                wake_time = run.end_burst(i, now)
+                if wake_time is not None:
+                    heapq.heappush(self.blocked, (wake_time, i))
+                on_complete(i, now)
+                if wake_time is None:
+                    self._evict(i, now)
+            else:
+                on_preempt(i, now)
+
+            if self.on_metrics and self.metrics_interval and now >= self._next_report:
+                self.on_metrics(self.metrics())
+                self._next_report = (now // self.metrics_interval + 1) * self.metrics_interval
+
+        run.close()
+        return self.metrics()
+
+
+async def replay(live, table):
+    # Feed a ProcessTable's processes to a LiveScheduler in arrival order,
+    # at their arrival times when the scheduler runs on the wall clock
+    arrival, deadline, period = table.arrival, table.deadline, table.period
+    for i in sorted(range(len(table)), key=arrival.__getitem__):
+        if live.time_scale:
+            await asyncio.sleep(max(0, (arrival[i] - live.clock()) / live.time_scale))
+        phases = table.phases[i] if table.phases is not None else None
+        await live.submit(table.pid[i], arrival[i], list(phases) if phases else table.burst[i], table.priority[i],
+                          None if deadline is None else deadline[i], None if period is None else period[i])
+    await live.close()
+
+
+async def serve(live, host="127.0.0.1", port=8765):
+    # Accept jobs over TCP as JSON lines: {"pid": ..., "burst_time": ...,
+    # "arrival_time": ..., "priority": ..., "deadline": ..., "period": ...}.
+    # A line {"end": true} ends the stream; malformed lines are answered
+    # with an error line.
+    async def handle(reader, writer):
+        async for line in reader:
+            if not line.strip():
+                continue
+            try:
+                job = json.loads(line)
+                if job.get('end'):
+                    await live.close()
+                    break
+                await live.jobs.put(_job(job.get('pid'), job.get('arrival_time'), job.get('burst_time'),
+                                         job.get('priority', 0), job.get('deadline'), job.get('period')))
+            except (ValueError, AttributeError) as e:
+                writer.write(json.dumps({'error': str(e)}).encode() + b'\n')
+                await writer.drain()
+        writer.close()
+
+    return await asyncio.start_server(handle, host, port)
+
+
+async def _main(args):
+    def report(metrics):
+        print(json.dumps(metrics), flush=True)
+
+    live = LiveScheduler(args.algorithm, quantum=args.quantum, context_switch=args.context_switch,
+                         time_scale=args.scale, window=args.window, on_metrics=report,
+                         metrics_interval=args.report)
+    if args.trace:
+        import trace_io
+        feed = replay(live, trace_io.read_trace(args.trace))
+        metrics, _ = await asyncio.gather(live.run(), feed)
+    else:
+        host, _, port = args.listen.rpartition(':')
+        server = await serve(live, host or "127.0.0.1", int(port))
+        async with server:
+            metrics = await live.run()
+    report(metrics)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Schedule a live or replayed job stream")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('trace', nargs='?', help="trace file to replay (csv, jsonl or bin)")
+    source.add_argument('--listen', help="accept JSON-lines jobs on HOST:PORT")
+    parser.add_argument('--algorithm', default='FCFS', help=f"one of {', '.join(POLICIES)}")
+    parser.add_argument('--quantum', type=float, default=2.0)
+    parser.add_argument('--context-switch', type=float, default=0.0, help="time lost per context switch")
+    parser.add_argument('--scale', type=float, default=None,
+                        help="time units per wall-clock second (default: simulated time)")
+    parser.add_argument('--window', type=int, default=1000, help="processes in the rolling metrics")
+    parser.add_argument('--report', type=float, default=None, help="print metrics every this many time units")
+    args = parser.parse_args(argv)
+    for name in ('quantum', 'context_switch'):
+        value = getattr(args, name)
+        setattr(args, name, int(value) if value.is_integer() else value)
+    try:
+        asyncio.run(_main(args))
+    except KeyboardInterrupt:
+        sys.exit(130)
+
+
+if __name__ == "__main__":
+    main()
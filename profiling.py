@@ -0,0 +1,225 @@
+import json
+import time
+
+# Phases of SchedulerEngine.simulate(). The loop's own bookkeeping (clock,
+# arrival cursor, checks) is what is left of the loop time, 'other'.
+PHASES = ('setup', 'admit', 'select', 'slice', 'switch', 'record', 'requeue', 'complete', 'results')
+
+# Scheduling events passed to on_event(kind, index, time)
+EVENTS = ('arrival', 'wake', 'pick', 'preempt', 'complete')
+
+
+def _nothing(*args):
+    pass
+
+
+class Profiler:
+    # Opt-in instrumentation of SchedulerEngine.simulate(), which drives
+    # every single-CPU algorithm: set engine.profiler = Profiler() and each
+    # run adds to its per-phase timers and counters (see report()). The
+    # engine only wraps its hooks when a profiler is set, so without one
+    # the loop runs exactly as before.
+    #
+    # trace=True also keeps every timed call as a span, for chrome_trace()
+    # (chrome://tracing, Perfetto) and speedscope(); that is one tuple per
+    # hook call, so keep it to runs of moderate size. on_event(kind, index,
+    # time) is called with every scheduling event (see EVENTS) in simulated
+    # time, e.g. to trace decisions.
+    def __init__(self, trace=False, on_event=None, clock=time.perf_counter_ns):
+        self.trace = trace
+        self.on_event = on_event
+        self.clock = clock
+        self.reset()
+
+    def reset(self):
+        self.times = dict.fromkeys(PHASES, 0)  # Nanoseconds per phase
+        self.calls = dict.fromkeys(PHASES, 0)
+        self.counters = dict.fromkeys(('arrivals', 'wakeups', 'decisions', 'idle_picks', 'preemptions',
+                                       'bursts', 'slices', 'context_switches'), 0)
+        self.loop_time = 0
+        self.wall_time = 0
+        self.queue_samples = 0
+        self.queue_total = 0
+        self.queue_max = 0
+        self.runs = []  # (name, start, end) of every run, for the trace
+        self.spans = []  # (phase, start, end) with trace=True
+        self.queue_trace = []  # (time, ready processes) with trace=True
+        self._policy = self._run = None
+        self._overhead = None
+
+    def begin(self, name):
+        # simulate() is starting; name labels the run in traces
+        self._name = name
+        self._start = self.clock()
+
+    def instrument(self, policy, run, on_arrival, on_wake, pick_next, time_slice, on_preempt, on_complete, switch,
+                   record, complete, end_burst):
+        # Setup is over: return the hooks wrapped with timers and counters,
+        # in the order given
+        self._policy, self._run = policy, run
+        self._switches = run.switches
+        self._loop_start = self.clock()
+        self._add('setup', self._start, self._loop_start)
+        queue_length = policy.queue_length
+        if queue_length() is None:
+            queue_length = None
+        clock, add, counters, on_event = self.clock, self._add, self.counters, self.on_event
+
+        def pick(time):
+            if queue_length is not None:
+                self._sample(queue_length())
+            start = clock()
+            index = pick_next(time)
+            add('select', start, clock())
+            if index is None:
+                counters['idle_picks'] += 1
+            else:
+                counters['decisions'] += 1
+                if on_event is not None:
+                    on_event('pick', index, time)
+            return index
+
+        return (self._wrap('admit', on_arrival, 'arrivals', 'arrival'),
+                self._wrap('admit', on_wake, 'wakeups', 'wake'),
+                pick,
+                self._wrap('slice', time_slice),
+                self._wrap('requeue', on_preempt, 'preemptions', 'preempt'),
+                self._wrap('complete', on_complete),
+                self._wrap('switch', switch),
+                self._wrap('record', record, 'slices'),
+                self._wrap('complete', complete, 'bursts', 'complete'),
+                self._wrap('complete', end_burst, 'bursts', 'complete'))
+
+    def finish(self, get_results):
+        # The loop is over: time the results and close the run
+        loop_end = self.clock()
+        self.loop_time += loop_end - self._loop_start
+        self.counters['context_switches'] += self._run.switches - self._switches
+        results = self._wrap('results', get_results)()
+        self.wall_time += self.clock() - self._start
+        self.runs.append((self._name, self._start, self.clock()))
+        self._policy = self._run = None
+        return results
+
+    def _add(self, phase, start, end):
+        self.times[phase] += end - start
+        self.calls[phase] += 1
+        if self.trace:
+            self.spans.append((phase, start, end))
+
+    def _sample(self, length):
+        self.queue_samples += 1
+        self.queue_total += length
+        if length > self.queue_max:
+            self.queue_max = length
+        if self.trace:
+            self.queue_trace.append((self.clock(), length))
+
+    def _wrap(self, phase, hook, counter=None, event=None):
+        # The hook, timed, counted and, for scheduling events, reported
+        clock, add, counters, on_event = self.clock, self._add, self.counters, self.on_event
+        if on_event is None:
+            event = None
+
+        def wrapped(*args):
+            if counter is not None:
+                counters[counter] += 1
+            if event is not None:
+                on_event(event, args[0], args[-1])
+            start = clock()
+            result = hook(*args)
+            add(phase, start, clock())
+            return result
+        return wrapped
+
+    def overhead(self, calls=10000):
+        # Nanoseconds the wrapping adds to a hook call, measured once on an
+        # empty hook; report() takes it out of 'other'
+        if self._overhead is None:
+            timings = []
+            for hook in (_nothing, Profiler(clock=self.clock)._wrap('setup', _nothing, 'slices')):
+                start = self.clock()
+                for _ in range(calls):
+                    hook(0, 0)
+                timings.append(self.clock() - start)
+            self._overhead = max(0, (timings[1] - timings[0]) / calls)
+        return self._overhead
+
+    def report(self):
+        # Seconds, calls and share of the run time per phase, counters, and
+        # the ready-set length the policy reported before each decision
+        phases = {}
+        hook_calls = sum(self.calls[phase] for phase in PHASES if phase not in ('setup', 'results'))
+        profiling = hook_calls * self.overhead() if self.runs else 0
+        other = self.loop_time - sum(self.times[phase] for phase in PHASES if phase not in ('setup', 'results'))
+        other = max(0, other - profiling)
+        for phase, nanoseconds in list(self.times.items()) + [('other', other)]:
+            phases[phase] = {
+                'seconds': nanoseconds / 1e9,
+                'calls': self.calls.get(phase),
+                'share': nanoseconds / self.wall_time if self.wall_time else 0,
+            }
+        counters = dict(self.counters)
+        counters['queue_ops'] = (counters['arrivals'] + counters['wakeups'] + counters['preemptions']
+                                 + counters['decisions'])
+        return {
+            'runs': len(self.runs),
+            'wall_time': self.wall_time / 1e9,
+            'profiling_overhead': profiling / 1e9,  # Estimated, included in wall_time
+            'phases': phases,
+            'counters': counters,
+            'queue_length': {
+                'mean': self.queue_total / self.queue_samples if self.queue_samples else None,
+                'max': self.queue_max if self.queue_samples else None,
+            },
+        }
+
+    def _origin(self):
+        return self.runs[0][1] if self.runs else 0
+
+    def chrome_trace(self, path):
+        # Trace Event Format: one complete event per run and per span, and
+        # the ready-set length as a counter track. Times in microseconds.
+        origin = self._origin()
+        events = [{'name': name, 'cat': 'run', 'ph': 'X', 'ts': (start - origin) / 1e3, 'dur': (end - start) / 1e3,
+                   'pid': 0, 'tid': 0} for name, start, end in self.runs]
+        events.extend({'name': phase, 'cat': 'phase', 'ph': 'X', 'ts': (start - origin) / 1e3,
+                       'dur': (end - start) / 1e3, 'pid': 0, 'tid': 0} for phase, start, end in self.spans)
+        events.extend({'name': 'ready', 'ph': 'C', 'ts': (at - origin) / 1e3, 'pid': 0, 'args': {'ready': length}}
+                      for at, length in self.queue_trace)
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ns'}, f)
+
+    def speedscope(self, path):
+        # speedscope evented profile: every run as a frame with its spans
+        # nested inside
+        frames, ids, events = [], {}, []
+
+        def frame(name):
+            if name not in ids:
+                ids[name] = len(frames)
+                frames.append({'name': name})
+            return ids[name]
+
+        spans = iter(self.spans)
+        span = next(spans, None)
+        origin = self._origin()
+        for name, start, end in self.runs:
+            events.append({'type': 'O', 'frame': frame(name), 'at': start - origin})
+            while span is not None and span[1] < end:
+                phase, span_start, span_end = span
+                events.append({'type': 'O', 'frame': frame(phase), 'at': span_start - origin})
+                events.append({'type': 'C', 'frame': frame(phase), 'at': span_end - origin})
+                span = next(spans, None)
+            events.append({'type': 'C', 'frame': frame(name), 'at': end - origin})
+        profile = {
+            'type': 'evented',
+            'name': 'simulate',
+            'unit': 'nanoseconds',
+            'startValue': 0,
+            'endValue': self.runs[-1][2] - origin if self.runs else 0,
+            'events': events,
+        }
+        with open(path, 'w') as f:
+            json.dump({'$schema': 'https://www.speedscope.app/file-format-schema.json',
+                       'shared': {'frames': frames}, 'profiles': [profile], 'name': 'cpu-scheduler-simulator'}, f)
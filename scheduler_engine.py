@@ -0,0 +1,2256 @@
+from array import array
+from collections import OrderedDict, deque
+from collections.abc import Sequence
+import argparse
+import bisect
+import hashlib
+import heapq
+import itertools
+import json
+import math
+import numbers
+import os
+import struct
+import sys
+import threading
+
+# Headless scheduling engine: no GUI imports, and NumPy (and pickle) are
+# imported by the functions that need them, so scripts start quickly. The
+# Tk application is cpu_schudular_sim.py.
+
+# Run states of a process inside a simulation run
+PENDING, STARTED, FINISHED = 0, 1, 2
+
+# Schedule label of context-switch overhead segments
+SWITCH_LABEL = "CS"
+
+# CFS weight of a process at priority (nice) 0; each nice step is a factor 1.25
+NICE_0_WEIGHT = 1024
+
+
+def _widen(column, value):
+    # Columns start as compact int arrays and widen to float arrays, then to
+    # plain lists, only when a value does not fit
+    if isinstance(column, array) and column.typecode == 'q' and isinstance(value, numbers.Real):
+        return array('d', column)
+    return list(column)
+
+
+def _owned(column):
+    # Memory-mapped columns are read-only typed memoryviews; they are copied
+    # into an array the first time they have to change
+    if isinstance(column, memoryview):
+        owned = array(column.format)
+        owned.frombytes(column.cast('B'))
+        return owned
+    return column
+
+
+def _extend(column, values):
+    # Bulk append; numeric NumPy arrays are copied in through the buffer
+    # protocol instead of value by value. Without NumPy loaded, values
+    # cannot be an array.
+    np = sys.modules.get('numpy')
+    if isinstance(column, array) and np and isinstance(values, np.ndarray) and values.dtype.kind in 'biuf':
+        if values.dtype.kind == 'f' and column.typecode == 'q':
+            column = array('d', column)
+        values = np.ascontiguousarray(values, dtype=np.int64 if column.typecode == 'q' else np.float64)
+        column.frombytes(memoryview(values).cast('B'))
+        return column
+    for value in values:
+        try:
+            column.append(value)
+        except (TypeError, OverflowError):
+            column = _widen(column, value)
+            column.append(value)
+    return column
+
+
+def _column_code(values):
+    if isinstance(values, array):
+        return values.typecode
+    if isinstance(values, memoryview):
+        return values.format
+    if isinstance(values, numbers.Integral):
+        return 'q'
+    if isinstance(values, numbers.Real):
+        return 'd'
+    return None
+
+
+def _integral(*values):
+    return all(isinstance(value, numbers.Integral) for value in values)
+
+
+def _copy_column(column, code):
+    if isinstance(column, memoryview):
+        column = _owned(column)
+        if column.typecode == code:
+            return column
+    if code is None:
+        return list(column)
+    if isinstance(column, array) and column.typecode == code:
+        return column[:]
+    return array(code, column)
+
+
+def _numpy_column(column):
+    # Zero-copy NumPy view of an array column; lists are converted
+    import numpy as np
+    if isinstance(column, array):
+        return np.frombuffer(column, dtype=np.int64 if column.typecode == 'q' else np.float64)
+    if isinstance(column, memoryview):
+        return np.frombuffer(column, dtype=np.int64 if column.format == 'q' else np.float64)
+    return np.asarray(column, dtype=np.float64)
+
+
+def _zero_column(code, n):
+    if code is None:
+        return [0] * n
+    return array(code, [0]) * n
+
+
+class ProcessTable:
+    # Struct-of-arrays process store. Static columns live here once; each run
+    # gets its own scratch copy of the mutable ones (see new_run).
+    COLUMNS = ('pid', 'arrival', 'burst', 'priority')
+    # Columns that stay None until a row sets them; rows without a value
+    # hold None. deadline is relative to arrival; period is the release
+    # interval of a periodic task's jobs (see extend_periodic).
+    OPTIONAL_COLUMNS = ('deadline', 'period')
+
+    def __init__(self):
+        self.pid = array('q')
+        self.arrival = array('q')
+        self.burst = array('q')
+        self.priority = array('q')
+        self.phases = None  # Per row: None, or the CPU/I/O burst sequence
+        self.deadline = None
+        self.period = None
+        self.revision = 0  # Counts changes to existing rows (appends do not)
+        self._fingerprint = None
+
+    @classmethod
+    def from_columns(cls, pid, arrival, burst, priority):
+        # Adopt existing columns without copying: arrays, lists, or typed
+        # memoryviews ('q' or 'd') such as views of a memory-mapped trace
+        table = cls()
+        table.pid, table.arrival, table.burst, table.priority = pid, arrival, burst, priority
+        return table
+
+    def __len__(self):
+        return len(self.arrival)
+
+    def __getstate__(self):
+        # memoryviews do not pickle; workers get owned copies
+        state = {name: _owned(getattr(self, name)) for name in self.COLUMNS + self.OPTIONAL_COLUMNS}
+        state['phases'] = self.phases
+        state['revision'] = self.revision
+        state['_fingerprint'] = self._fingerprint
+        return state
+
+    def fingerprint(self):
+        # Hash of the table's content, kept until append(), extend() or
+        # assign() changes it
+        if self._fingerprint is None:
+            digest = hashlib.blake2b(struct.pack('<q', len(self)), digest_size=16)
+            for name in self.COLUMNS:
+                column = getattr(self, name)
+                code = _column_code(column)
+                if code:
+                    digest.update(code.encode())
+                    digest.update(memoryview(column).cast('B'))
+                else:
+                    digest.update(repr(list(column)).encode())
+            digest.update(repr(self.phases).encode())
+            for name in self.OPTIONAL_COLUMNS:
+                column = getattr(self, name)
+                if column is not None:
+                    code = _column_code(column)
+                    digest.update(name.encode())
+                    digest.update(memoryview(column).cast('B') if code else repr(list(column)).encode())
+            self._fingerprint = digest.hexdigest()
+        return self._fingerprint
+
+    def append(self, pid, arrival_time, burst_time, priority=0, deadline=None, period=None):
+        # burst_time may be a sequence of alternating CPU and I/O bursts,
+        # starting and ending with CPU; the burst column then holds the CPU
+        # total
+        self._fingerprint = None
+        self._extend_optional('deadline', None if deadline is None else (deadline,), 1)
+        self._extend_optional('period', None if period is None else (period,), 1)
+        phases = None
+        if isinstance(burst_time, (list, tuple)):
+            phases = tuple(burst_time)
+            if len(phases) % 2 == 0:
+                raise ValueError("Burst sequences alternate CPU and I/O bursts and start and end with CPU")
+            burst_time = sum(phases[::2])
+        if phases is not None or self.phases is not None:
+            if self.phases is None:
+                self.phases = [None] * len(self)
+            self.phases.append(phases)
+        for name, value in zip(self.COLUMNS, (pid, arrival_time, burst_time, priority)):
+            column = _owned(getattr(self, name))
+            try:
+                column.append(value)
+            except (TypeError, OverflowError):
+                column = _widen(column, value)
+                column.append(value)
+            setattr(self, name, column)
+
+    def extend(self, pids, arrival_times, burst_times, priorities=None, deadlines=None, periods=None):
+        # Append many processes at once from equal-length sequences or arrays
+        self._fingerprint = None
+        if priorities is None:
+            priorities = array('q', [0]) * len(burst_times)
+        self._extend_optional('deadline', deadlines, len(burst_times))
+        self._extend_optional('period', periods, len(burst_times))
+        if self.phases is not None:
+            self.phases.extend([None] * len(burst_times))
+        for name, values in zip(self.COLUMNS, (pids, arrival_times, burst_times, priorities)):
+            setattr(self, name, _extend(_owned(getattr(self, name)), values))
+
+    def extend_periodic(self, pid, burst_time, period, deadline=None, arrival_time=0, jobs=None, until=None,
+                        priority=0):
+        # Release a periodic task: one row (job) every period from
+        # arrival_time, either `jobs` of them or every release before
+        # `until`. Each job has the task's pid, burst and priority, and must
+        # finish within deadline of its release (by default, the period).
+        import numpy as np
+        if isinstance(burst_time, (list, tuple)):
+            raise ValueError("Periodic tasks take a single CPU burst")
+        if period <= 0:
+            raise ValueError("A periodic task needs a positive period")
+        if (jobs is None) == (until is None):
+            raise ValueError("Give either jobs or until")
+        if jobs is None:
+            jobs = max(0, math.ceil((until - arrival_time) / period))
+        arrivals = arrival_time + np.arange(jobs) * period
+        if until is not None:
+            arrivals = arrivals[arrivals < until]  # Rounding may add one release
+            jobs = len(arrivals)
+        pids = np.full(jobs, pid) if isinstance(pid, numbers.Integral) else [pid] * jobs
+        self.extend(pids, arrivals, np.full(jobs, burst_time), np.full(jobs, priority),
+                    np.full(jobs, period if deadline is None else deadline), np.full(jobs, period))
+
+    def _extend_optional(self, name, values, count):
+        # Append count values (None: none of them has one) to an optional
+        # column, creating it on the first value; call before the
+        # processes are appended
+        column = getattr(self, name)
+        if column is None:
+            if values is None:
+                return
+            column = [None] * len(self) if len(self) else array('q')
+        setattr(self, name, _extend(_owned(column), [None] * count if values is None else values))
+
+    def assign(self, name, index, value):
+        self.revision += 1
+        self._fingerprint = None
+        if name == 'burst' and self.phases is not None:
+            self.phases[index] = None  # A new plain burst replaces the sequence
+        if getattr(self, name) is None:
+            setattr(self, name, [None] * len(self))
+        column = _owned(getattr(self, name))
+        try:
+            column[index] = value
+        except (TypeError, OverflowError):
+            column = _widen(column, value)
+            column[index] = value
+        setattr(self, name, column)
+
+    def fill(self, name, values):
+        # Give every row without a value in optional column `name` its value
+        # from values (one per row); rows that have one keep it
+        if name not in self.OPTIONAL_COLUMNS:
+            raise ValueError(f"{name} is not an optional column")
+        if len(values) != len(self):
+            raise ValueError("fill() needs one value per process")
+        self.revision += 1
+        self._fingerprint = None
+        column = getattr(self, name)
+        if column is not None:
+            values = [value if current is None else current for current, value in zip(column, values)]
+        setattr(self, name, _extend(array('q'), values))
+
+    def time_code(self, *time_values):
+        # Narrowest typecode holding every time of a run: arrivals, bursts and
+        # any extra values the algorithm adds to them (e.g. the quantum)
+        codes = {_column_code(self.arrival), _column_code(self.burst)}
+        codes.update(_column_code(value) for value in time_values)
+        if self.phases is not None:
+            codes.update(_column_code(value) for phases in self.phases if phases for value in phases)
+        if None in codes:
+            return None
+        return 'd' if 'd' in codes else 'q'
+
+    def new_run(self, *time_values, sink=None, switch_cost=0):
+        return _Run(self, self.time_code(switch_cost, *time_values), sink, switch_cost)
+
+    def io_times(self):
+        # Total I/O time of every row, as a NumPy array
+        import numpy as np
+        if self.phases is None:
+            return np.zeros(len(self))
+        return np.array([sum(phases[1::2]) if phases else 0 for phases in self.phases], dtype=np.float64)
+
+
+class ScheduleSink:
+    # Receives schedule slices from a run as (process index, start, end).
+    # open() is called when a run starts and close() when it ends.
+    online_metrics = True  # Runs keep OnlineMetrics unless the sink opts out
+
+    def open(self, table, code):
+        self.table = table
+
+    def emit(self, index, start, end):
+        raise NotImplementedError
+
+    def emit_overhead(self, start, end):
+        # Context-switch time; dropped unless the sink keeps a timeline
+        pass
+
+    def close(self):
+        pass
+
+    def label(self, index):
+        return f"P{self.table.pid[index]}"
+
+
+class Schedule(Sequence):
+    # A schedule kept as columns: the table row of each entry's process (-1
+    # for context-switch time) and its start and end, in the run's time
+    # typecode. A slice that continues the previous entry's process right
+    # where it ended extends that entry. Entries read as (label, start,
+    # end) tuples, labels made on demand and shared per process.
+    #
+    # When every entry starts and ends no earlier than the one before (any
+    # single-CPU run), at() and between() binary-search the columns; else
+    # they scan them.
+    def __init__(self, table, code, coalesce=True):
+        self.table = table
+        self.owners = array('q')
+        self.starts = _zero_column(code, 0)
+        self.ends = _zero_column(code, 0)
+        self.coalesce = coalesce
+        self.ordered = True
+        self._labels = {}
+        self._by_owner = None
+
+    def append(self, index, start, end):
+        ends = self.ends
+        if ends:
+            if self.coalesce and index >= 0 and ends[-1] == start and self.owners[-1] == index:
+                ends[-1] = end
+                return
+            if start < self.starts[-1] or end < ends[-1]:
+                self.ordered = False
+        self.owners.append(index)
+        self.starts.append(start)
+        ends.append(end)
+        self._by_owner = None
+
+    def truncate(self, count, end=None):
+        # Keep the first count entries, the last one ending at end
+        del self.owners[count:], self.starts[count:], self.ends[count:]
+        if count and end is not None:
+            self.ends[-1] = end
+        self._by_owner = None
+
+    def extend_from(self, other, count, end=None):
+        # Append other's first count entries, the last one ending at end
+        self.owners.extend(other.owners[:count])
+        self.starts.extend(other.starts[:count])
+        self.ends.extend(other.ends[:count])
+        self.ordered = self.ordered and other.ordered
+        if count and end is not None:
+            self.ends[-1] = end
+        self._by_owner = None
+
+    def label(self, index):
+        label = self._labels.get(index)
+        if label is None:
+            label = self._labels[index] = SWITCH_LABEL if index < 0 else f"P{self.table.pid[index]}"
+        return label
+
+    def __len__(self):
+        return len(self.owners)
+
+    def __getitem__(self, k):
+        if isinstance(k, slice):
+            return [(self.label(owner), start, end)
+                    for owner, start, end in zip(self.owners[k], self.starts[k], self.ends[k])]
+        return self.label(self.owners[k]), self.starts[k], self.ends[k]
+
+    def __iter__(self):
+        label = self.label
+        for owner, start, end in zip(self.owners, self.starts, self.ends):
+            yield label(owner), start, end
+
+    def __eq__(self, other):
+        if isinstance(other, (Schedule, list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"<Schedule of {len(self)} entries>"
+
+    def __getstate__(self):
+        # Pickled without the table; _Run.attach() sets it again
+        state = dict(self.__dict__)
+        state['table'] = None
+        state['_by_owner'] = None
+        return state
+
+    def at(self, time):
+        # The entry running at time (start <= time < end), or None
+        if self.ordered:
+            k = bisect.bisect_right(self.ends, time)
+            if k < len(self) and self.starts[k] <= time:
+                return self[k]
+            return None
+        for k in range(len(self)):
+            if self.starts[k] <= time < self.ends[k]:
+                return self[k]
+        return None
+
+    def between(self, start, end):
+        # Entries overlapping [start, end), in order
+        if self.ordered:
+            return self[bisect.bisect_right(self.ends, start):bisect.bisect_left(self.starts, end)]
+        return [self[k] for k in range(len(self)) if self.starts[k] < end and self.ends[k] > start]
+
+    def slices(self, index):
+        # (start, end) of every entry of the process in table row index
+        if self._by_owner is None:
+            self._by_owner = {}
+            for k, owner in enumerate(self.owners):
+                self._by_owner.setdefault(owner, []).append(k)
+        return [(self.starts[k], self.ends[k]) for k in self._by_owner.get(index, ())]
+
+    def arrays(self):
+        # (owners, starts, ends) as NumPy arrays, without copying
+        import numpy as np
+        return np.frombuffer(self.owners, dtype=np.int64), _numpy_column(self.starts), _numpy_column(self.ends)
+
+    def columns(self):
+        # Labels and times as columns, for export
+        return {'process': [self.label(owner) for owner in self.owners], 'start': self.starts, 'end': self.ends}
+
+
+class ListSink(ScheduleSink):
+    # Keeps the whole schedule in memory as a Schedule; the default sink
+    online_metrics = False
+
+    def open(self, table, code):
+        super().open(table, code)
+        self.schedule = Schedule(table, code)
+
+    def emit(self, index, start, end):
+        self.schedule.append(index, start, end)
+
+    def emit_overhead(self, start, end):
+        self.schedule.append(-1, start, end)
+
+
+class SimulationCancelled(Exception):
+    pass
+
+
+class ProgressSink(ListSink):
+    # A ListSink that tracks how much of the total burst time has been
+    # scheduled and stops the run (SimulationCancelled) once cancel() is
+    # called, possibly from another thread
+    def __init__(self):
+        self.cancelled = threading.Event()
+        self.done = 0
+        self.total = 0
+
+    def open(self, table, code):
+        super().open(table, code)
+        self.done = 0
+        self.total = _numpy_column(table.burst).sum().item() if len(table) else 0
+
+    def emit(self, index, start, end):
+        if self.cancelled.is_set():
+            raise SimulationCancelled()
+        super().emit(index, start, end)
+        self.done += end - start
+
+    def restored(self):
+        # A resumed run starts with the schedule up to its checkpoint, which
+        # counts as done
+        import numpy as np
+        owners, starts, ends = self.schedule.arrays()
+        self.done = np.sum((ends - starts)[owners >= 0]).item()
+
+    def cancel(self):
+        self.cancelled.set()
+
+    @property
+    def progress(self):
+        return self.done / self.total if self.total else 1.0
+
+
+class NullSink(ScheduleSink):
+    # Drops every slice, for runs where only the metrics matter
+    online_metrics = False
+
+    def emit(self, index, start, end):
+        pass
+
+
+class CallbackSink(ScheduleSink):
+    # Calls callback(label, start, end) for every slice
+    def __init__(self, callback):
+        self.callback = callback
+
+    def emit(self, index, start, end):
+        self.callback(f"P{self.table.pid[index]}", start, end)
+
+
+class GeneratorSink(ScheduleSink):
+    # Sends (label, start, end) into a generator, e.g. one written as
+    # "while True: label, start, end = yield". A generator serves one run.
+    def __init__(self, generator):
+        self.generator = generator
+
+    def open(self, table, code):
+        super().open(table, code)
+        next(self.generator)
+
+    def emit(self, index, start, end):
+        self.generator.send((f"P{self.table.pid[index]}", start, end))
+
+    def close(self):
+        self.generator.close()
+
+
+class BinaryFileSink(ScheduleSink):
+    # Writes fixed-width little-endian (index, start, end) records after a
+    # short header; see read_schedule(). Indices are rows of the table the
+    # run simulated, so pids are not repeated per slice.
+    MAGIC = b'CPUSCHED'
+
+    def __init__(self, path, buffer_size=1 << 16):
+        self.path = path
+        self.buffer_size = buffer_size
+
+    def open(self, table, code):
+        super().open(table, code)
+        if code is None:
+            raise ValueError("Binary schedules need integer or float times")
+        self._record = struct.Struct('<q2' + code)
+        self._buffer = bytearray()
+        self._file = open(self.path, 'wb')
+        self._file.write(self.MAGIC + code.encode())
+
+    def emit(self, index, start, end):
+        self._buffer += self._record.pack(index, start, end)
+        if len(self._buffer) >= self.buffer_size:
+            self._file.write(self._buffer)
+            self._buffer.clear()
+
+    def emit_overhead(self, start, end):
+        self.emit(-1, start, end)  # Index -1 marks context-switch time
+
+    def close(self):
+        self._file.write(self._buffer)
+        self._buffer.clear()
+        self._file.close()
+
+
+def read_schedule(path):
+    # Memory-map a schedule written by BinaryFileSink as a structured array
+    import numpy as np
+    with open(path, 'rb') as f:
+        header = f.read(len(BinaryFileSink.MAGIC) + 1)
+    if header[:-1] != BinaryFileSink.MAGIC:
+        raise ValueError(f"{path} is not a binary schedule file")
+    dtype = np.dtype([('index', '<i8'), ('start', '<' + chr(header[-1])), ('end', '<' + chr(header[-1]))])
+    return np.memmap(path, dtype=dtype, mode='r', offset=len(header))
+
+
+class OnlineMetrics:
+    # Running count, mean, standard deviation and maximum of waiting,
+    # turnaround and response times (Welford), in constant memory
+    NAMES = ('waiting_time', 'turnaround_time', 'response_time')
+
+    def __init__(self):
+        self.count = 0
+        self.busy_time = 0
+        self._mean = [0.0, 0.0, 0.0]
+        self._m2 = [0.0, 0.0, 0.0]
+        self._max = [None, None, None]
+
+    def add(self, waiting, turnaround, response, burst):
+        self.count += 1
+        self.busy_time += burst
+        for k, x in enumerate((waiting, turnaround, response)):
+            delta = x - self._mean[k]
+            self._mean[k] += delta / self.count
+            self._m2[k] += delta * (x - self._mean[k])
+            if self._max[k] is None or x > self._max[k]:
+                self._max[k] = x
+
+    def snapshot(self):
+        metrics = {'completed': self.count, 'busy_time': self.busy_time}
+        for k, name in enumerate(self.NAMES):
+            metrics[f'avg_{name}'] = self._mean[k]
+            metrics[f'std_{name}'] = (self._m2[k] / self.count) ** 0.5 if self.count else 0
+            metrics[f'max_{name}'] = self._max[k] if self.count else 0
+        return metrics
+
+
+class _Run:
+    # Scratch columns for one simulation run, so runs never copy the table.
+    # Slices go to the sink; streaming sinks also get online metrics.
+    __slots__ = ('table', 'remaining', 'start', 'finish', 'response', 'state', 'phase',
+                 'completed', 'pid_ordered', 'sink', 'record', 'online', 'closed',
+                 'switch_cost', 'last', 'switches', 'overhead')
+
+    def __init__(self, table, code, sink=None, switch_cost=0):
+        n = len(table)
+        self.table = table
+        self.remaining = _copy_column(table.burst, code)
+        self.phase = None  # CPU burst each process is on, when there is I/O
+        if table.phases is not None:
+            self.phase = array('q', [0]) * n
+            for i, phases in enumerate(table.phases):
+                if phases:
+                    self.remaining[i] = phases[0]
+        self.start = _zero_column(code, n)
+        self.finish = _zero_column(code, n)
+        self.response = _zero_column(code, n)
+        self.state = bytearray(n)
+        self.completed = array('q')  # Indices in completion order
+        self.pid_ordered = False
+        self.sink = ListSink() if sink is None else sink
+        self.sink.open(table, code)
+        self.record = self.sink.emit
+        self.online = OnlineMetrics() if self.sink.online_metrics else None
+        self.closed = False
+        self.switch_cost = switch_cost
+        self.last = -1  # Process that ran last, so resuming it is free
+        self.switches = 0
+        self.overhead = 0
+
+    def switch(self, index, time):
+        # Context-switch to a process; returns when it can start running
+        if index == self.last:
+            return time
+        self.last = index
+        self.switches += 1
+        if not self.switch_cost:
+            return time
+        self.sink.emit_overhead(time, time + self.switch_cost)
+        self.overhead += self.switch_cost
+        return time + self.switch_cost
+
+    def begin(self, index, time):
+        # Record start and response time the first time a process runs
+        if self.state[index] == PENDING:
+            self.state[index] = STARTED
+            self.start[index] = time
+            self.response[index] = time - self.table.arrival[index]
+
+    def complete(self, index, time):
+        self.state[index] = FINISHED
+        self.finish[index] = time
+        self.completed.append(index)
+        self.pid_ordered = False
+        if self.online is not None:
+            turnaround = time - self.table.arrival[index]
+            burst = self.table.burst[index]
+            phases = self.table.phases[index] if self.table.phases is not None else None
+            waiting = turnaround - burst - (sum(phases[1::2]) if phases else 0)
+            self.online.add(waiting, turnaround, self.response[index], burst)
+
+    def end_burst(self, index, time):
+        # A CPU burst finished. Returns when the process is back from I/O
+        # with its next burst, or None once it has completed.
+        phases = self.table.phases[index] if self.phase is not None else None
+        if phases is None or 2 * self.phase[index] + 1 >= len(phases):
+            self.complete(index, time)
+            return None
+        k = self.phase[index]
+        self.phase[index] = k + 1
+        self.remaining[index] = phases[2 * k + 2]
+        return time + phases[2 * k + 1]
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self.sink.close()
+
+    def reset_row(self, index):
+        self.state[index] = PENDING
+        self.remaining[index] = self.table.burst[index]
+        if self.phase is not None:
+            self.phase[index] = 0
+            if self.table.phases[index]:
+                self.remaining[index] = self.table.phases[index][0]
+
+    def __getstate__(self):
+        # Pickled for the disk cache without the table, which is attached
+        # again on load, and with only the schedule of the sink
+        state = {name: getattr(self, name) for name in self.__slots__ if name not in ('table', 'record')}
+        sink = NullSink()
+        if isinstance(self.sink, ListSink):
+            sink = ListSink()
+            sink.schedule = self.sink.schedule
+        state['sink'] = sink
+        return state
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+        self.table = None
+        self.record = self.sink.emit
+
+    def attach(self, table):
+        self.table = self.sink.table = table
+        if isinstance(self.sink, ListSink):
+            self.sink.schedule.table = table
+
+
+class ResultCache:
+    # Finished runs keyed by workload fingerprint and run configuration (see
+    # SchedulerEngine.run): an LRU of up to `size` runs in memory and, with a
+    # path, runs pickled in that directory, so engines and later sessions
+    # share them. The directory is kept under disk_bytes by deleting the
+    # least recently used files.
+    FORMAT = 2  # Part of every key; bumped when pickled runs change shape
+
+    def __init__(self, size=8, path=None, disk_bytes=1 << 30):
+        self.size = size
+        self.path = path
+        self.disk_bytes = disk_bytes
+        self.disk_used = None  # Bytes in the directory, counted on the first write
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        if path:
+            os.makedirs(path, exist_ok=True)
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+        elif self.path:
+            import pickle
+            try:
+                with open(self._file(key), 'rb') as f:
+                    entry = pickle.load(f)
+                os.utime(self._file(key))  # Recently used, so evicted last
+            except (OSError, EOFError, pickle.UnpicklingError):
+                entry = None  # Missing or half-written
+            except (AttributeError, ImportError):
+                entry = None  # Written by a version with other class paths
+            if entry is not None:
+                self._remember(key, entry)
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def put(self, key, entry):
+        self._remember(key, entry)
+        if self.path:
+            # Written aside and renamed, so readers never see a partial file
+            import pickle
+            path = self._file(key)
+            temporary = f"{path}.{os.getpid()}.{threading.get_ident()}"
+            with open(temporary, 'wb') as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary, path)
+            self._trim(os.path.getsize(path))
+
+    def clear(self):
+        # Forget the in-memory runs; the disk store is left alone
+        self.entries.clear()
+
+    def _remember(self, key, entry):
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+
+    def _file(self, key):
+        return os.path.join(self.path, f"{key}.pickle")
+
+    def _files(self):
+        files = []
+        for entry in os.scandir(self.path):
+            if entry.name.endswith('.pickle'):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue  # Deleted by another process
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        return files
+
+    def _trim(self, written):
+        # Other processes may share the directory, so the running total is
+        # only a hint; the directory is listed again before deleting
+        if self.disk_bytes is None:
+            return
+        if self.disk_used is None:
+            self.disk_used = sum(size for _, size, _ in self._files())
+        else:
+            self.disk_used += written
+        if self.disk_used <= self.disk_bytes:
+            return
+        files = sorted(self._files())
+        self.disk_used = sum(size for _, size, _ in files)
+        for _, size, path in files[:-1]:  # Never the file just written
+            if self.disk_used <= self.disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            self.disk_used -= size
+
+
+def _option_key(value):
+    # Large NumPy arrays have abbreviated reprs, so array options (e.g. an
+    # affinity per process) are keyed by a hash of their content
+    if isinstance(value, array):
+        return ('array', value.typecode, hashlib.blake2b(memoryview(value).cast('B'), digest_size=16).hexdigest())
+    if hasattr(value, 'dtype') and hasattr(value, 'tobytes'):
+        return ('ndarray', value.dtype.str, value.shape, hashlib.blake2b(value.tobytes(), digest_size=16).hexdigest())
+    if isinstance(value, (list, tuple)):
+        return tuple(_option_key(item) for item in value)
+    return value
+
+
+def _table_field(name):
+    def get(self):
+        return getattr(self._table, name)[self._index]
+
+    def set(self, value):
+        self._table.assign(name, self._index, value)
+
+    return property(get, set)
+
+
+def _optional_field(name):
+    # A ProcessTable optional column: None when the process has no value
+    def get(self):
+        column = getattr(self._table, name)
+        return None if column is None else column[self._index]
+
+    def set(self, value):
+        self._table.assign(name, self._index, value)
+
+    return property(get, set)
+
+
+def _run_field(name, state):
+    def get(self):
+        if self._run is None or self._run.state[self._index] < state:
+            return None
+        return getattr(self._run, name)[self._index]
+
+    return property(get)
+
+
+class Process:
+    # A thin view over one row of a ProcessTable and, optionally, one run's
+    # scratch columns. Constructing one directly gives a standalone process.
+    __slots__ = ('_table', '_run', '_index')
+
+    def __init__(self, pid, arrival_time, burst_time, priority=0, deadline=None, period=None):
+        self._table = ProcessTable()
+        self._table.append(pid, arrival_time, burst_time, priority, deadline, period)
+        self._run = self._table.new_run()
+        self._index = 0
+
+    @classmethod
+    def view(cls, table, run, index):
+        process = cls.__new__(cls)
+        process._table = table
+        process._run = run
+        process._index = index
+        return process
+
+    pid = _table_field('pid')
+    arrival_time = _table_field('arrival')
+    burst_time = _table_field('burst')
+    priority = _table_field('priority')
+    deadline = _optional_field('deadline')
+    period = _optional_field('period')
+    start_time = _run_field('start', STARTED)
+    response_time = _run_field('response', STARTED)
+    finish_time = _run_field('finish', FINISHED)
+
+    @property
+    def remaining_time(self):
+        if self._run is None:
+            return self.burst_time
+        return self._run.remaining[self._index]
+
+    @property
+    def turnaround_time(self):
+        if self.finish_time is None:
+            return 0
+        return self.finish_time - self.arrival_time
+
+    @property
+    def lateness(self):
+        # Finish time past the absolute deadline (negative: early), or None
+        if self.finish_time is None or self.deadline is None:
+            return None
+        return self.finish_time - self.arrival_time - self.deadline
+
+    @property
+    def tardiness(self):
+        lateness = self.lateness
+        return None if lateness is None else max(lateness, 0)
+
+    @property
+    def bursts(self):
+        # CPU and I/O bursts, alternating
+        phases = self._table.phases[self._index] if self._table.phases is not None else None
+        return phases or (self.burst_time,)
+
+    @property
+    def io_time(self):
+        return sum(self.bursts[1::2])
+
+    @property
+    def waiting_time(self):
+        if self.finish_time is None:
+            return 0
+        return self.turnaround_time - self.burst_time - self.io_time
+
+    @property
+    def execution_history(self):
+        # Only available when the run kept its schedule in memory
+        if self._run is None or not isinstance(self._run.sink, ListSink):
+            return []
+        return self._run.sink.schedule.slices(self._index)
+
+    def reset(self):
+        if self._run is not None:
+            self._run.reset_row(self._index)
+
+    def __str__(self):
+        return f"P{self.pid}"
+
+
+class ProcessList(Sequence):
+    # Read-only sequence of Process views, created on access
+    __slots__ = ('_table', '_run', '_indices')
+
+    def __init__(self, table, run=None, indices=None):
+        self._table = table
+        self._run = run
+        self._indices = range(len(table)) if indices is None else indices
+
+    def __len__(self):
+        return len(self._indices)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return ProcessList(self._table, self._run, self._indices[item])
+        return Process.view(self._table, self._run, self._indices[item])
+
+    def __iter__(self):
+        for index in self._indices:
+            yield Process.view(self._table, self._run, index)
+
+    def columns(self):
+        # The listed processes as NumPy columns, for bulk export. Run columns
+        # are only meaningful for processes that finished.
+        import numpy as np
+        indices = self._indices
+        if isinstance(indices, range):
+            indices = np.arange(indices.start, indices.stop, indices.step, dtype=np.int64)
+        else:
+            indices = np.array(indices, dtype=np.int64)
+        table, run = self._table, self._run
+        pid = table.pid
+        columns = {
+            'pid': _numpy_column(pid)[indices] if _column_code(pid) else np.asarray(pid, dtype=object)[indices],
+            'arrival_time': _numpy_column(table.arrival)[indices],
+            'burst_time': _numpy_column(table.burst)[indices],
+            'priority': _numpy_column(table.priority)[indices],
+        }
+        # Optional columns; rows without a value read NaN
+        for name in table.OPTIONAL_COLUMNS:
+            column = getattr(table, name)
+            if column is not None:
+                columns[name] = _numpy_column(column)[indices]
+        if run is not None:
+            columns['start_time'] = _numpy_column(run.start)[indices]
+            columns['finish_time'] = _numpy_column(run.finish)[indices]
+            columns['turnaround_time'] = columns['finish_time'] - columns['arrival_time']
+            columns['waiting_time'] = columns['turnaround_time'] - columns['burst_time']
+            if table.phases is not None:
+                columns['io_time'] = table.io_times()[indices]
+                columns['waiting_time'] = columns['waiting_time'] - columns['io_time']
+            columns['response_time'] = _numpy_column(run.response)[indices]
+            if 'deadline' in columns:
+                columns['lateness'] = columns['turnaround_time'] - columns['deadline']
+                columns['tardiness'] = np.maximum(columns['lateness'], 0)
+        return columns
+
+
+class SchedulingPolicy:
+    # Base class of single-CPU scheduling policies. SchedulerEngine.simulate()
+    # owns the clock, arrivals, I/O, context switches, the schedule and the
+    # metrics; a policy only keeps its ready set and decides what runs next
+    # and for how long, through these hooks (index is a table row):
+    #   on_arrival(index, time)  a process arrived and is ready
+    #   on_wake(index, time)     a process is back from I/O (default: on_arrival)
+    #   pick_next(time)          take the next process off the ready set and
+    #                            return its index, or None if nothing is ready
+    #   time_slice(index, time, next_time)
+    #                            how long it may run, or None for the rest of
+    #                            its CPU burst; next_time is the next arrival or
+    #                            return from I/O, or None
+    #   on_preempt(index, time)  its slice ended with CPU time left, so it is
+    #                            ready again (default: on_arrival)
+    #   on_complete(index, time) its CPU burst ended; it has completed, or is
+    #                            blocked on I/O if run.state[index] != FINISHED
+    #   queue_length()           processes in the ready set, or None if it is
+    #                            not known; only called while profiling
+    # start() hands over the table (pid, arrival, burst and priority columns)
+    # and the run (remaining, state, ...) before the first hook. Live runs
+    # (see live.py) add rows as processes arrive, calling resize() first,
+    # and reuse the rows of finished processes, so per-row state is set up
+    # in on_arrival().
+    #
+    # A policy is resumable when it never preempts and its only state is its
+    # ready set. simulate() then checkpoints its runs, and after processes
+    # are appended resumes from a checkpoint, calling resume() instead of
+    # replaying earlier arrivals.
+    resumable = False
+
+    def time_values(self):
+        # Time parameters (e.g. a quantum); floats widen the run's columns
+        return ()
+
+    def start(self, table, run):
+        self.table = table
+        self.run = run
+
+    def resize(self, rows):
+        # The table now has this many rows
+        pass
+
+    def on_arrival(self, index, time):
+        raise NotImplementedError
+
+    def on_wake(self, index, time):
+        self.on_arrival(index, time)
+
+    def pick_next(self, time):
+        raise NotImplementedError
+
+    def time_slice(self, index, time, next_time):
+        return None
+
+    def on_preempt(self, index, time):
+        self.on_arrival(index, time)
+
+    def on_complete(self, index, time):
+        pass
+
+    def queue_length(self):
+        return None
+
+    def resume(self, time, ready):
+        # Rebuild the ready set at a checkpoint; ready lists the processes
+        # waiting there, in index order
+        for index in ready:
+            self.on_arrival(index, time)
+
+
+class FCFSPolicy(SchedulingPolicy):
+    # Each CPU burst runs to the end, in the order processes became ready;
+    # ties by arrival then pid
+    resumable = True
+
+    def start(self, table, run):
+        super().start(table, run)
+        self.ready = []
+        self._arrival, self._pid = table.arrival, table.pid
+        if table.phases is None and not run.completed:
+            # A fresh run where nobody comes back from I/O: the order is known
+            # up front, by arrival, ties by pid (two stable sorts)
+            self._order = sorted(range(len(table)), key=table.pid.__getitem__)
+            self._order.sort(key=table.arrival.__getitem__)
+            self._next = 0
+            self.on_arrival = self._ignore
+            self.pick_next = self._pick_in_order
+
+    def _ignore(self, index, time):
+        pass
+
+    def _pick_in_order(self, time):
+        k = self._next
+        if k < len(self._order):
+            i = self._order[k]
+            if self._arrival[i] <= time:
+                self._next = k + 1
+                return i
+        return None
+
+    def on_arrival(self, index, time):
+        arrival = self._arrival[index]
+        heapq.heappush(self.ready, (arrival, arrival, self._pid[index], index))
+
+    def on_wake(self, index, time):
+        heapq.heappush(self.ready, (time, self._arrival[index], self._pid[index], index))
+
+    def pick_next(self, time):
+        return heapq.heappop(self.ready)[3] if self.ready else None
+
+    def queue_length(self):
+        # Not tracked on the presorted path
+        return None if 'pick_next' in vars(self) else len(self.ready)
+
+
+class _KeyedPolicy(SchedulingPolicy):
+    # Ready heap ordered by a column, ties by arrival then pid. Preemptive
+    # slices end at the next arrival or return from I/O, when the heap is
+    # consulted again.
+    def __init__(self, preemptive=False):
+        self.preemptive = preemptive
+
+    @property
+    def resumable(self):
+        return not self.preemptive
+
+    def key(self, table, run):
+        raise NotImplementedError
+
+    def start(self, table, run):
+        super().start(table, run)
+        self.ready = []
+        self._key, self._arrival, self._pid = self.key(table, run), table.arrival, table.pid
+
+    def on_arrival(self, index, time):
+        heapq.heappush(self.ready, (self._key[index], self._arrival[index], self._pid[index], index))
+
+    def pick_next(self, time):
+        return heapq.heappop(self.ready)[3] if self.ready else None
+
+    def time_slice(self, index, time, next_time):
+        if self.preemptive and next_time is not None:
+            return next_time - time
+        return None
+
+    def queue_length(self):
+        return len(self.ready)
+
+
+class SJFPolicy(_KeyedPolicy):
+    # Shortest remaining time first (SRTF when preemptive)
+    def key(self, table, run):
+        return run.remaining
+
+
+class PriorityPolicy(_KeyedPolicy):
+    # Lower value = higher priority
+    def __init__(self, preemptive=True):
+        super().__init__(preemptive)
+
+    def key(self, table, run):
+        return table.priority
+
+
+class EDFPolicy(_KeyedPolicy):
+    # Earliest absolute deadline (arrival + deadline) first. Processes
+    # without a deadline only run when no process with one is ready.
+    def __init__(self, preemptive=True):
+        super().__init__(preemptive)
+
+    def key(self, table, run):
+        return None
+
+    def on_arrival(self, index, time):
+        # The key is read per arrival, so rows added later (live runs) work
+        deadline = self.table.deadline
+        deadline = None if deadline is None else deadline[index]
+        arrival = self._arrival[index]
+        heapq.heappush(self.ready, (math.inf if deadline is None else arrival + deadline, arrival,
+                                    self._pid[index], index))
+
+
+class RateMonotonicPolicy(_KeyedPolicy):
+    # Fixed priorities by period, shortest first. Processes without a period
+    # rank after every periodic one.
+    def __init__(self, preemptive=True):
+        super().__init__(preemptive)
+
+    def key(self, table, run):
+        return None
+
+    def on_arrival(self, index, time):
+        period = self.table.period
+        period = None if period is None else period[index]
+        heapq.heappush(self.ready, (math.inf if period is None else period, self._arrival[index],
+                                    self._pid[index], index))
+
+
+class RoundRobinPolicy(SchedulingPolicy):
+    # FIFO ready queue, one quantum per turn. With merge_slices, a process
+    # alone on the CPU runs whole quanta up to the first one that reaches the
+    # next arrival, as a single schedule entry.
+    def __init__(self, quantum=2, merge_slices=False):
+        self.quantum = quantum
+        self.merge_slices = merge_slices
+
+    def time_values(self):
+        return (self.quantum,)
+
+    def start(self, table, run):
+        super().start(table, run)
+        self.queue = deque()
+
+    def on_arrival(self, index, time):
+        self.queue.append(index)
+
+    def pick_next(self, time):
+        return self.queue.popleft() if self.queue else None
+
+    def time_slice(self, index, time, next_time):
+        if self.merge_slices and not self.queue:
+            if next_time is None:
+                return None
+            return max(self.quantum, -(-(next_time - time) // self.quantum) * self.quantum)
+        return self.quantum
+
+    def queue_length(self):
+        return len(self.queue)
+
+
+class MLFQPolicy(SchedulingPolicy):
+    # Multilevel feedback queue. Processes enter the top level (0) and drop a
+    # level once they have used up that level's quantum (default: quantum,
+    # doubled per level). A higher level always runs first, so an arrival
+    # cuts short a slice from a lower level; the interrupted process resumes
+    # at the head of its level with the rest of its quantum. A process
+    # blocked on I/O keeps its level and quantum use. Every boost_interval
+    # time units, all waiting and blocked processes move back to the top
+    # level.
+    def __init__(self, levels=3, quanta=None, boost_interval=None, quantum=2):
+        quanta = [quantum * 2 ** level for level in range(levels)] if quanta is None else list(quanta)
+        if len(quanta) != levels or levels < 1:
+            raise ValueError("MLFQ needs one quantum per level")
+        if min(quanta) <= 0:
+            raise ValueError("MLFQ quanta must be positive")
+        self.quanta = quanta
+        self.boost_interval = boost_interval
+
+    def time_values(self):
+        return (*self.quanta, *([self.boost_interval] if self.boost_interval else []))
+
+    def start(self, table, run):
+        super().start(table, run)
+        n = len(table)
+        self.used = [0] * n  # Time used of the current level's quantum
+        self.level_of = [0] * n  # Level to return to after I/O
+        self.queues = [deque() for _ in self.quanta]
+        self.blocked = set()
+        self.next_boost = self.boost_interval
+        self.level = 0  # Of the running process
+        self.slice_start = 0
+
+    def resize(self, rows):
+        grow = rows - len(self.used)
+        self.used.extend([0] * grow)
+        self.level_of.extend([0] * grow)
+
+    def on_arrival(self, index, time):
+        self.used[index] = self.level_of[index] = 0
+        self.queues[0].append(index)
+
+    def on_wake(self, index, time):
+        self.blocked.discard(index)
+        self.queues[self.level_of[index]].append(index)
+
+    def pick_next(self, time):
+        if self.boost_interval and time >= self.next_boost:
+            # Priority boost: every waiting process to the top level
+            used, queues = self.used, self.queues
+            for queue in queues[1:]:
+                for i in queue:
+                    used[i] = 0
+                queues[0].extend(queue)
+                queue.clear()
+            for i in self.blocked:
+                used[i] = self.level_of[i] = 0
+            self.next_boost = (time // self.boost_interval + 1) * self.boost_interval
+        for level, queue in enumerate(self.queues):
+            if queue:
+                self.level = level
+                return queue.popleft()
+        return None
+
+    def time_slice(self, index, time, next_time):
+        self.slice_start = time
+        run_time = self.quanta[self.level] - self.used[index]
+        if self.level and next_time is not None:
+            # An arrival enters the top level and takes the CPU, as may a
+            # process back from I/O
+            run_time = min(run_time, next_time - time)
+        return run_time
+
+    def _demote(self, index):
+        # Quantum used up: the level below, with a fresh quantum
+        self.used[index] = 0
+        return min(self.level + 1, len(self.quanta) - 1)
+
+    def on_preempt(self, index, time):
+        self.used[index] += time - self.slice_start
+        if self.used[index] >= self.quanta[self.level]:
+            self.queues[self._demote(index)].append(index)
+        else:
+            self.queues[self.level].appendleft(index)
+
+    def on_complete(self, index, time):
+        self.used[index] += time - self.slice_start
+        if self.run.state[index] != FINISHED:
+            used_up = self.used[index] >= self.quanta[self.level]
+            self.level_of[index] = self._demote(index) if used_up else self.level
+            self.blocked.add(index)
+
+    def queue_length(self):
+        return sum(len(queue) for queue in self.queues)
+
+
+class CFSPolicy(SchedulingPolicy):
+    # CFS-style fair scheduling: the runnable process with the least virtual
+    # runtime runs next, for its weight's share of target_latency but at
+    # least min_granularity. Virtual runtime grows inversely to weight.
+    # Weights come from the priority read as a Linux nice value (clamped to
+    # -20..19), so one priority step is about 25% more CPU. Arrivals start at
+    # the current minimum virtual runtime, processes back from I/O no lower
+    # than it, and both wait for the running slice to end.
+    def __init__(self, target_latency=24, min_granularity=3):
+        if min_granularity <= 0 or target_latency <= 0:
+            raise ValueError("CFS needs a positive target_latency and min_granularity")
+        self.target_latency = target_latency
+        self.min_granularity = min_granularity
+
+    def time_values(self):
+        return self.target_latency, self.min_granularity
+
+    def start(self, table, run):
+        super().start(table, run)
+        # Slices are cut to whole time units when every time is an integer.
+        # Tables with list columns (e.g. live ones, filled as processes
+        # arrive) have no typecode, so their times are checked by value:
+        # rows now and arrivals to come.
+        code = table.time_code(self.target_latency, self.min_granularity)
+        self.by_value = code is None
+        self.integer = code == 'q' or (self.by_value and _integral(self.target_latency, self.min_granularity)
+                                       and all(self._integral_row(i) for i in range(len(table))))
+        self.weight = [1.0] * len(table)  # Set on arrival
+        self.vruntime = [0.0] * len(table)
+        self.ready = []  # (vruntime, arrival, pid, index) heap
+        self.joining = []  # (index, woken) to place at the next pick
+        self.total_weight = 0.0  # Of every runnable process, including the running one
+        self.min_vruntime = 0.0
+        self.slice_start = 0
+
+    def resize(self, rows):
+        grow = rows - len(self.weight)
+        self.weight.extend([1.0] * grow)
+        self.vruntime.extend([0.0] * grow)
+
+    def _integral_row(self, index):
+        phases = self.table.phases[index] if self.table.phases is not None else None
+        return _integral(self.table.arrival[index], self.table.burst[index], *(phases or ()))
+
+    def on_arrival(self, index, time):
+        if self.by_value and self.integer:
+            self.integer = self._integral_row(index)
+        self.joining.append((index, False))
+
+    def on_wake(self, index, time):
+        self.joining.append((index, True))
+
+    def pick_next(self, time):
+        ready, vruntime, weight = self.ready, self.vruntime, self.weight
+        if self.joining:
+            arrival, pid, priority = self.table.arrival, self.table.pid, self.table.priority
+            for i, woken in self.joining:
+                if woken:
+                    vruntime[i] = max(vruntime[i], self.min_vruntime)
+                else:
+                    vruntime[i] = self.min_vruntime
+                    weight[i] = NICE_0_WEIGHT / 1.25 ** min(max(priority[i], -20), 19)
+                self.total_weight += weight[i]
+                heapq.heappush(ready, (vruntime[i], arrival[i], pid[i], i))
+            self.joining.clear()
+        return heapq.heappop(ready)[3] if ready else None
+
+    def time_slice(self, index, time, next_time):
+        self.slice_start = time
+        time_slice = self.target_latency * self.weight[index] / self.total_weight
+        if self.integer:
+            time_slice = int(time_slice)
+        return max(self.min_granularity, time_slice)
+
+    def _charge(self, index, time):
+        self.vruntime[index] += (time - self.slice_start) * NICE_0_WEIGHT / self.weight[index]
+
+    def on_preempt(self, index, time):
+        self._charge(index, time)
+        heapq.heappush(self.ready, (self.vruntime[index], self.table.arrival[index], self.table.pid[index], index))
+        self.min_vruntime = max(self.min_vruntime, self.ready[0][0])
+
+    def on_complete(self, index, time):
+        self._charge(index, time)
+        if self.ready:
+            self.total_weight -= self.weight[index]
+            self.min_vruntime = max(self.min_vruntime, self.ready[0][0])
+        else:
+            self.total_weight = 0.0  # No drift when the queue drains
+
+    def queue_length(self):
+        return len(self.ready) + len(self.joining)
+
+
+# Policies SchedulerEngine.run() knows by name: name -> factory(engine),
+# which returns a fresh SchedulingPolicy for one run
+POLICIES = {}
+
+
+def register_policy(name, factory):
+    # Make a policy available by name to SchedulerEngine.run() (and so to the
+    # sweep and benchmark scripts), e.g.
+    # register_policy("Lottery", lambda engine: LotteryPolicy(seed=0))
+    POLICIES[name] = factory
+    return factory
+
+
+register_policy("FCFS", lambda engine: FCFSPolicy())
+register_policy("SJF", lambda engine: SJFPolicy())
+register_policy("SRTF", lambda engine: SJFPolicy(preemptive=True))
+register_policy("RR", lambda engine: RoundRobinPolicy(engine.quantum))
+register_policy("Priority", lambda engine: PriorityPolicy())
+register_policy("MLFQ", lambda engine: MLFQPolicy(quantum=engine.quantum))
+register_policy("CFS", lambda engine: CFSPolicy())
+register_policy("EDF", lambda engine: EDFPolicy())
+register_policy("RM", lambda engine: RateMonotonicPolicy())
+
+
+class _Checkpoints:
+    # What a resumable run leaves behind: its configuration, the table as it
+    # was, the finished run, and every CHECKPOINT_INTERVAL picks the clock
+    # (times) plus (arrival cursor, schedule entries, end of the last entry,
+    # completed processes, switches, overhead, last process) (marks)
+    __slots__ = ('config', 'table', 'revision', 'rows', 'code', 'switch_cost', 'run', 'order', 'arrivals',
+                 'times', 'marks')
+
+    def __init__(self, config, table, code, switch_cost, run, arrivals, times, marks):
+        self.config = config
+        self.table = table
+        self.revision = table.revision
+        self.rows = len(table)
+        self.code = code
+        self.switch_cost = switch_cost
+        self.run = run
+        self.order = array('q', run.completed)  # Completion order, before results sort it
+        self.arrivals = arrivals
+        self.times = times
+        self.marks = marks
+
+
+class SchedulerEngine:
+    CHECKPOINT_INTERVAL = 256  # Picks between checkpoints of resumable runs
+    SMP_ALGORITHMS = ("FCFS", "SJF", "SRTF", "RR", "Priority", "EDF", "RM")  # Those smp() simulates
+    QUANTUM_FREE = ("FCFS", "SJF", "SRTF", "Priority", "CFS", "EDF", "RM")  # Built-ins that ignore the quantum
+
+    def __init__(self):
+        self.table = ProcessTable()
+        self.quantum = 2  # Default quantum for Round Robin
+        self.context_switch = 0  # CPU time lost whenever the running process changes
+        self.sink = None  # Where runs send schedule slices; None keeps a list
+        self.cache = None  # A ResultCache makes run() reuse earlier results
+        self.profiler = None  # A profiling.Profiler times and counts what simulate() does
+        self._run = None
+        self._checkpoints = None  # Of the last resumable run
+        self.reset()
+
+    @property
+    def processes(self):
+        return ProcessList(self.table)
+
+    @property
+    def completed_processes(self):
+        return ProcessList(self.table, self._run, self._run.completed)
+
+    @property
+    def online_metrics(self):
+        # Rolling metrics of the current run when it streams its schedule
+        return self._run.online
+
+    def add_process(self, pid, arrival_time, burst_time, priority=0, deadline=None, period=None):
+        self.table.append(pid, arrival_time, burst_time, priority, deadline, period)
+
+    def add_processes(self, pids, arrival_times, burst_times, priorities=None, deadlines=None, periods=None):
+        self.table.extend(pids, arrival_times, burst_times, priorities, deadlines, periods)
+
+    def add_periodic_task(self, pid, burst_time, period, deadline=None, arrival_time=0, jobs=None, until=None,
+                          priority=0):
+        # One process per job of a periodic task; see
+        # ProcessTable.extend_periodic
+        self.table.extend_periodic(pid, burst_time, period, deadline, arrival_time, jobs, until, priority)
+
+    def reset(self):
+        self._new_run(None)
+
+    def _new_run(self, sink, *time_values):
+        # Extra time values (e.g. the quantum) widen the run's time columns
+        # when they are floats
+        if self._run is not None:
+            self._run.close()
+        self.current_time = 0
+        self._run = self.table.new_run(*time_values, sink=sink, switch_cost=self.context_switch)
+        self.schedule = getattr(self._run.sink, 'schedule', None)
+
+    def clear_all_processes(self):
+        # A new table, so results from earlier runs keep their own rows
+        self.table = ProcessTable()
+        self.reset()
+
+    def run(self, algorithm, preemptive=None, quantum=None, cpus=1, **options):
+        # Run a registered policy by name; preemptive=None keeps the policy
+        # default. More than one CPU, or any smp() option, runs the
+        # multi-CPU model.
+        if quantum is not None:
+            self.quantum = quantum
+        # Only runs whose schedule is kept in memory, or not wanted, can be
+        # answered from the cache
+        if self.cache is None or not (self.sink is None or isinstance(self.sink, (ListSink, NullSink))):
+            return self._dispatch(algorithm, preemptive, cpus, options)
+        key = self._cache_key(algorithm, preemptive, cpus, options)
+        entry = self.cache.get(key)
+        if entry is not None:
+            return self._restore(entry)
+        results = self._dispatch(algorithm, preemptive, cpus, options)
+        self.cache.put(key, (self._run, self.current_time,
+                             {name: value for name, value in results.items() if name not in ('schedule', 'processes')}))
+        return results
+
+    def _cache_key(self, algorithm, preemptive, cpus, options):
+        # The workload's content plus everything that can change the outcome;
+        # add_process() and friends change the fingerprint, so stale entries
+        # are never hit
+        quantum = None if algorithm in self.QUANTUM_FREE else self.quantum
+        config = (algorithm, preemptive, quantum, cpus,
+                  sorted((name, _option_key(value)) for name, value in options.items()), self.context_switch,
+                  isinstance(self.sink, NullSink))
+        key = f"{ResultCache.FORMAT}:{self.table.fingerprint()}:{config!r}"
+        return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+
+    def _restore(self, entry):
+        run, current_time, metrics = entry
+        if self._run is not None:
+            self._run.close()
+        run.attach(self.table)
+        self._run = run
+        self.current_time = current_time
+        self.schedule = getattr(run.sink, 'schedule', None)
+        results = {'schedule': self.schedule, 'processes': self.completed_processes}
+        results.update(metrics)
+        return results
+
+    def _dispatch(self, algorithm, preemptive, cpus, options):
+        if cpus != 1 or options:
+            if preemptive is None:
+                preemptive = algorithm in ("Priority", "EDF", "RM")
+            return self.smp(cpus, algorithm, preemptive=preemptive, **options)
+        if algorithm == "SJF" and preemptive is not None:
+            return self.sjf(preemptive=bool(preemptive))
+        if algorithm == "Priority" and preemptive is not None:
+            return self.priority_scheduling(preemptive=preemptive)
+        if algorithm == "EDF" and preemptive is not None:
+            return self.edf(preemptive=preemptive)
+        if algorithm == "RM" and preemptive is not None:
+            return self.rate_monotonic(preemptive=preemptive)
+        factory = POLICIES.get(algorithm)
+        if factory is None:
+            raise ValueError(f"Unknown algorithm: {algorithm}")
+        return self.simulate(factory(self))
+
+    def fcfs(self):
+        return self.simulate(FCFSPolicy())
+
+    def sjf(self, preemptive=False):
+        # Shortest remaining time first, ties broken by arrival then pid
+        return self.simulate(SJFPolicy(preemptive))
+
+    def round_robin(self, merge_slices=False):
+        return self.simulate(RoundRobinPolicy(self.quantum, merge_slices))
+
+    def priority_scheduling(self, preemptive=True):
+        # Lower value = higher priority, ties broken by arrival then pid
+        return self.simulate(PriorityPolicy(preemptive))
+
+    def edf(self, preemptive=True):
+        # Earliest deadline first, ties broken by arrival then pid
+        return self.simulate(EDFPolicy(preemptive))
+
+    def rate_monotonic(self, preemptive=True):
+        # Shortest period first, ties broken by arrival then pid
+        return self.simulate(RateMonotonicPolicy(preemptive))
+
+    def mlfq(self, levels=3, quanta=None, boost_interval=None):
+        return self.simulate(MLFQPolicy(levels, quanta, boost_interval, self.quantum))
+
+    def cfs(self, target_latency=24, min_granularity=3):
+        return self.simulate(CFSPolicy(target_latency, min_granularity))
+
+    def simulate(self, policy):
+        # Discrete-event loop shared by every single-CPU policy: it admits
+        # arrivals and returns from I/O, charges context switches, runs the
+        # slices the policy hands out and records the schedule and metrics.
+        # Runs of resumable policies are checkpointed; when the same policy
+        # runs again after processes were appended, it resumes from the last
+        # checkpoint before the first new arrival instead of starting over.
+        # With a profiler set (see profiling.py), the hooks are wrapped with
+        # timers and counters.
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.begin(type(policy).__name__)
+        config = (type(policy), sorted(vars(policy).items()))
+        resumed = self._resume(policy, config)
+        if resumed is None:
+            self._new_run(self.sink, *policy.time_values())
+            policy.start(self.table, self._run)
+            # Arrival queue is sorted once and consumed through a cursor
+            arrivals = sorted(range(len(self.table)), key=self.table.arrival.__getitem__)
+            now, next_arrival, times, marks = 0, 0, [], []
+        else:
+            now, next_arrival, arrivals, times, marks = resumed
+        run = self._run
+        arrival, remaining = self.table.arrival, run.remaining
+        checkpoints = policy.resumable and self.table.phases is None and isinstance(run.sink, (ListSink, NullSink))
+        schedule = run.sink.schedule if isinstance(run.sink, ListSink) else ()
+        interval, picks = self.CHECKPOINT_INTERVAL, 0
+
+        on_arrival, pick_next = policy.on_arrival, policy.pick_next
+        time_slice, on_complete = policy.time_slice, policy.on_complete
+        # Default hooks are skipped, or bound straight to on_arrival
+        kind = type(policy)
+        on_wake = policy.on_wake if kind.on_wake is not SchedulingPolicy.on_wake else on_arrival
+        on_preempt = policy.on_preempt if kind.on_preempt is not SchedulingPolicy.on_preempt else on_arrival
+        sliced = kind.time_slice is not SchedulingPolicy.time_slice
+        notify = kind.on_complete is not SchedulingPolicy.on_complete
+        switch, record, state, phases = run.switch, run.record, run.state, run.phase is not None
+        complete, end_burst = run.complete, run.end_burst
+        if profiler is not None:
+            (on_arrival, on_wake, pick_next, time_slice, on_preempt, on_complete, switch, record, complete,
+             end_burst) = profiler.instrument(policy, run, on_arrival, on_wake, pick_next, time_slice, on_preempt,
+                                              on_complete, switch, record, complete, end_burst)
+        n = len(arrivals)
+        blocked = []  # (time back from I/O, index) heap
+
+        while True:
+            if next_arrival < n and arrival[arrivals[next_arrival]] <= now:
+                if next_arrival + 1 < n and arrival[arrivals[next_arrival + 1]] <= now:
+                    next_arrival = self._admit_arrivals(arrivals, next_arrival, now, on_arrival)
+                else:
+                    on_arrival(arrivals[next_arrival], now)
+                    next_arrival += 1
+            if blocked and blocked[0][0] <= now:
+                self._admit_wakeups(blocked, now, on_wake)
+
+            if checkpoints:
+                if not picks % interval:
+                    times.append(now)
+                    marks.append((next_arrival, len(schedule), schedule.ends[-1] if schedule else None,
+                                  len(run.completed), run.switches, run.overhead, run.last))
+                picks += 1
+
+            i = pick_next(now)
+            if i is None or sliced:
+                next_time = arrival[arrivals[next_arrival]] if next_arrival < n else None
+                if blocked and (next_time is None or blocked[0][0] < next_time):
+                    next_time = blocked[0][0]
+                if i is None:
+                    if next_time is None:
+                        break  # No more processes to execute
+                    # No process available, advance time to next arrival
+                    now = next_time
+                    continue
+
+            now = switch(i, now)
+            if state[i] == PENDING:
+                run.begin(i, now)
+
+            # The policy's slice, cut to the rest of the CPU burst; a slice
+            # that ends at an arrival during the context switch is empty
+            left = remaining[i]
+            run_time = time_slice(i, now, next_time) if sliced else None
+            if run_time is None or run_time >= left:
+                run_time = left
+            elif run_time < 0:
+                run_time = 0
+            if run_time or not left:
+                record(i, now, now + run_time)
+            now += run_time
+            left -= run_time
+            remaining[i] = left
+
+            # Check for new arrivals again after execution
+            if next_arrival < n and arrival[arrivals[next_arrival]] <= now:
+                if next_arrival + 1 < n and arrival[arrivals[next_arrival + 1]] <= now:
+                    next_arrival = self._admit_arrivals(arrivals, next_arrival, now, on_arrival)
+                else:
+                    on_arrival(arrivals[next_arrival], now)
+                    next_arrival += 1
+            if blocked and blocked[0][0] <= now:
+                self._admit_wakeups(blocked, now, on_wake)
+
+            if left == 0:
+                # CPU burst done: the process completes or blocks on I/O
+                if phases:
+                    wake_time = end_burst(i, now)
+                    if wake_time is not None:
+                        heapq.heappush(blocked, (wake_time, i))
+                else:
+                    complete(i, now)
+                if notify:
+                    on_complete(i, now)
+            else:
+                on_preempt(i, now)
+
+        self._checkpoints = None
+        if checkpoints:
+            code = self.table.time_code(self.context_switch, *policy.time_values())
+            self._checkpoints = _Checkpoints(config, self.table, code, self.context_switch, run, arrivals, times, marks)
+        self.current_time = now
+        if profiler is not None:
+            return profiler.finish(self.get_results)
+        return self.get_results()
+
+    def _resume(self, policy, config):
+        # Set up a run from the last run's checkpoints, when the same policy
+        # ran on this table and rows were only appended since. Returns the
+        # loop state (clock, arrival cursor, arrivals, checkpoints), or None.
+        saved, table = self._checkpoints, self.table
+        if (saved is None or saved.config != config or saved.table is not table or saved.revision != table.revision
+                or len(table) < saved.rows or saved.switch_cost != self.context_switch or table.phases is not None
+                or table.time_code(self.context_switch, *policy.time_values()) != saved.code):
+            return None
+        keeps = self.sink is None or isinstance(self.sink, ListSink)
+        if not (keeps and isinstance(saved.run.sink, ListSink) or isinstance(self.sink, NullSink)):
+            return None
+
+        # Everything before the first new arrival stands
+        arrival = table.arrival
+        added = sorted(range(saved.rows, len(table)), key=arrival.__getitem__)
+        k = bisect.bisect_left(saved.times, arrival[added[0]]) if added else len(saved.times)
+        if k == 0:
+            return None
+        now = saved.times[k - 1]
+        next_arrival, slices, tail, completed, switches, overhead, last = saved.marks[k - 1]
+
+        old = saved.run
+        self._new_run(self.sink, *policy.time_values())
+        run = self._run
+        for name in ('remaining', 'start', 'finish', 'response'):
+            getattr(run, name)[:saved.rows] = getattr(old, name)[:saved.rows]
+        run.state[:saved.rows] = old.state[:saved.rows]
+        for i in saved.order[completed:]:
+            run.reset_row(i)
+        run.completed = saved.order[:completed]
+        run.switches, run.overhead, run.last = switches, overhead, last
+        if keeps:
+            # The last entry may have grown after the checkpoint
+            run.sink.schedule.extend_from(old.sink.schedule, slices, tail)
+            if isinstance(run.sink, ProgressSink):
+                run.sink.restored()
+
+        # New arrivals all come after the cursor
+        arrivals = saved.arrivals
+        if added:
+            arrivals = arrivals[:next_arrival] + list(heapq.merge(arrivals[next_arrival:], added,
+                                                                  key=arrival.__getitem__))
+        policy.start(table, run)
+        state = run.state
+        policy.resume(now, sorted(i for i in arrivals[:next_arrival] if state[i] == PENDING))
+        return now, next_arrival, arrivals, saved.times[:k], saved.marks[:k]
+
+    def _admit_arrivals(self, arrivals, next_arrival, now, admit):
+        # Admit everything that has arrived by now. A batch is admitted in
+        # insertion order, not arrival order, like the original list scan.
+        arrival = self.table.arrival
+        end = next_arrival
+        while end < len(arrivals) and arrival[arrivals[end]] <= now:
+            end += 1
+        if end - next_arrival == 1:
+            admit(arrivals[next_arrival], now)
+        else:
+            for i in sorted(arrivals[next_arrival:end]):
+                admit(i, now)
+        return end
+
+    def _admit_wakeups(self, blocked, now, admit):
+        # Hand every process back from I/O by now to admit(index, now)
+        while blocked and blocked[0][0] <= now:
+            admit(heapq.heappop(blocked)[1], now)
+
+    def smp(self, cpus, algorithm="FCFS", preemptive=False, queues="global", balance="steal",
+            balance_interval=None, affinity=None):
+        # Event-driven simulation of `cpus` identical CPUs under one policy.
+        # queues="global" shares one ready queue between the CPUs; "per-cpu"
+        # gives each CPU its own, fed by placing arrivals on an idle CPU or
+        # else round robin, and levelled either by idle CPUs stealing from
+        # the longest queue (balance="steal") or by spreading queued work
+        # evenly every balance_interval time units (balance="periodic").
+        # affinity optionally pins processes: a CPU number per table row, -1
+        # for any. Pinned processes only run on their CPU and never migrate.
+        if algorithm not in self.SMP_ALGORITHMS:
+            raise ValueError(f"Unknown algorithm: {algorithm}")
+        if algorithm == "SRTF":
+            algorithm, preemptive = "SJF", True
+        if queues not in ("global", "per-cpu"):
+            raise ValueError(f"Unknown queue layout: {queues}")
+        if balance not in ("steal", "periodic", None):
+            raise ValueError(f"Unknown load balancing: {balance}")
+        if balance == "periodic" and not (balance_interval and balance_interval > 0):
+            raise ValueError("Periodic balancing needs a positive balance_interval")
+        if cpus < 1:
+            raise ValueError("Need at least one CPU")
+
+        rr = algorithm == "RR"
+        if rr:
+            self._new_run(self.sink, self.quantum)
+        else:
+            self._new_run(self.sink)
+        run = self._run
+        arrival, pid, remaining = self.table.arrival, self.table.pid, run.remaining
+        n = len(arrival)
+        quantum = self.quantum
+        preemptive = bool(preemptive) and algorithm in ("SJF", "Priority", "EDF", "RM")
+        per_cpu = queues == "per-cpu"
+        steal = per_cpu and balance == "steal"
+        interval = balance_interval if per_cpu and balance == "periodic" else None
+
+        pinned = [-1] * n if affinity is None else list(affinity)
+        if len(pinned) != n:
+            raise ValueError("affinity needs one CPU number per process")
+        if any(c >= cpus for c in pinned):
+            raise ValueError(f"affinity names a CPU outside 0..{cpus - 1}")
+
+        # Ready queues are heaps of (key..., index) entries, ordered like the
+        # single-CPU algorithms; RR orders by enqueue sequence
+        if algorithm == "FCFS":
+            def entry(i):
+                return (arrival[i], pid[i], i)
+        elif algorithm == "SJF":
+            def entry(i):
+                return (remaining[i], arrival[i], pid[i], i)
+        elif algorithm == "Priority":
+            priority = self.table.priority
+
+            def entry(i):
+                return (priority[i], arrival[i], pid[i], i)
+        elif algorithm in ("EDF", "RM"):
+            # Absolute deadline or period; rows without one go last
+            column = self.table.deadline if algorithm == "EDF" else self.table.period
+            offset = arrival if algorithm == "EDF" else None
+
+            def entry(i):
+                value = None if column is None else column[i]
+                if value is None:
+                    value = math.inf
+                elif offset is not None:
+                    value += offset[i]
+                return (value, arrival[i], pid[i], i)
+        else:
+            sequence = itertools.count().__next__
+
+            def entry(i):
+                return (sequence(), i)
+
+        # Preemption compares queue entries with the running processes' keys;
+        # for SJF the running key holds the slice end, so it ages without
+        # being updated
+        if algorithm == "SJF":
+            def urgency(e, time):
+                return (time + e[0],) + e[1:]
+        else:
+            def urgency(e, time):
+                return e
+
+        shared = [[] for _ in range(cpus if per_cpu else 1)]
+        local = [[] for _ in range(cpus)]  # Pinned processes, per CPU
+        running = [-1] * cpus
+        slice_start = [0] * cpus
+        running_key = [()] * cpus  # () sorts below any key, so idle CPUs are never preempted
+        version = [0] * cpus  # Bumped on preemption to void the pending slice end
+        last = [-1] * cpus  # Process each CPU ran last, so resuming it is free
+        switch_cost = self.context_switch
+        busy = [0] * cpus
+        idle = list(range(cpus - 1, -1, -1))  # Stack; entries may be stale
+        in_idle = bytearray(b'\x01') * cpus
+        # (time, cpu, version) heap of slice ends; cpu == cpus is a balance
+        # tick and cpu == cpus + 1 a return from I/O, with the index as version
+        events = []
+        cores = array('q') if self.schedule is not None else None
+        if cores is not None:
+            # One core per entry, so slices are never merged, even across
+            # a migration that resumes a process where it stopped
+            self.schedule.coalesce = False
+        arrivals = sorted(range(n), key=arrival.__getitem__)
+        next_arrival = 0
+        next_home = 0
+        balance_due = False
+        migrations = 0
+        makespan = 0
+        now = 0
+
+        def dispatch(c):
+            # Start the most urgent process CPU c may run, or leave it idle
+            nonlocal migrations
+            queue, mine = shared[c if per_cpu else 0], local[c]
+            if queue and (not mine or queue[0] < mine[0]):
+                e = heapq.heappop(queue)
+            elif mine:
+                e = heapq.heappop(mine)
+            else:
+                victim = max(shared, key=len) if steal else None
+                if not victim:
+                    running[c] = -1
+                    running_key[c] = ()
+                    if not in_idle[c]:
+                        in_idle[c] = 1
+                        idle.append(c)
+                    return
+                e = victim.pop()  # A leaf, so the victim stays a heap
+                migrations += 1
+            i = e[-1]
+            start = now
+            if last[c] != i:
+                last[c] = i
+                run.switches += 1
+                if switch_cost:
+                    start += switch_cost
+                    run.sink.emit_overhead(now, start)
+                    if cores is not None:
+                        cores.append(c)
+                    run.overhead += switch_cost
+            run.begin(i, start)
+            running[c] = i
+            slice_start[c] = start
+            if preemptive:
+                running_key[c] = urgency(e, start)
+            version[c] += 1
+            run_time = remaining[i]
+            if rr and run_time > quantum:
+                run_time = quantum
+            heapq.heappush(events, (start + run_time, c, version[c]))
+
+        def stop(c):
+            # End the slice on CPU c at now; requeue its process unless done
+            i, start = running[c], slice_start[c]
+            if now > start or remaining[i] == 0:
+                run.record(i, start, now)
+                if cores is not None:
+                    cores.append(c)
+                busy[c] += now - start
+                remaining[i] -= now - start
+            if remaining[i] == 0:
+                wake = run.end_burst(i, now)
+                if wake is not None:
+                    heapq.heappush(events, (wake, cpus + 1, i))
+            else:
+                heapq.heappush(local[pinned[i]] if pinned[i] >= 0 else shared[c if per_cpu else 0], entry(i))
+
+        def preempt(c):
+            # Swap out CPU c's process if a process it may run is more
+            # urgent; a CPU in the middle of a context switch is left alone
+            queue, mine = shared[c if per_cpu else 0], local[c]
+            best = queue[0] if queue and (not mine or queue[0] < mine[0]) else mine[0] if mine else None
+            if best is None or now < slice_start[c] or not urgency(best, now) < running_key[c]:
+                return False
+            stop(c)
+            dispatch(c)
+            return True
+
+        def rebalance():
+            # Move queued, unpinned work from the longest queues to the
+            # shortest until every queue is within one entry of the others
+            nonlocal migrations
+            share, extra = divmod(sum(map(len, shared)), cpus)
+            order = sorted(range(cpus), key=lambda c: len(shared[c]), reverse=True)
+            surplus = []
+            for rank, c in enumerate(order):
+                while len(shared[c]) > share + (rank < extra):
+                    surplus.append(shared[c].pop())
+            migrations += len(surplus)
+            for rank, c in enumerate(order):
+                while len(shared[c]) < share + (rank < extra):
+                    heapq.heappush(shared[c], surplus.pop())
+                if running[c] < 0 and shared[c]:
+                    dispatch(c)
+
+        def admit(incoming):
+            # Queue every process arriving now before any CPU picks, so
+            # simultaneous arrivals compete fairly, then start idle CPUs and
+            # preempt
+            nonlocal next_home, balance_due
+            touched = []
+            for i in incoming:
+                c = pinned[i]
+                if c >= 0:
+                    heapq.heappush(local[c], entry(i))
+                    touched.append(c)
+                elif per_cpu:
+                    # An idle CPU if there is one, else the next in turn
+                    c = -1
+                    while idle:
+                        c = idle.pop()
+                        in_idle[c] = 0
+                        if running[c] < 0:
+                            break
+                        c = -1
+                    if c < 0:
+                        c = next_home
+                        next_home = (next_home + 1) % cpus
+                    heapq.heappush(shared[c], entry(i))
+                    touched.append(c)
+                else:
+                    heapq.heappush(shared[0], entry(i))
+
+            for c in touched:
+                if running[c] < 0:
+                    dispatch(c)
+                elif preemptive:
+                    preempt(c)
+            if not per_cpu:
+                while shared[0] and idle:
+                    c = idle.pop()
+                    in_idle[c] = 0
+                    if running[c] < 0:
+                        dispatch(c)
+                if preemptive:
+                    while shared[0] and preempt(running_key.index(max(running_key))):
+                        pass
+            if interval is not None and not balance_due:
+                heapq.heappush(events, (now + interval, cpus, 0))
+                balance_due = True
+
+        while next_arrival < n or events:
+            if next_arrival < n and (not events or arrival[arrivals[next_arrival]] <= events[0][0]):
+                now = arrival[arrivals[next_arrival]]
+                start = next_arrival
+                while next_arrival < n and arrival[arrivals[next_arrival]] <= now:
+                    next_arrival += 1
+                admit(arrivals[start:next_arrival])
+                continue
+
+            now, c, v = heapq.heappop(events)
+            if c == cpus + 1:
+                admit((v,))
+            elif c == cpus:
+                # Balance tick; ticks only continue while some CPU is busy
+                rebalance()
+                balance_due = max(running) >= 0
+                if balance_due:
+                    heapq.heappush(events, (now + interval, cpus, 0))
+            elif v == version[c]:
+                makespan = now
+                stop(c)
+                dispatch(c)
+
+        self.current_time = makespan
+        results = self.get_results()
+        capacity = cpus * results['total_time']
+        results.update({
+            'cpus': cpus,
+            'idle_time': capacity - results['busy_time'] - results['switch_overhead'],
+            'cpu_utilization': results['busy_time'] / capacity if capacity else 0,
+            'overhead_share': results['switch_overhead'] / capacity if capacity else 0,
+            'core_busy_time': busy,
+            'core_utilization': [time / results['total_time'] if capacity else 0 for time in busy],
+            'migrations': migrations,
+        })
+        if cores is not None:
+            results['cores'] = cores  # CPU of each schedule entry
+        return results
+
+    def get_results(self):
+        self._run.close()
+        self._sort_completed_by_pid()
+        results = {
+            'schedule': self.schedule,
+            'processes': self.completed_processes,
+        }
+        results.update(self._metrics())
+        if self.table.deadline is not None:
+            results.update(self._deadline_metrics())
+        return results
+
+    def _sort_completed_by_pid(self):
+        # Sort by PID for consistent display, once per run
+        import numpy as np
+        run = self._run
+        if run.pid_ordered:
+            return
+        pid = self.table.pid
+        if isinstance(pid, array) and run.completed:
+            completed = np.frombuffer(run.completed, dtype=np.int64)
+            order = completed[np.argsort(_numpy_column(pid)[completed], kind='stable')]
+            run.completed = array('q', order.tobytes())
+        else:
+            run.completed = array('q', sorted(run.completed, key=pid.__getitem__))
+        run.pid_ordered = True
+
+    def _metric_arrays(self):
+        # Per-process (waiting, turnaround, response) rows plus bursts, in
+        # results order, computed straight from the columns
+        import numpy as np
+        run = self._run
+        completed = np.frombuffer(run.completed, dtype=np.int64) if run.completed else np.zeros(0, dtype=np.int64)
+        arrival = _numpy_column(self.table.arrival)[completed]
+        burst = _numpy_column(self.table.burst)[completed]
+        turnaround = _numpy_column(run.finish)[completed] - arrival
+        waiting = turnaround - burst
+        if self.table.phases is not None:
+            waiting = waiting - self.table.io_times()[completed]
+        latencies = np.stack([waiting, turnaround, _numpy_column(run.response)[completed]])
+        return latencies, burst
+
+    def _deadline_metrics(self):
+        # Deadline misses, and the distributions of lateness (finish minus
+        # absolute deadline) and tardiness (lateness when positive), over
+        # the completed processes that have a deadline
+        import numpy as np
+        run = self._run
+        completed = np.frombuffer(run.completed, dtype=np.int64) if run.completed else np.zeros(0, dtype=np.int64)
+        deadline = _numpy_column(self.table.deadline)[completed]
+        lateness = _numpy_column(run.finish)[completed] - _numpy_column(self.table.arrival)[completed] - deadline
+        lateness = lateness[~np.isnan(deadline)] if deadline.dtype.kind == 'f' else lateness
+        tardiness = np.maximum(lateness, 0)
+        n = len(lateness)
+        misses = int(np.count_nonzero(lateness > 0))
+        metrics = {'deadline_processes': n, 'deadline_misses': misses, 'miss_ratio': misses / n if n else 0}
+        for name, values in (('lateness', lateness), ('tardiness', tardiness)):
+            percentiles = np.percentile(values, [50, 95, 99]) if n else [0, 0, 0]
+            metrics[f'avg_{name}'] = values.mean() if n else 0
+            metrics[f'std_{name}'] = values.std() if n else 0
+            metrics[f'p50_{name}'] = percentiles[0]
+            metrics[f'p95_{name}'] = percentiles[1]
+            metrics[f'p99_{name}'] = percentiles[2]
+            metrics[f'max_{name}'] = values.max() if n else 0
+        return metrics
+
+    def _metrics(self):
+        import numpy as np
+        latencies, burst = self._metric_arrays()
+        n = len(burst)
+        total_time = self.current_time
+        busy_time = burst.sum() if n else 0
+        overhead = self._run.overhead
+        metrics = {
+            'total_time': total_time,
+            'busy_time': busy_time,
+            'idle_time': total_time - busy_time - overhead,
+            'throughput': n / total_time if total_time else 0,
+            'cpu_utilization': busy_time / total_time if total_time else 0,
+            'context_switches': self._run.switches,
+            'switch_overhead': overhead,
+            'overhead_share': overhead / total_time if total_time else 0,
+        }
+
+        if n:
+            means = latencies.mean(axis=1)
+            stds = latencies.std(axis=1)
+            maxima = latencies.max(axis=1)
+            percentiles = np.percentile(latencies, [50, 95, 99], axis=1)
+            # Jain's index over each process's share of its turnaround spent
+            # running or on I/O, not waiting (1 = perfectly fair)
+            turnaround = latencies[1]
+            share = np.divide(turnaround - latencies[0], turnaround, out=np.ones(n), where=turnaround > 0)
+            fairness = share.sum() ** 2 / (n * (share ** 2).sum()) if share.any() else 1.0
+        else:
+            means = stds = maxima = [0, 0, 0]
+            percentiles = [[0, 0, 0]] * 3
+            fairness = 0
+
+        for row, name in enumerate(('waiting_time', 'turnaround_time', 'response_time')):
+            metrics[f'avg_{name}'] = means[row]
+            metrics[f'std_{name}'] = stds[row]
+            metrics[f'p50_{name}'] = percentiles[0][row]
+            metrics[f'p95_{name}'] = percentiles[1][row]
+            metrics[f'p99_{name}'] = percentiles[2][row]
+            metrics[f'max_{name}'] = maxima[row]
+        metrics['fairness_index'] = fairness
+        return metrics
+
+
+def _json_value(value):
+    if isinstance(value, (list, tuple)):
+        return [_json_value(item) for item in value]
+    return value.item() if hasattr(value, 'item') else value
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m scheduler_engine",
+                                     description="Run a scheduling algorithm over a process trace and print its "
+                                                 "metrics as JSON")
+    parser.add_argument('trace', help="process trace (csv, jsonl or bin)")
+    parser.add_argument('--algorithm', default='FCFS', help=f"one of {', '.join(POLICIES)}")
+    parser.add_argument('--preemptive', action='store_const', const=True, help="preemptive SJF or Priority")
+    parser.add_argument('--non-preemptive', dest='preemptive', action='store_const', const=False)
+    parser.add_argument('--quantum', type=float, default=2.0)
+    parser.add_argument('--cpus', type=int, default=1)
+    parser.add_argument('--context-switch', type=float, default=0.0, help="time lost per context switch")
+    parser.add_argument('-o', '--output', default='-', help="JSON file, or - for stdout")
+    parser.add_argument('--profile', help="write a Chrome trace (or speedscope profile, for *.speedscope.json) of "
+                                          "the run and add phase timings to the metrics")
+    args = parser.parse_args(argv)
+    if args.algorithm not in POLICIES:
+        parser.error(f"unknown algorithm {args.algorithm!r}; choose from {', '.join(POLICIES)}")
+    if args.cpus < 1:
+        parser.error("--cpus must be at least 1")
+    if args.cpus > 1 and args.algorithm not in SchedulerEngine.SMP_ALGORITHMS:
+        parser.error(f"{args.algorithm} runs on one CPU only; with --cpus choose from "
+                     f"{', '.join(SchedulerEngine.SMP_ALGORITHMS)}")
+
+    # trace_io works on the importable module, not on this one when it runs
+    # as __main__, so the engine comes from there too
+    import trace_io
+    engine = trace_io.load_trace(args.trace)
+    engine.sink = NullSink()
+    quantum, context_switch = (int(value) if value.is_integer() else value
+                               for value in (args.quantum, args.context_switch))
+    engine.context_switch = context_switch
+    if args.profile:
+        from profiling import Profiler
+        engine.profiler = Profiler(trace=True)
+    results = engine.run(args.algorithm, preemptive=args.preemptive, quantum=quantum, cpus=args.cpus)
+    metrics = {key: _json_value(value) for key, value in results.items()
+               if key not in ('schedule', 'processes', 'cores')}
+    if args.profile:
+        if args.profile.endswith('.speedscope.json'):
+            engine.profiler.speedscope(args.profile)
+        else:
+            engine.profiler.chrome_trace(args.profile)
+        metrics['profile'] = engine.profiler.report()
+    text = json.dumps(metrics, indent=2)
+    if args.output == '-':
+        print(text)
+    else:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+
+
+if __name__ == "__main__":
+    main()
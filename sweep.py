@@ -0,0 +1,272 @@
+import argparse
+import copy
+import csv
+import numbers
+import os
+import sys
+import tempfile
+from array import array
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import trace_io
+from scheduler_engine import NullSink, ProcessTable, ResultCache, SchedulerEngine
+from workload import ARRIVALS, BURSTS, WorkloadGenerator
+
+# Per-run result keys that are not scalar metrics
+_NON_METRIC_KEYS = ('schedule', 'processes')
+
+# Per-process columns compare() returns with every run, e.g. for CDFs
+LATENCY_COLUMNS = ('waiting_time', 'turnaround_time', 'response_time')
+
+_shared_table = None  # The workload of a compare() worker
+
+
+def default_configs(quanta=range(1, 65)):
+    # (label, algorithm, preemptive, quantum) for every policy in the engine
+    configs = [
+        ("FCFS", "FCFS", None, None),
+        ("SJF", "SJF", False, None),
+        ("SRTF", "SRTF", True, None),
+        ("Priority", "Priority", True, None),
+        ("Priority (NP)", "Priority", False, None),
+        ("MLFQ", "MLFQ", None, 2),
+        ("CFS", "CFS", None, None),
+        ("EDF", "EDF", None, None),
+        ("RM", "RM", None, None),
+    ]
+    configs.extend((f"RR(q={q})", "RR", None, q) for q in quanta)
+    return configs
+
+
+def _as_table(workload):
+    if isinstance(workload, SchedulerEngine):
+        return workload.table
+    if isinstance(workload, ProcessTable):
+        return workload
+    table = ProcessTable()
+    for process in workload:
+        table.append(*process)
+    return table
+
+
+def _metric_row(results):
+    # Scalar metrics only; per-CPU lists and arrays do not fit a CSV cell
+    return {key: value.item() if hasattr(value, 'item') else value
+            for key, value in results.items()
+            if key not in _NON_METRIC_KEYS and not isinstance(value, (list, tuple, array))}
+
+
+def _run_chunk(workload_id, table, configs, context_switch=0, cache=None):
+    # Worker entry point: one workload, several configurations. The table is
+    # pickled as its column arrays, once per chunk.
+    engine = SchedulerEngine()
+    engine.table = table
+    engine.sink = NullSink()
+    engine.context_switch = context_switch
+    if cache:
+        engine.cache = ResultCache(path=cache)
+    rows = []
+    for config_id, (label, algorithm, preemptive, quantum) in configs:
+        results = engine.run(algorithm, preemptive=preemptive, quantum=quantum)
+        row = {
+            'workload': workload_id,
+            'config': config_id,
+            'label': label,
+            'algorithm': algorithm,
+            'preemptive': preemptive,
+            'quantum': quantum,
+            'processes': len(table),
+        }
+        row.update(_metric_row(results))
+        rows.append(row)
+    return rows
+
+
+def sweep(workloads, configs=None, jobs=None, context_switch=0, cache=None):
+    # Run every configuration over every workload across a process pool and
+    # return one row per (workload, configuration), in input order.
+    # Workloads may be ProcessTables, SchedulerEngines or iterables of
+    # (pid, arrival, burst, priority). context_switch is the time charged
+    # for every switch between processes. cache is a directory where
+    # results are stored, so repeated (workload, configuration) pairs, in
+    # this sweep or a later one, are not simulated again.
+    configs = list(enumerate(default_configs() if configs is None else configs))
+    tables = [_as_table(workload) for workload in workloads]
+    jobs = jobs or os.cpu_count() or 1
+
+    # Split configurations when there are too few workloads to keep every
+    # worker busy
+    pieces = max(1, min(len(configs), -(-4 * jobs // max(1, len(tables)))))
+    size = -(-len(configs) // pieces) if configs else 1
+    tasks = [(workload_id, table, configs[i:i + size], context_switch, cache)
+             for workload_id, table in enumerate(tables)
+             for i in range(0, len(configs), size)]
+
+    rows = []
+    if jobs == 1:
+        for task in tasks:
+            rows.extend(_run_chunk(*task))
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = [executor.submit(_run_chunk, *task) for task in tasks]
+            for future in as_completed(futures):
+                rows.extend(future.result())
+    rows.sort(key=lambda row: (row['workload'], row['config']))
+    return rows
+
+
+def _share_table(table):
+    # compare() worker initializer for workloads that cannot be mapped
+    global _shared_table
+    _shared_table = table
+
+
+def _map_table(path):
+    # compare() worker initializer: every worker maps the same trace file
+    global _shared_table
+    _shared_table = trace_io.read_trace(path)
+
+
+def _snapshot(table, directory):
+    # A read-only copy of the workload for compare(), taken before it
+    # returns so the caller may go on editing its table. The columns go to a
+    # binary trace that every worker memory-maps, so the OS holds a single
+    # copy however many workers there are. Non-numeric pids are replaced by
+    # their rank, which orders ties the same way; the returned table keeps
+    # the real ones for labels. Returns (table, trace path), with no path
+    # when the table cannot be written as a binary trace (I/O bursts, or
+    # pids that do not sort), in which case every worker gets its own copy.
+    if table.phases is not None and any(table.phases):
+        return copy.deepcopy(table), None
+    pids = table.pid
+    if not isinstance(pids, (array, memoryview)) and not all(isinstance(pid, numbers.Real) for pid in pids):
+        try:
+            ranks = {pid: rank for rank, pid in enumerate(sorted(set(pids)))}
+        except TypeError:
+            return copy.deepcopy(table), None
+        pids = list(pids)
+        ranked = ProcessTable.from_columns([ranks[pid] for pid in pids], table.arrival, table.burst, table.priority)
+        ranked.deadline, ranked.period = table.deadline, table.period
+        table = ranked
+    path = os.path.join(directory, 'workload.bin')
+    trace_io.write_trace(path, table)
+    mapped = trace_io.read_trace(path)
+    if pids is not table.pid:
+        snapshot = ProcessTable.from_columns(pids, mapped.arrival, mapped.burst, mapped.priority)
+        snapshot.deadline, snapshot.period = mapped.deadline, mapped.period
+        mapped = snapshot
+    return mapped, path
+
+
+def _compare_run(config_id, config, context_switch, table=None):
+    label, algorithm, preemptive, quantum = config
+    engine = SchedulerEngine()
+    engine.table = _shared_table if table is None else table
+    engine.context_switch = context_switch
+    results = engine.run(algorithm, preemptive=preemptive, quantum=quantum)
+    row = {'config': config_id, 'label': label, 'algorithm': algorithm, 'preemptive': preemptive, 'quantum': quantum}
+    row.update(_metric_row(results))
+    columns = results['processes'].columns()
+    row['latencies'] = {name: columns[name] for name in LATENCY_COLUMNS}
+    row['schedule'] = results['schedule']  # Pickled without the table
+    return row
+
+
+def compare(workload, configs=None, jobs=None, context_switch=0):
+    # Run every configuration over one workload across a process pool and
+    # return an iterator yielding a row per run as soon as it finishes, so
+    # results can be shown while the rest still run. Rows hold the metrics,
+    # the schedule and the LATENCY_COLUMNS of the completed processes (in
+    # pid order); 'config' is the configuration's position in configs. The
+    # workload is snapshotted before compare() returns and shared by all
+    # runs (see _snapshot). Closing the iterator early cancels the runs
+    # that have not started.
+    configs = default_configs() if configs is None else list(configs)
+    directory = tempfile.TemporaryDirectory(prefix='compare-')
+    table, path = _snapshot(_as_table(workload), directory.name)
+    return _compare_runs(table, path, directory, configs, jobs, context_switch)
+
+
+def _compare_runs(table, path, directory, configs, jobs, context_switch):
+    jobs = min(jobs or os.cpu_count() or 1, max(1, len(configs)))
+    try:
+        if jobs == 1:
+            for config_id, config in enumerate(configs):
+                yield _compare_run(config_id, config, context_switch, table)
+            return
+        if path is None:
+            executor = ProcessPoolExecutor(max_workers=jobs, initializer=_share_table, initargs=(table,))
+        else:
+            executor = ProcessPoolExecutor(max_workers=jobs, initializer=_map_table, initargs=(path,))
+        futures = [executor.submit(_compare_run, config_id, config, context_switch)
+                   for config_id, config in enumerate(configs)]
+        try:
+            for future in as_completed(futures):
+                row = future.result()
+                row['schedule'].table = table
+                yield row
+        finally:
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+    finally:
+        try:
+            directory.cleanup()  # Mapped files stay readable on POSIX
+        except OSError:
+            pass
+
+
+def write_csv(rows, path):
+    if not rows:
+        return
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def _parse_quanta(text):
+    quanta = []
+    for part in text.split(','):
+        low, _, high = part.partition('-')
+        quanta.extend(range(int(low), int(high or low) + 1))
+    return quanta
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sweep scheduling algorithms over generated workloads")
+    parser.add_argument('--workloads', type=int, default=100, help="number of workloads")
+    parser.add_argument('--processes', type=int, default=100, help="processes per workload")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--arrival', choices=ARRIVALS, default='poisson')
+    parser.add_argument('--rate', type=float, default=0.1, help="arrivals per time unit")
+    parser.add_argument('--burst', choices=BURSTS, default='exponential')
+    parser.add_argument('--burst-mean', type=float, default=8.0)
+    parser.add_argument('--deadline-slack', type=float, default=None,
+                        help="give every process a deadline of this many times its burst")
+    parser.add_argument('--quanta', default='1-64', help="RR quanta, e.g. 1-8,16,32")
+    parser.add_argument('--context-switch', type=float, default=0.0, help="time lost per context switch")
+    parser.add_argument('--jobs', type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument('--cache', help="directory to keep results in and reuse them from")
+    parser.add_argument('-o', '--output', default='-', help="CSV file, or - for stdout")
+    args = parser.parse_args(argv)
+    if args.deadline_slack is not None and args.deadline_slack < 1:
+        parser.error("--deadline-slack must be at least 1")
+
+    workloads = [WorkloadGenerator(seed=(args.seed, i), arrival=args.arrival, rate=args.rate, burst=args.burst,
+                                   burst_mean=args.burst_mean, deadline_slack=args.deadline_slack).table(args.processes)
+                 for i in range(args.workloads)]
+    context_switch = int(args.context_switch) if args.context_switch.is_integer() else args.context_switch
+    rows = sweep(workloads, default_configs(_parse_quanta(args.quanta)), jobs=args.jobs, context_switch=context_switch,
+                 cache=args.cache)
+
+    if args.output == '-':
+        writer = csv.DictWriter(sys.stdout, fieldnames=list(rows[0]) if rows else [])
+        writer.writeheader()
+        writer.writerows(rows)
+    else:
+        write_csv(rows, args.output)
+
+
+if __name__ == "__main__":
+    main()
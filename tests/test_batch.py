@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+import batch
+from scheduler_engine import NullSink, SchedulerEngine
+
+
+def engine_columns(arrival, burst, priority, context_switch, algorithm="FCFS"):
+    engine = SchedulerEngine()
+    engine.sink = NullSink()
+    engine.context_switch = context_switch
+    engine.add_processes(np.arange(len(arrival)), arrival, burst, priority)
+    return engine.run(algorithm)['processes'].columns()
+
+
+@pytest.mark.parametrize('context_switch', [0, 1])
+def test_batch_fcfs_matches_engine(context_switch):
+    arrivals, bursts, priorities = batch.generate(20, 60, seed=1)
+    # Unsorted rows with tied arrivals take the permuting path
+    rng = np.random.default_rng(2)
+    arrivals = np.vstack([arrivals, rng.integers(0, 50, size=(5, 60))])
+    bursts = np.vstack([bursts, rng.integers(1, 10, size=(5, 60))])
+    priorities = np.vstack([priorities, np.zeros((5, 60), dtype=np.int64)])
+
+    results = batch.fcfs(arrivals, bursts, context_switch=context_switch)
+    for row, (arrival, burst, priority) in enumerate(zip(arrivals, bursts, priorities)):
+        columns = engine_columns(arrival, burst, priority, context_switch)
+        for name in batch.RESULT_COLUMNS:
+            np.testing.assert_array_equal(results[name][row], columns[name], err_msg=f"{name}, workload {row}")
+
+
+@pytest.mark.parametrize('context_switch', [0, 2])
+def test_batch_metrics_match_engine(context_switch):
+    arrivals, bursts, priorities = batch.generate(5, 40, seed=3)
+    summary = batch.metrics(batch.fcfs(arrivals, bursts, context_switch), bursts, context_switch)
+    for row, (arrival, burst, priority) in enumerate(zip(arrivals, bursts, priorities)):
+        engine = SchedulerEngine()
+        engine.context_switch = context_switch
+        engine.add_processes(np.arange(len(arrival)), arrival, burst, priority)
+        results = engine.run("FCFS")
+        for name, values in summary.items():
+            assert values[row] == pytest.approx(results[name]), (name, row)
+
+
+def test_other_algorithms_run_per_workload():
+    arrivals, bursts, priorities = batch.generate(3, 30, seed=4)
+    results = batch.simulate("SRTF", arrivals, bursts, priorities)
+    for row, (arrival, burst, priority) in enumerate(zip(arrivals, bursts, priorities)):
+        columns = engine_columns(arrival, burst, priority, 0, "SRTF")
+        for name in batch.RESULT_COLUMNS:
+            np.testing.assert_array_equal(results[name][row], columns[name])
+
+
+def test_shapes_are_checked():
+    with pytest.raises(ValueError):
+        batch.fcfs(np.zeros((2, 3)), np.ones((2, 4)))
+    with pytest.raises(ValueError):
+        batch.fcfs(np.zeros((2, 3, 1)), np.ones((2, 3, 1)))
@@ -0,0 +1,119 @@
+import os
+
+import numpy as np
+
+from scheduler_engine import ResultCache, SchedulerEngine
+from workload import WorkloadGenerator
+
+
+def cached_engine(cache, count=200, seed=1):
+    engine = SchedulerEngine()
+    engine.cache = cache
+    engine.table = WorkloadGenerator(seed=seed).table(count)
+    return engine
+
+
+def test_repeated_runs_are_hits():
+    cache = ResultCache()
+    engine = cached_engine(cache)
+    first = engine.run("SRTF")
+    schedule, waiting = list(first['schedule']), first['avg_waiting_time']
+    engine.run("RR")
+    again = engine.run("SRTF")
+    assert cache.hits == 1 and cache.misses == 2
+    assert list(again['schedule']) == schedule and again['avg_waiting_time'] == waiting
+
+
+def test_changing_the_workload_misses():
+    cache = ResultCache()
+    engine = cached_engine(cache)
+    engine.run("FCFS")
+    engine.add_process(10_000, 5, 3)
+    assert len(engine.run("FCFS")['processes']) == 201
+    engine.table.assign('burst', 0, 50)
+    engine.run("FCFS")
+    assert cache.hits == 0
+
+    engine.clear_all_processes()
+    assert engine.run("FCFS")['schedule'] == []
+    assert cache.hits == 0
+
+
+def test_the_quantum_only_keys_algorithms_that_use_it():
+    cache = ResultCache()
+    engine = cached_engine(cache)
+    engine.run("FCFS", quantum=2)
+    engine.run("FCFS", quantum=5)
+    assert cache.hits == 1
+    engine.run("RR", quantum=2)
+    engine.run("RR", quantum=5)
+    assert cache.hits == 1
+    engine.context_switch = 1
+    engine.run("FCFS")
+    assert cache.hits == 1
+
+
+def test_array_options_are_keyed_by_content():
+    # Both affinities have the same abbreviated repr
+    cache = ResultCache()
+    engine = cached_engine(cache, count=5000)
+    affinity = np.full(5000, -1)
+    engine.run("FCFS", cpus=2, affinity=affinity)
+    pinned = affinity.copy()
+    pinned[2500] = 1
+    assert repr(pinned) == repr(affinity)
+    engine.run("FCFS", cpus=2, affinity=pinned)
+    engine.run("FCFS", cpus=2, affinity=affinity.copy())
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_disk_store_is_shared_between_engines(tmp_path):
+    first = cached_engine(ResultCache(path=str(tmp_path)))
+    results = first.run("MLFQ")
+    schedule, waiting = list(results['schedule']), results['avg_waiting_time']
+
+    cache = ResultCache(path=str(tmp_path))
+    second = cached_engine(cache)
+    restored = second.run("MLFQ")
+    assert cache.hits == 1
+    assert list(restored['schedule']) == schedule and restored['avg_waiting_time'] == waiting
+    assert [p.pid for p in restored['processes']] == [p.pid for p in results['processes']]
+
+
+def test_unreadable_files_are_misses(tmp_path):
+    engine = cached_engine(ResultCache(path=str(tmp_path)))
+    engine.run("FCFS")
+    for name in os.listdir(tmp_path):
+        with open(tmp_path / name, 'wb') as f:
+            f.write(b"not a pickle")
+    cache = ResultCache(path=str(tmp_path))
+    cached_engine(cache).run("FCFS")
+    assert (cache.hits, cache.misses) == (0, 1)
+
+
+def test_disk_store_stays_under_its_limit(tmp_path):
+    cache = ResultCache(size=1, path=str(tmp_path), disk_bytes=None)
+    engine = cached_engine(cache)
+    engine.run("FCFS")
+    run_bytes = sum(os.path.getsize(tmp_path / name) for name in os.listdir(tmp_path))
+
+    cache = ResultCache(size=1, path=str(tmp_path), disk_bytes=3 * run_bytes)
+    engine = cached_engine(cache)
+    for quantum in range(1, 11):
+        engine.run("RR", quantum=quantum)
+        files = os.listdir(tmp_path)
+        assert sum(os.path.getsize(tmp_path / name) for name in files) <= 4 * run_bytes
+    # The most recent run is always kept
+    engine.cache = ResultCache(size=1, path=str(tmp_path))
+    engine.run("RR", quantum=10)
+    assert engine.cache.hits == 1
+
+
+def test_memory_holds_the_most_recent_runs():
+    cache = ResultCache(size=2)
+    engine = cached_engine(cache)
+    for algorithm in ("FCFS", "SJF", "RR", "SJF"):
+        engine.run(algorithm)
+    assert len(cache.entries) == 2
+    engine.run("FCFS")
+    assert cache.hits == 1
@@ -0,0 +1,109 @@
+import random
+
+import numpy as np
+import pytest
+
+import trace_io
+from scheduler_engine import ProcessTable, SchedulerEngine
+from workload import WorkloadGenerator
+
+
+def mixed_engine(seed, fractional=False):
+    # Some processes with a deadline, some periodic, some with neither
+    rng = random.Random(seed)
+    engine = SchedulerEngine()
+    for pid in range(60):
+        arrival, burst = rng.randint(0, 100), rng.randint(1, 9)
+        if fractional:
+            arrival, burst = arrival / 4, burst / 2
+        kind = rng.random()
+        deadline = rng.randint(2, 30) if kind < 0.6 else None
+        period = rng.randint(5, 40) if kind > 0.4 else None
+        engine.add_process(pid, arrival, burst, 0, deadline, period)
+    return engine
+
+
+@pytest.mark.parametrize('algorithm', ["EDF", "RM", "FCFS", "SRTF"])
+@pytest.mark.parametrize('fractional', [False, True])
+def test_deadline_metrics_match_the_processes(algorithm, fractional):
+    results = mixed_engine(1, fractional).run(algorithm)
+    lateness = [p.lateness for p in results['processes'] if p.deadline is not None]
+    tardiness = [p.tardiness for p in results['processes'] if p.deadline is not None]
+    misses = sum(value > 0 for value in lateness)
+    assert results['deadline_processes'] == len(lateness)
+    assert results['deadline_misses'] == misses
+    assert results['miss_ratio'] == pytest.approx(misses / len(lateness))
+    for name, values in (('lateness', lateness), ('tardiness', tardiness)):
+        assert results[f'avg_{name}'] == pytest.approx(np.mean(values))
+        assert results[f'p50_{name}'] == pytest.approx(np.median(values))
+        assert results[f'max_{name}'] == max(values)
+    assert all(value == max(late, 0) for value, late in zip(tardiness, lateness))
+
+
+def test_runs_without_deadlines_have_no_deadline_metrics():
+    engine = SchedulerEngine()
+    engine.add_process(1, 0, 3)
+    assert 'deadline_misses' not in engine.run("EDF")
+
+
+def periodic_engine():
+    # Utilization 2/5 + 4/7 < 1, above the rate-monotonic bound for two tasks
+    engine = SchedulerEngine()
+    engine.add_periodic_task('A', 2, 5, until=35)
+    engine.add_periodic_task('B', 4, 7, until=35)
+    return engine
+
+
+def test_edf_meets_feasible_deadlines_where_rm_misses():
+    edf = periodic_engine().edf()
+    assert edf['deadline_processes'] == 12 and edf['deadline_misses'] == 0
+    rm = periodic_engine().rate_monotonic()
+    assert rm['deadline_misses'] > 0
+    # B's first job is preempted by A's second release, the shorter period
+    assert list(rm['schedule'])[:4] == [('PA', 0, 2), ('PB', 2, 5), ('PA', 5, 7), ('PB', 7, 8)]
+
+
+def test_processes_without_a_deadline_or_period_run_last():
+    for algorithm, column in (("EDF", 4), ("RM", 5)):
+        engine = SchedulerEngine()
+        engine.add_process(1, 0, 2)
+        row = [2, 0, 2, 0, None, None]
+        row[column] = 50
+        engine.add_process(*row)
+        assert list(engine.run(algorithm)['schedule']) == [('P2', 0, 2), ('P1', 2, 4)]
+
+
+def test_periodic_tasks_release_one_job_per_period():
+    engine = SchedulerEngine()
+    engine.add_periodic_task(1, 2, 5, deadline=3, arrival_time=1, jobs=4)
+    engine.add_periodic_task(2, 1, 2.5, until=10)
+    table = engine.table
+    assert list(table.arrival) == [1, 6, 11, 16, 0, 2.5, 5, 7.5]
+    assert list(table.deadline) == [3, 3, 3, 3, 2.5, 2.5, 2.5, 2.5]
+    assert list(table.period) == [5] * 4 + [2.5] * 4
+    for options in ({}, {'jobs': 2, 'until': 10}, {'jobs': 2, 'period': 0}, {'jobs': 2, 'burst_time': [1, 2, 1]}):
+        arguments = dict({'pid': 3, 'burst_time': 1, 'period': 4}, **options)
+        with pytest.raises(ValueError):
+            engine.add_periodic_task(**arguments)
+
+
+def test_add_deadlines_keeps_existing_ones():
+    table = ProcessTable()
+    table.append(1, 0, 3, deadline=4)
+    table.append(2, 0, 3)
+    table.append(3, 0, 5)
+    trace_io.add_deadlines(table, 1.5)
+    assert list(table.deadline) == [4, 5, 8]
+    with pytest.raises(ValueError):
+        trace_io.add_deadlines(table, 0.5)
+    with pytest.raises(ValueError):
+        table.fill('priority', [0, 0, 0])
+    with pytest.raises(ValueError):
+        table.fill('period', [1])
+
+
+def test_deadline_slack_matches_add_deadlines():
+    generated = WorkloadGenerator(seed=2, deadline_slack=2.5).table(100)
+    table = WorkloadGenerator(seed=2).table(100)
+    trace_io.add_deadlines(table, 2.5)
+    assert list(table.deadline) == list(generated.deadline)
@@ -0,0 +1,69 @@
+import random
+
+import pytest
+
+from baseline_engine import SchedulerEngine as BaselineEngine
+from scheduler_engine import SchedulerEngine
+
+# (method, arguments) of every algorithm the baseline engine had
+CALLS = [
+    ('fcfs', {}),
+    ('sjf', {'preemptive': False}),
+    ('sjf', {'preemptive': True}),
+    ('priority_scheduling', {'preemptive': False}),
+    ('priority_scheduling', {'preemptive': True}),
+    ('round_robin', {}),
+]
+
+
+def random_processes(rng, count, fractional=False):
+    # Unique pids in shuffled insertion order, with ties in arrival, burst
+    # and priority; the baseline finds processes by pid, so pids stay unique
+    processes = []
+    for pid in range(count):
+        arrival, burst = rng.randint(0, 40), rng.randint(1, 12)
+        if fractional:
+            arrival, burst = arrival / 4, burst / 2 + 0.5
+        processes.append((pid, arrival, burst, rng.randint(0, 5)))
+    rng.shuffle(processes)
+    return processes
+
+
+def build(engine_class, processes, quantum):
+    engine = engine_class()
+    engine.quantum = quantum
+    for process in processes:
+        engine.add_process(*process)
+    return engine
+
+
+def coalesce(schedule):
+    # The engine merges a slice into the previous one of the same process;
+    # the baseline emits them separately
+    merged = []
+    for label, start, end in schedule:
+        if merged and merged[-1][0] == label and merged[-1][2] == start:
+            merged[-1] = (label, merged[-1][1], end)
+        else:
+            merged.append((label, start, end))
+    return merged
+
+
+def outcome(engine, results):
+    processes = [(p.pid, p.start_time, p.finish_time, p.waiting_time, p.turnaround_time, p.response_time)
+                 for p in results['processes']]
+    averages = [float(results[name]) for name in ('avg_waiting_time', 'avg_turnaround_time', 'avg_response_time')]
+    return coalesce(results['schedule']), processes, averages, engine.current_time
+
+
+@pytest.mark.parametrize('method, options', CALLS)
+@pytest.mark.parametrize('seed', range(4))
+def test_policies_match_baseline(method, options, seed):
+    rng = random.Random(seed)
+    for _ in range(50):
+        processes = random_processes(rng, rng.randint(0, 25), fractional=rng.random() < 0.2)
+        quantum = rng.choice([1, 2, 3, 5])
+        baseline = build(BaselineEngine, processes, quantum)
+        engine = build(SchedulerEngine, processes, quantum)
+        expected = outcome(baseline, getattr(baseline, method)(**options))
+        assert outcome(engine, getattr(engine, method)(**options)) == expected, processes
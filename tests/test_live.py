@@ -0,0 +1,115 @@
+import asyncio
+import random
+
+import pytest
+
+from live import LiveScheduler, replay
+from scheduler_engine import CallbackSink, ProcessTable, SchedulerEngine
+from workload import WorkloadGenerator
+
+KEYED = ["FCFS", "SJF", "SRTF", "Priority", "EDF"]
+
+
+def live_run(table, algorithm, context_switch=0, **options):
+    # Replay table through a LiveScheduler; returns (slices, finished
+    # processes by pid, final metrics, scheduler)
+    slices, finished = [], {}
+    live = LiveScheduler(algorithm, context_switch=context_switch,
+                         sink=CallbackSink(lambda label, start, end: slices.append((label, start, end))),
+                         on_complete=lambda record: finished.__setitem__(record['pid'], record), **options)
+
+    async def main():
+        metrics, _ = await asyncio.gather(live.run(), replay(live, table))
+        return metrics
+
+    return slices, finished, asyncio.run(main()), live
+
+
+def batch_run(table, algorithm, context_switch=0):
+    engine = SchedulerEngine()
+    engine.table = table
+    engine.context_switch = context_switch
+    return engine.run(algorithm)
+
+
+def coalesce(slices):
+    merged = []
+    for label, start, end in slices:
+        if merged and merged[-1][0] == label and merged[-1][2] == start:
+            merged[-1] = (label, merged[-1][1], end)
+        else:
+            merged.append((label, start, end))
+    return merged
+
+
+def random_table(seed, io=False):
+    # Rows in arrival order, with ties, some I/O and some deadlines
+    rng = random.Random(seed)
+    table = ProcessTable()
+    for pid, arrival in enumerate(sorted(rng.randint(0, 150) for _ in range(40))):
+        burst = rng.randint(1, 9)
+        if io and rng.random() < 0.4:
+            burst = [burst, rng.randint(1, 6), rng.randint(1, 6)]
+        table.append(pid, arrival, burst, rng.randint(0, 4), rng.choice([None, rng.randint(5, 30)]))
+    return table
+
+
+@pytest.mark.parametrize('algorithm', KEYED + ["RR", "MLFQ", "CFS"])
+@pytest.mark.parametrize('context_switch', [0, 1])
+def test_replay_gives_the_batch_schedule(algorithm, context_switch):
+    # Rows in arrival order, so both admit simultaneous jobs alike
+    for seed in range(5):
+        table = random_table(seed)
+        slices, finished, metrics, live = live_run(table, algorithm, context_switch)
+        results = batch_run(table, algorithm, context_switch)
+        assert coalesce(slices) == [entry for entry in results['schedule'] if entry[0] != "CS"]
+        assert {pid: record['finish_time'] for pid, record in finished.items()} == \
+            {process.pid: process.finish_time for process in results['processes']}
+        assert metrics['avg_waiting_time'] == pytest.approx(results['avg_waiting_time'])
+        assert metrics['context_switches'] == results['context_switches']
+        assert metrics['deadline_misses'] == results['deadline_misses']
+        assert len(live.free) == len(live.table)  # Every row was evicted and freed
+
+
+@pytest.mark.parametrize('algorithm', KEYED)
+def test_replay_with_io_gives_the_batch_schedule(algorithm):
+    for seed in range(5):
+        table = random_table(seed, io=True)
+        slices, finished, metrics, _ = live_run(table, algorithm, 1)
+        results = batch_run(table, algorithm, 1)
+        assert coalesce(slices) == [entry for entry in results['schedule'] if entry[0] != "CS"]
+        assert metrics['avg_waiting_time'] == pytest.approx(results['avg_waiting_time'])
+
+
+def test_cfs_replay_keeps_whole_slices():
+    table = WorkloadGenerator(seed=3, rate=0.12).table(1000)
+    slices, _, metrics, _ = live_run(table, "CFS")
+    results = batch_run(table, "CFS")
+    assert all(isinstance(start, int) and isinstance(end, int) for _, start, end in slices)
+    assert metrics['avg_waiting_time'] == pytest.approx(results['avg_waiting_time'])
+
+
+def test_jobs_without_arrival_times_arrive_when_received():
+    finished = []
+    live = LiveScheduler("FCFS", on_complete=finished.append)
+
+    async def feed():
+        await live.submit(1, burst_time=4)
+        await live.submit(2, arrival_time=10, burst_time=2)
+        await live.submit(3, arrival_time=2, burst_time=1)  # Late: the clock is at 4 by then
+        await live.close()
+
+    async def main():
+        return (await asyncio.gather(live.run(), feed()))[0]
+
+    metrics = asyncio.run(main())
+    assert [(r['pid'], r['arrival_time'], r['finish_time']) for r in finished] == [(1, 0, 4), (3, 4, 5), (2, 10, 12)]
+    assert metrics['completed'] == 3
+
+
+def test_jobs_need_a_burst():
+    live = LiveScheduler("FCFS")
+    with pytest.raises(ValueError):
+        asyncio.run(live.submit(1, arrival_time=0))
+    with pytest.raises(ValueError):
+        LiveScheduler("Nope")
@@ -0,0 +1,87 @@
+import random
+
+import pytest
+
+from scheduler_engine import CFSPolicy, MLFQPolicy, NICE_0_WEIGHT, SchedulerEngine
+
+
+def engine_with(processes, quantum=2):
+    engine = SchedulerEngine()
+    engine.quantum = quantum
+    for process in processes:
+        engine.add_process(*process)
+    return engine
+
+
+def cpu_by(schedule, index, time):
+    # CPU time process `index` has had by `time`
+    return sum(min(end, time) - start for start, end in schedule.slices(index) if start < time)
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_single_level_mlfq_is_round_robin(seed):
+    rng = random.Random(seed)
+    for _ in range(50):
+        processes = [(pid, rng.randint(0, 40), rng.randint(1, 12), 0) for pid in range(rng.randint(1, 20))]
+        quantum = rng.choice([1, 2, 3])
+        expected = list(engine_with(processes, quantum).round_robin()['schedule'])
+        assert list(engine_with(processes, quantum).mlfq(levels=1)['schedule']) == expected
+
+
+def test_mlfq_arrival_cuts_a_lower_level_slice():
+    # P1 drops to level 1 (quantum 4) at 2; P2 arrives at 5 on level 0 and
+    # runs at once, then P1 finishes its level 1 quantum and moves to level 2
+    engine = engine_with([(1, 0, 20), (2, 5, 1)])
+    results = engine.mlfq()
+    assert list(results['schedule']) == [('P1', 0, 5), ('P2', 5, 6), ('P1', 6, 21)]
+    assert results['processes'][1].response_time == 0
+
+
+def test_mlfq_boost_stops_starvation():
+    # A long job at the bottom level, under a stream of short jobs that
+    # always find the top level busy
+    processes = [(0, 0, 30)] + [(k, 2 * k, 2) for k in range(1, 30)]
+    starved = engine_with(processes).mlfq()['schedule'].slices(0)
+    assert starved[1][0] == 60  # Only once the stream ends
+    boosted = engine_with(processes).mlfq(boost_interval=10)['schedule'].slices(0)
+    assert [start for start, _ in boosted[1:4]] == [12, 24, 36]
+
+
+def test_mlfq_checks_its_quanta():
+    with pytest.raises(ValueError):
+        MLFQPolicy(levels=2, quanta=[2])
+    with pytest.raises(ValueError):
+        MLFQPolicy(quanta=[2, 0, 4])
+
+
+def test_cfs_shares_the_cpu_equally():
+    engine = engine_with([(pid, 0, 200) for pid in range(4)])
+    schedule = engine.cfs(target_latency=24, min_granularity=3)['schedule']
+    first_finish = min(process.finish_time for process in engine.completed_processes)
+    for _, start, end in schedule:
+        if end >= first_finish:
+            break
+        assert end - start == 6  # target_latency / 4
+        received = [cpu_by(schedule, index, end) for index in range(4)]
+        assert max(received) - min(received) <= 6
+
+
+def test_cfs_weights_follow_nice_values():
+    engine = engine_with([(1, 0, 2000, 0), (2, 0, 2000, 5)])
+    schedule = engine.cfs()['schedule']
+    ratio = cpu_by(schedule, 0, 1000) / cpu_by(schedule, 1, 1000)
+    assert ratio == pytest.approx(NICE_0_WEIGHT / (NICE_0_WEIGHT / 1.25 ** 5), rel=0.1)
+
+
+def test_cfs_slices_stay_integral_for_integer_workloads():
+    rng = random.Random(4)
+    processes = [(pid, rng.randint(0, 50), rng.randint(1, 30), rng.randint(-5, 5)) for pid in range(40)]
+    schedule = engine_with(processes).cfs()['schedule']
+    assert all(isinstance(start, int) and isinstance(end, int) for _, start, end in schedule)
+
+
+def test_cfs_checks_its_parameters():
+    with pytest.raises(ValueError):
+        CFSPolicy(target_latency=0)
+    with pytest.raises(ValueError):
+        CFSPolicy(min_granularity=-1)
@@ -0,0 +1,90 @@
+import random
+
+import pytest
+
+from scheduler_engine import SWITCH_LABEL, SchedulerEngine
+
+ALGORITHMS = ["FCFS", "SJF", "SRTF", "RR", "Priority", "MLFQ", "CFS"]
+
+
+def engine_for(seed, context_switch):
+    # Processes with up to two I/O waits between their CPU bursts
+    rng = random.Random(seed)
+    engine = SchedulerEngine()
+    engine.context_switch = context_switch
+    for pid in range(40):
+        bursts = [rng.randint(1, 8)]
+        for _ in range(rng.randint(0, 2)):
+            bursts += [rng.randint(1, 15), rng.randint(1, 8)]
+        engine.add_process(pid, rng.randint(0, 60), bursts, rng.randint(0, 4))
+    return engine
+
+
+@pytest.mark.parametrize('algorithm', ALGORITHMS)
+@pytest.mark.parametrize('context_switch', [0, 1, 3])
+def test_time_is_accounted_for(algorithm, context_switch):
+    engine = engine_for(1, context_switch)
+    results = engine.run(algorithm)
+    schedule = list(results['schedule'])
+
+    switches = [end - start for label, start, end in schedule if label == SWITCH_LABEL]
+    assert all(length == context_switch for length in switches)
+    assert len(switches) == (results['context_switches'] if context_switch else 0)
+    assert results['switch_overhead'] == results['context_switches'] * context_switch
+    assert results['busy_time'] == sum(end - start for label, start, end in schedule if label != SWITCH_LABEL)
+    assert results['busy_time'] + results['switch_overhead'] + results['idle_time'] == results['total_time']
+    assert all(end <= start for (_, _, end), (_, start, _) in zip(schedule, schedule[1:]))
+
+
+@pytest.mark.parametrize('algorithm', ALGORITHMS)
+def test_processes_wait_out_their_io(algorithm):
+    engine = engine_for(2, 1)
+    results = engine.run(algorithm)
+    schedule = results['schedule']
+    for index in range(len(engine.table)):
+        process = engine.processes[index]
+        bursts = process.bursts
+        ran = iter(schedule.slices(index))
+        # Walk the slices burst by burst: each CPU burst is fully served
+        # before the I/O that follows it, which must pass before the next
+        ready = process.arrival_time
+        for k in range(0, len(bursts), 2):
+            left = bursts[k]
+            while left:
+                start, end = next(ran)
+                assert start >= ready
+                left -= end - start
+                ready = end
+            if k + 1 < len(bursts):
+                ready += bursts[k + 1]
+        assert next(ran, None) is None
+
+    for process in results['processes']:
+        assert process.io_time == sum(process.bursts[1::2])
+        assert process.waiting_time == process.turnaround_time - process.burst_time - process.io_time
+
+
+def test_io_lets_another_process_run():
+    # P1 computes 3, waits 10 for I/O and computes 4 more; P2 runs meanwhile
+    engine = SchedulerEngine()
+    engine.add_process(1, 0, [3, 10, 4])
+    engine.add_process(2, 1, 5)
+    results = engine.fcfs()
+    assert list(results['schedule']) == [('P1', 0, 3), ('P2', 3, 8), ('P1', 13, 17)]
+    assert results['avg_waiting_time'] == 1.0
+    assert results['idle_time'] == 5
+
+
+def test_resuming_the_same_process_is_free():
+    engine = SchedulerEngine()
+    engine.context_switch = 2
+    engine.add_process(1, 0, 4)
+    engine.add_process(2, 10, 4)
+    results = engine.round_robin()
+    assert list(results['schedule']) == [('CS', 0, 2), ('P1', 2, 6), ('CS', 10, 12), ('P2', 12, 16)]
+    assert results['context_switches'] == 2
+
+
+def test_burst_sequences_must_end_with_cpu():
+    with pytest.raises(ValueError):
+        SchedulerEngine().add_process(1, 0, [3, 10])
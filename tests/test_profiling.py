@@ -0,0 +1,107 @@
+import itertools
+import json
+import random
+
+import pytest
+
+from profiling import EVENTS, PHASES, Profiler
+from scheduler_engine import CallbackSink, SchedulerEngine
+
+ALGORITHMS = ["FCFS", "SJF", "SRTF", "RR", "Priority", "MLFQ", "CFS", "EDF"]
+
+
+def engine_for(seed):
+    rng = random.Random(seed)
+    engine = SchedulerEngine()
+    engine.context_switch = 1
+    for pid in range(50):
+        burst = rng.randint(1, 9) if rng.random() < 0.7 else [rng.randint(1, 5), rng.randint(1, 9), rng.randint(1, 5)]
+        engine.add_process(pid, rng.randint(0, 80), burst, rng.randint(0, 4), rng.randint(5, 50))
+    return engine
+
+
+@pytest.mark.parametrize('algorithm', ALGORITHMS)
+def test_profiling_leaves_the_run_unchanged(algorithm):
+    engine = engine_for(1)
+    expected = engine.run(algorithm)
+    expected = list(expected['schedule']), expected['avg_waiting_time'], expected['context_switches']
+
+    events = []
+    engine.profiler = Profiler(trace=True, on_event=lambda kind, index, time: events.append((kind, index, time)))
+    results = engine.run(algorithm)
+    assert (list(results['schedule']), results['avg_waiting_time'], results['context_switches']) == expected
+
+    counters = engine.profiler.report()['counters']
+    table = engine.table
+    io_bursts = sum(len(phases) // 2 for phases in table.phases if phases)
+    assert counters['arrivals'] == len(table)
+    assert counters['wakeups'] == io_bursts
+    assert counters['bursts'] == len(table) + io_bursts
+    assert counters['context_switches'] == results['context_switches']
+    assert counters['queue_ops'] == (counters['arrivals'] + counters['wakeups'] + counters['preemptions']
+                                     + counters['decisions'])
+
+    # Events arrive in simulated time order, one pick per decision, and
+    # every process arrives before it is picked
+    assert {kind for kind, _, _ in events} <= set(EVENTS)
+    assert [time for _, _, time in events] == sorted(time for _, _, time in events)
+    assert sum(kind == 'pick' for kind, _, _ in events) == counters['decisions']
+    arrived = set()
+    for kind, index, _ in events:
+        if kind == 'arrival':
+            arrived.add(index)
+        elif kind == 'pick':
+            assert index in arrived
+
+
+def test_slices_count_what_the_sink_gets():
+    engine = engine_for(2)
+    emitted = []
+    engine.sink = CallbackSink(lambda label, start, end: emitted.append(label))
+    engine.profiler = Profiler()
+    engine.run("RR")
+    assert engine.profiler.report()['counters']['slices'] == len(emitted)
+
+
+def test_report_adds_up():
+    engine = engine_for(3)
+    engine.profiler = profiler = Profiler(clock=itertools.count(0, 10).__next__)
+    engine.run("SRTF")
+    engine.run("MLFQ")
+    report = profiler.report()
+    assert report['runs'] == 2
+    assert set(report['phases']) == set(PHASES) | {'other'}
+    assert sum(phase['seconds'] for phase in report['phases'].values()) <= report['wall_time']
+    assert report['phases']['results']['calls'] == 2
+    assert report['queue_length']['max'] >= report['queue_length']['mean'] > 0
+
+
+def test_exports_are_well_formed(tmp_path):
+    engine = engine_for(4)
+    engine.profiler = profiler = Profiler(trace=True)
+    engine.run("FCFS")
+    engine.run("CFS")
+
+    profiler.chrome_trace(str(tmp_path / "trace.json"))
+    with open(tmp_path / "trace.json") as f:
+        events = json.load(f)['traceEvents']
+    spans = [event for event in events if event['ph'] == 'X']
+    assert [event['name'] for event in spans if event['cat'] == 'run'] == ['FCFSPolicy', 'CFSPolicy']
+    assert len(spans) == 2 + sum(profiler.calls.values())
+    assert all(event['dur'] >= 0 and event['ts'] >= 0 for event in spans)
+    assert any(event['ph'] == 'C' for event in events)
+
+    profiler.speedscope(str(tmp_path / "run.speedscope.json"))
+    with open(tmp_path / "run.speedscope.json") as f:
+        document = json.load(f)
+    frames = document['shared']['frames']
+    profile = document['profiles'][0]
+    assert [event['at'] for event in profile['events']] == sorted(event['at'] for event in profile['events'])
+    open_frames = []
+    for event in profile['events']:
+        if event['type'] == 'O':
+            open_frames.append(event['frame'])
+        else:
+            assert open_frames.pop() == event['frame']  # Properly nested
+    assert not open_frames
+    assert {frames[event['frame']]['name'] for event in profile['events']} >= {'FCFSPolicy', 'CFSPolicy', 'select'}
@@ -0,0 +1,104 @@
+import random
+
+import pytest
+
+from scheduler_engine import NullSink, ProgressSink, SchedulerEngine
+
+CALLS = [
+    ('fcfs', {}),
+    ('sjf', {'preemptive': False}),
+    ('sjf', {'preemptive': True}),
+    ('priority_scheduling', {'preemptive': False}),
+    ('priority_scheduling', {'preemptive': True}),
+    ('edf', {'preemptive': False}),
+    ('round_robin', {}),
+]
+
+
+class CountingSink(ProgressSink):
+    # Counts the slices a run actually simulates
+    def open(self, table, code):
+        super().open(table, code)
+        self.emitted = []
+        self.first = None
+
+    def emit(self, index, start, end):
+        super().emit(index, start, end)
+        self.emitted.append(self.progress)
+        if self.first is None:
+            self.first = (start, end)
+
+
+def build(processes, context_switch):
+    engine = SchedulerEngine()
+    engine.context_switch = context_switch
+    for process in processes:
+        engine.add_process(*process)
+    return engine
+
+
+def outcome(engine, results):
+    processes = [(p.pid, p.start_time, p.finish_time, p.waiting_time, p.turnaround_time, p.response_time)
+                 for p in results['processes']]
+    metrics = [results[name] for name in ('avg_waiting_time', 'context_switches', 'switch_overhead', 'total_time')]
+    return list(results['schedule']), processes, metrics, engine.current_time
+
+
+def random_process(rng, pid, earliest):
+    return pid, rng.randint(earliest, earliest + 100), rng.randint(1, 9), rng.randint(0, 4), rng.randint(5, 40)
+
+
+@pytest.mark.parametrize('method, options', CALLS)
+@pytest.mark.parametrize('context_switch', [0, 1])
+def test_resumed_run_matches_fresh_run(method, options, context_switch, monkeypatch):
+    # Rerunning after adding processes resumes from a checkpoint taken
+    # before the first new arrival
+    monkeypatch.setattr(SchedulerEngine, 'CHECKPOINT_INTERVAL', 3)
+    rng = random.Random(context_switch)
+    for _ in range(20):
+        processes = [random_process(rng, pid, 0) for pid in range(30)]
+        engine = build(processes, context_switch)
+        getattr(engine, method)(**options)
+        for step in range(3):
+            added = [random_process(rng, 100 + 10 * step + k, 40) for k in range(rng.randint(1, 3))]
+            for process in added:
+                engine.add_process(*process)
+            processes += added
+            resumed = getattr(engine, method)(**options)
+
+            fresh_engine = build(processes, context_switch)
+            assert outcome(engine, resumed) == outcome(fresh_engine, getattr(fresh_engine, method)(**options))
+
+
+def test_resumed_runs_only_simulate_the_rest(monkeypatch):
+    monkeypatch.setattr(SchedulerEngine, 'CHECKPOINT_INTERVAL', 4)
+    rng = random.Random(5)
+    engine = build([(pid, rng.randint(0, 3000), rng.randint(1, 9)) for pid in range(300)], 1)
+    engine.fcfs()
+    engine.add_process(1000, 2900, 5)
+    engine.sink = CountingSink()
+    results = engine.fcfs()
+    emitted = engine.sink.emitted
+    assert 0 < len(emitted) < len(results['schedule']) / 4
+
+    # Progress counts the restored part as done, so it picks up from there
+    start, end = engine.sink.first
+    restored = sum(e - s for label, s, e in results['schedule'] if label != "CS" and e <= start)
+    assert restored / engine.sink.total > 0.75
+    assert emitted[0] == pytest.approx((restored + end - start) / engine.sink.total)
+    assert emitted == sorted(emitted) and emitted[-1] == 1.0
+
+
+def test_runs_without_a_schedule_resume(monkeypatch):
+    monkeypatch.setattr(SchedulerEngine, 'CHECKPOINT_INTERVAL', 4)
+    rng = random.Random(6)
+    processes = [random_process(rng, pid, 0) for pid in range(100)]
+    engine = build(processes, 0)
+    engine.sink = NullSink()
+    engine.sjf()
+    engine.add_process(1000, 90, 5)
+    resumed = engine.sjf()
+
+    fresh = build(processes + [(1000, 90, 5)], 0)
+    fresh.sink = NullSink()
+    assert resumed['avg_waiting_time'] == fresh.sjf()['avg_waiting_time']
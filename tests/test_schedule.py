@@ -0,0 +1,55 @@
+import random
+
+import numpy as np
+import pytest
+
+from scheduler_engine import ProcessTable, Schedule, SchedulerEngine
+
+
+def random_engine(rng, count, fractional):
+    engine = SchedulerEngine()
+    engine.context_switch = 1  # Context-switch entries and idle gaps
+    for pid in range(count):
+        arrival, burst = rng.randint(0, 40), rng.randint(1, 12)
+        if fractional:
+            arrival, burst = arrival / 4, burst / 2 + 0.5
+        engine.add_process(pid, arrival, burst, rng.randint(0, 5))
+    return engine
+
+
+@pytest.mark.parametrize('cpus, fractional', [(1, False), (1, True), (2, False)])
+def test_schedule_queries_match_brute_force(cpus, fractional):
+    rng = random.Random(7)
+    schedule = random_engine(rng, 40, fractional).run("RR", quantum=2, cpus=cpus)['schedule']
+    assert schedule.ordered == (cpus == 1)
+    entries = list(schedule)
+    end = max(stop for _, _, stop in entries)
+
+    for time in np.arange(-1, end + 2, 0.25).tolist():
+        running = [entry for entry in entries if entry[1] <= time < entry[2]]
+        assert schedule.at(time) == (running[0] if running else None), time
+    for _ in range(200):
+        start, stop = sorted(rng.uniform(-1, end + 1) for _ in range(2))
+        if rng.random() < 0.3:
+            start, stop = round(start), round(stop)  # On slice boundaries
+        overlapping = [entry for entry in entries if entry[1] < stop and entry[2] > start]
+        assert list(schedule.between(start, stop)) == overlapping, (start, stop)
+    for index in range(40):
+        label = f"P{index}"
+        assert schedule.slices(index) == [(start, stop) for name, start, stop in entries if name == label]
+
+
+def test_adjacent_slices_of_one_process_merge():
+    table = ProcessTable()
+    table.append(7, 0, 5)
+    table.append(8, 0, 5)
+    schedule = Schedule(table, 'q')
+    for index, start, end in [(0, 0, 2), (0, 2, 3), (-1, 3, 4), (1, 4, 6), (1, 7, 8)]:
+        schedule.append(index, start, end)
+    assert schedule == [('P7', 0, 3), ('CS', 3, 4), ('P8', 4, 6), ('P8', 7, 8)]
+    assert schedule.at(6) is None and schedule.at(7) == ('P8', 7, 8)
+
+    separate = Schedule(table, 'q', coalesce=False)
+    separate.append(0, 0, 2)
+    separate.append(0, 2, 3)
+    assert len(separate) == 2
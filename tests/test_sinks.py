@@ -0,0 +1,90 @@
+import random
+
+import pytest
+
+from scheduler_engine import BinaryFileSink, CallbackSink, GeneratorSink, NullSink, SchedulerEngine, read_schedule
+
+ALGORITHMS = ["FCFS", "SRTF", "RR", "Priority", "MLFQ", "CFS"]
+
+
+def engine_for(seed, fractional=False, context_switch=1):
+    rng = random.Random(seed)
+    engine = SchedulerEngine()
+    engine.context_switch = context_switch
+    for pid in range(60):
+        arrival, burst = rng.randint(0, 80), rng.randint(1, 10)
+        if fractional:
+            arrival, burst = arrival / 4, burst / 2
+        engine.add_process(pid, arrival, burst, rng.randint(0, 4))
+    return engine
+
+
+def coalesce(slices):
+    # Sinks get every slice; the in-memory schedule merges a slice into the
+    # previous one of the same process
+    merged = []
+    for owner, start, end in slices:
+        if merged and owner != "CS" and merged[-1][0] == owner and merged[-1][2] == start:
+            merged[-1] = (owner, merged[-1][1], end)
+        else:
+            merged.append((owner, start, end))
+    return merged
+
+
+@pytest.mark.parametrize('algorithm', ALGORITHMS)
+def test_streaming_sinks_see_the_schedule(algorithm):
+    engine = engine_for(1, context_switch=0)
+    expected = list(engine.run(algorithm)['schedule'])
+
+    called = []
+    engine.sink = CallbackSink(lambda label, start, end: called.append((label, start, end)))
+    engine.run(algorithm)
+    assert coalesce(called) == expected
+
+    sent = []
+
+    def collect():
+        while True:
+            sent.append((yield))
+
+    engine.sink = GeneratorSink(collect())
+    engine.run(algorithm)
+    assert coalesce(sent) == expected
+
+
+@pytest.mark.parametrize('fractional', [False, True])
+def test_binary_file_sink_round_trips(tmp_path, fractional):
+    engine = engine_for(2, fractional)
+    expected = list(engine.run("RR", quantum=2)['schedule'])
+
+    path = tmp_path / "schedule.bin"
+    engine.sink = BinaryFileSink(str(path), buffer_size=64)
+    engine.run("RR")
+    records = read_schedule(str(path))
+    labels = ["CS" if index < 0 else f"P{engine.table.pid[index]}" for index in records['index'].tolist()]
+    assert coalesce(zip(labels, records['start'].tolist(), records['end'].tolist())) == expected
+
+
+@pytest.mark.parametrize('algorithm', ALGORITHMS)
+def test_online_metrics_match_results(algorithm):
+    engine = engine_for(3)
+    results = engine.run(algorithm)
+    engine.sink = CallbackSink(lambda label, start, end: None)
+    engine.run(algorithm)
+    online = engine.online_metrics.snapshot()
+    assert online['completed'] == len(results['processes'])
+    for name in ('waiting_time', 'turnaround_time', 'response_time'):
+        assert online[f'avg_{name}'] == pytest.approx(results[f'avg_{name}'])
+        assert online[f'std_{name}'] == pytest.approx(results[f'std_{name}'])
+        assert online[f'max_{name}'] == results[f'max_{name}']
+
+
+def test_null_sink_keeps_the_metrics():
+    engine = engine_for(4)
+    results = engine.run("SRTF")
+    engine.sink = NullSink()
+    dropped = engine.run("SRTF")
+    assert dropped['schedule'] is None
+    for name, value in results.items():
+        if name not in ('schedule', 'processes'):
+            assert dropped[name] == value, name
@@ -0,0 +1,101 @@
+import json
+import random
+from collections import defaultdict
+
+import pytest
+
+import trace_io
+from scheduler_engine import SchedulerEngine
+
+LAYOUTS = [
+    {'queues': "global"},
+    {'queues': "per-cpu", 'balance': "steal"},
+    {'queues': "per-cpu", 'balance': "periodic", 'balance_interval': 5},
+    {'queues': "per-cpu", 'balance': None},
+]
+
+
+def engine_for(seed, count=80, context_switch=0):
+    rng = random.Random(seed)
+    engine = SchedulerEngine()
+    engine.context_switch = context_switch
+    for pid in range(count):
+        engine.add_process(pid, rng.randint(0, 60), rng.randint(1, 12), rng.randint(0, 4),
+                           deadline=rng.randint(5, 60), period=rng.choice([10, 20, 40]))
+    return engine
+
+
+def check_invariants(engine, results, cpus):
+    table = engine.table
+    rows = {f"P{pid}": i for i, pid in enumerate(table.pid)}
+    by_core, by_process = defaultdict(list), defaultdict(list)
+    assert len(results['cores']) == len(results['schedule'])
+    for (label, start, end), core in zip(results['schedule'], results['cores']):
+        assert 0 <= core < cpus and start <= end
+        by_core[core].append((start, end))
+        if label != "CS":
+            assert start >= table.arrival[rows[label]]
+            by_process[label].append((start, end))
+
+    # A CPU does one thing at a time, and a process runs on one CPU at a time
+    for slices in list(by_core.values()) + list(by_process.values()):
+        slices.sort()
+        assert all(end <= next_start for (_, end), (next_start, _) in zip(slices, slices[1:]))
+
+    # Every process runs for exactly its burst and completes
+    assert len(results['processes']) == len(table)
+    for label, i in rows.items():
+        assert sum(end - start for start, end in by_process[label]) == table.burst[i]
+    assert sum(results['core_busy_time']) == results['busy_time'] == sum(table.burst)
+    capacity = cpus * results['total_time']
+    assert results['idle_time'] + results['busy_time'] + results['switch_overhead'] == capacity
+
+
+@pytest.mark.parametrize('algorithm', SchedulerEngine.SMP_ALGORITHMS)
+@pytest.mark.parametrize('layout', LAYOUTS)
+@pytest.mark.parametrize('cpus, context_switch', [(2, 0), (4, 1)])
+def test_smp_invariants(algorithm, layout, cpus, context_switch):
+    engine = engine_for(cpus, context_switch=context_switch)
+    check_invariants(engine, engine.run(algorithm, cpus=cpus, **layout), cpus)
+
+
+@pytest.mark.parametrize('layout', LAYOUTS)
+def test_pinned_processes_stay_on_their_cpu(layout):
+    engine = engine_for(5)
+    affinity = [pid % 4 - 1 for pid in engine.table.pid]  # A quarter float, the rest pinned
+    results = engine.run("SRTF", cpus=3, affinity=affinity, **layout)
+    check_invariants(engine, results, 3)
+    for (label, _, _), core in zip(results['schedule'], results['cores']):
+        pinned = affinity[int(label[1:])]
+        assert pinned < 0 or core == pinned
+
+
+@pytest.mark.parametrize('algorithm', [a for a in SchedulerEngine.SMP_ALGORITHMS if a != "RR"])
+@pytest.mark.parametrize('context_switch', [0, 1])
+def test_one_cpu_matches_the_single_cpu_run(algorithm, context_switch):
+    engine = engine_for(6, context_switch=context_switch)
+    single = engine.run(algorithm)
+    expected = list(single['schedule']), single['avg_waiting_time'], single['context_switches']
+    smp = engine.run(algorithm, cpus=1, queues="global")
+    assert (list(smp['schedule']), smp['avg_waiting_time'], smp['context_switches']) == expected
+
+
+def test_enough_cpus_never_keep_a_process_waiting():
+    engine = engine_for(7, count=20)
+    results = engine.run("FCFS", cpus=20)
+    assert results['max_waiting_time'] == 0
+    assert results['total_time'] == max(a + b for a, b in zip(engine.table.arrival, engine.table.burst))
+
+
+def test_smp_metrics_write_as_json_and_csv(tmp_path):
+    engine = engine_for(8)
+    results = engine.run("RR", cpus=2)
+    trace_io.write_metrics(str(tmp_path / "metrics.jsonl"), results)
+    trace_io.write_metrics(str(tmp_path / "metrics.csv"), results)
+    with open(tmp_path / "metrics.jsonl") as f:
+        metrics = json.load(f)
+    assert 'cores' not in metrics
+    assert metrics['core_busy_time'] == results['core_busy_time']
+    with open(tmp_path / "metrics.csv") as f:
+        names = [row.split(',')[0] for row in f.read().splitlines()[1:]]
+    assert 'migrations' in names and 'core_busy_time' not in names
@@ -0,0 +1,123 @@
+import json
+
+import numpy as np
+import pytest
+
+import trace_io
+from scheduler_engine import ProcessTable, SchedulerEngine
+from workload import WorkloadGenerator
+
+EXTENSIONS = ['csv', 'jsonl', 'bin']
+
+
+def table_values(table):
+    values = {name: list(getattr(table, name)) for name in ProcessTable.COLUMNS}
+    for name in ProcessTable.OPTIONAL_COLUMNS:
+        column = getattr(table, name)
+        values[name] = None if column is None else list(column)
+    return values
+
+
+def round_trip(tmp_path, table, extension):
+    path = str(tmp_path / f"trace.{extension}")
+    trace_io.write_trace(path, table)
+    return trace_io.read_trace(path)
+
+
+@pytest.mark.parametrize('extension', EXTENSIONS)
+@pytest.mark.parametrize('integer', [True, False])
+def test_generated_traces_round_trip(tmp_path, extension, integer):
+    table = WorkloadGenerator(seed=1, integer=integer, deadline_slack=3).table(500)
+    loaded = round_trip(tmp_path, table, extension)
+    assert table_values(loaded) == table_values(table)
+
+    engine, reloaded = SchedulerEngine(), SchedulerEngine()
+    engine.table, reloaded.table = table, loaded
+    assert list(reloaded.run("RR")['schedule']) == list(engine.run("RR")['schedule'])
+
+
+@pytest.mark.parametrize('extension', EXTENSIONS)
+def test_optional_columns_keep_their_gaps_and_type(tmp_path, extension):
+    table = ProcessTable()
+    table.append(1, 0, 5, 1, deadline=7)
+    table.append(2, 1.5, 3, 0)
+    table.append(3, 2, 4, 2, deadline=9, period=12)
+    loaded = round_trip(tmp_path, table, extension)
+    assert table_values(loaded) == table_values(table)
+    assert all(isinstance(value, int) for value in loaded.deadline if value is not None)
+
+
+@pytest.mark.parametrize('extension', ['csv', 'jsonl'])
+def test_text_traces_keep_string_pids(tmp_path, extension):
+    table = ProcessTable()
+    for k, pid in enumerate(["web", "db", "cron"]):
+        table.append(pid, k, k + 1, 0)
+    assert table_values(round_trip(tmp_path, table, extension)) == table_values(table)
+
+
+def test_binary_traces_need_numeric_pids(tmp_path):
+    table = ProcessTable()
+    table.append("web", 0, 1)
+    with pytest.raises(ValueError):
+        trace_io.write_trace(str(tmp_path / "trace.bin"), table)
+
+
+@pytest.mark.parametrize('extension', EXTENSIONS)
+def test_empty_traces_round_trip(tmp_path, extension):
+    loaded = round_trip(tmp_path, ProcessTable(), extension)
+    assert len(loaded) == 0
+    engine = SchedulerEngine()
+    engine.table = loaded
+    assert engine.run("FCFS")['schedule'] == []
+
+
+@pytest.mark.parametrize('extension', ['csv', 'jsonl'])
+def test_schedules_results_and_metrics_round_trip(tmp_path, extension):
+    engine = SchedulerEngine()
+    engine.table = WorkloadGenerator(seed=2).table(50)
+    engine.context_switch = 1
+    results = engine.run("RR", quantum=3)
+
+    path = str(tmp_path / f"schedule.{extension}")
+    trace_io.write_schedule(path, results['schedule'])
+    assert trace_io.read_schedule(path) == list(results['schedule'])
+    trace_io.write_schedule(path, [])
+    assert trace_io.read_schedule(path) == []
+
+    path = str(tmp_path / f"results.{extension}")
+    trace_io.write_results(path, results)
+    columns = results['processes'].columns()
+    for name, values in trace_io.read_results(path).items():
+        np.testing.assert_array_equal(values, columns[name])
+
+    path = str(tmp_path / f"metrics.{extension}")
+    trace_io.write_metrics(path, results)
+    with open(path) as f:
+        if extension == 'jsonl':
+            metrics = json.loads(f.read())
+        else:
+            metrics = {name: float(value) for name, value in list(trace_io.csv.reader(f))[1:]}
+    assert metrics['avg_waiting_time'] == pytest.approx(results['avg_waiting_time'])
+    assert metrics['context_switches'] == results['context_switches']
+
+
+@pytest.mark.parametrize('extension', ['csv', 'jsonl'])
+def test_io_burst_sequences_round_trip(tmp_path, extension):
+    table = ProcessTable()
+    table.append(1, 0, [3, 10, 4])
+    table.append(2, 1, 5)
+    table.append(3, 2, [1.5, 2, 1, 0.5, 2])
+    loaded = round_trip(tmp_path, table, extension)
+    assert loaded.phases == table.phases
+    assert table_values(loaded) == table_values(table)
+
+    engine, reloaded = SchedulerEngine(), SchedulerEngine()
+    engine.table, reloaded.table = table, loaded
+    assert reloaded.run("FCFS")['avg_waiting_time'] == engine.run("FCFS")['avg_waiting_time']
+
+
+def test_binary_traces_refuse_io_bursts(tmp_path):
+    table = ProcessTable()
+    table.append(1, 0, [3, 10, 4])
+    with pytest.raises(ValueError):
+        trace_io.write_trace(str(tmp_path / "trace.bin"), table)
@@ -0,0 +1,339 @@
+import argparse
+import csv
+import json
+import numbers
+import os
+import struct
+from array import array
+
+import numpy as np
+
+import scheduler_engine
+from scheduler_engine import ProcessTable, Schedule, SchedulerEngine
+
+# Binary files: MAGIC, a little-endian u32 header length, a JSON header
+# {"rows": n, "columns": [[name, "q" | "d"], ...]} padded with spaces so the
+# data starts on a 64-byte boundary, then each column as n contiguous
+# little-endian int64 or float64 values.
+MAGIC = b'CPUTRACE'
+_ALIGN = 64
+
+TRACE_COLUMNS = ('pid', 'arrival_time', 'burst_time', 'priority')
+# Written only when the table has them; NaN (or an empty cell) means none
+OPTIONAL_TRACE_COLUMNS = ('deadline', 'period')
+# Written only when some process does I/O: its CPU/I/O burst sequence (see
+# ProcessTable.append), a JSON list or space-separated in a CSV cell, empty
+# for plain processes. Binary traces cannot hold it.
+BURSTS_COLUMN = 'bursts'
+_TABLE_COLUMNS = dict(zip(TRACE_COLUMNS, ProcessTable.COLUMNS))
+_FORMATS = {'.csv': 'csv', '.jsonl': 'jsonl', '.ndjson': 'jsonl', '.bin': 'binary'}
+
+
+def _format(path, format):
+    if format is None:
+        format = _FORMATS.get(os.path.splitext(path)[1].lower())
+        if format is None:
+            raise ValueError(f"Cannot tell the format of {path}; pass format='csv', 'jsonl' or 'binary'")
+    if format not in ('csv', 'jsonl', 'binary'):
+        raise ValueError(f"Unknown format: {format}")
+    return format
+
+
+def _numeric_code(values):
+    dtype = np.asarray(values).dtype
+    if dtype.kind in 'biu':
+        return 'q'
+    if dtype.kind == 'f':
+        return 'd'
+    return None
+
+
+def _as_column(values):
+    # Numeric lists become NumPy arrays so they load in bulk; anything else
+    # (e.g. string pids, or burst sequences) stays a list
+    try:
+        converted = np.array(values)
+    except (ValueError, OverflowError):
+        return values
+    return converted if converted.dtype.kind in 'iuf' and converted.ndim == 1 else values
+
+
+def _parse_text_column(values):
+    # CSV cells: integers if every cell is one, else floats, else strings
+    cells = np.array(values, dtype=str)
+    for dtype in (np.int64, np.float64):
+        try:
+            return cells.astype(dtype)
+        except (ValueError, OverflowError):
+            pass
+    return list(values)
+
+
+def _python_values(values):
+    return values.tolist() if isinstance(values, np.ndarray) else list(values)
+
+
+def _write_columns(path, columns, format):
+    names = list(columns)
+    if format == 'binary':
+        codes = {}
+        for name in names:
+            codes[name] = _numeric_code(columns[name])
+            if codes[name] is None:
+                raise ValueError(f"Column {name!r} is not numeric and cannot be written in binary format")
+        rows = len(columns[names[0]]) if names else 0
+        header = json.dumps({'rows': rows, 'columns': [[name, codes[name]] for name in names]}).encode()
+        padding = -(len(MAGIC) + 4 + len(header)) % _ALIGN
+        header += b' ' * padding
+        with open(path, 'wb') as f:
+            f.write(MAGIC + struct.pack('<I', len(header)) + header)
+            for name in names:
+                dtype = '<i8' if codes[name] == 'q' else '<f8'
+                values = np.ascontiguousarray(columns[name], dtype=dtype)
+                f.write(memoryview(values).cast('B'))
+        return
+
+    rows = zip(*(_python_values(columns[name]) for name in names))
+    if format == 'csv':
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(names)
+            writer.writerows(rows)
+    else:
+        with open(path, 'w') as f:
+            for row in rows:
+                f.write(json.dumps(dict(zip(names, row))))
+                f.write('\n')
+
+
+def _read_columns(path, format):
+    # Returns {name: column}. Binary columns are zero-copy typed memoryviews
+    # over a read-only np.memmap of the file.
+    if format == 'binary':
+        with open(path, 'rb') as f:
+            magic = f.read(len(MAGIC))
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a binary trace file")
+            header_length, = struct.unpack('<I', f.read(4))
+            header = json.loads(f.read(header_length))
+        rows = header['rows']
+        offset = len(MAGIC) + 4 + header_length
+        data = np.memmap(path, dtype=np.uint8, mode='r', offset=offset) if rows else None
+        columns = {}
+        for position, (name, code) in enumerate(header['columns']):
+            if rows:
+                view = data[position * rows * 8:(position + 1) * rows * 8]
+                columns[name] = memoryview(view).cast(code)
+            else:
+                columns[name] = array(code)
+        return columns
+
+    if format == 'csv':
+        with open(path, newline='') as f:
+            reader = csv.reader(f)
+            names = next(reader, [])
+            values = list(zip(*reader)) or [()] * len(names)
+        return {name: _parse_text_column(column) for name, column in zip(names, values)}
+
+    columns = {}
+    with open(path) as f:
+        rows = [json.loads(line) for line in f if line.strip()]
+    for row in rows:
+        for name in row:
+            columns.setdefault(name, [])
+    for name in columns:
+        columns[name] = _as_column([row.get(name) for row in rows])
+    return columns
+
+
+def _optional_values(values):
+    # An optional column as read back: NaN, null or a blank cell means the
+    # row has no value
+    code = None if values is None else _numeric_code(values)
+    if values is None or code == 'q':
+        return values
+    if code == 'd':
+        missing = np.isnan(np.asarray(values, dtype=np.float64))
+        if not missing.any():
+            return values
+        values = [None if gap else value for gap, value in zip(missing.tolist(), np.asarray(values).tolist())]
+    else:
+        values = [None if value in ('', None) else float(value) if isinstance(value, str) else value
+                  for value in values]
+    # Gaps are written as NaN, which makes the column float; integer
+    # columns come back as integers
+    if all(value is None or float(value).is_integer() for value in values):
+        values = [None if value is None else int(value) for value in values]
+    return values
+
+
+def _phases_values(values):
+    # A bursts column as read back: a burst sequence per row, or None
+    if values is None:
+        return None
+    phases = []
+    for value in _python_values(values):
+        if isinstance(value, str):
+            parts = value.split()
+            value = _parse_text_column(parts) if parts else None
+            if isinstance(value, list):
+                raise ValueError(f"Burst sequences are numbers separated by spaces, not {' '.join(parts)!r}")
+            if value is not None:
+                value = value.tolist()
+        elif isinstance(value, numbers.Real):
+            value = [value]
+        if value and len(value) % 2 == 0:
+            raise ValueError("Burst sequences alternate CPU and I/O bursts and start and end with CPU")
+        phases.append(tuple(value) if value else None)
+    return phases if any(phases) else None
+
+
+def add_deadlines(table, slack):
+    # Give every process without a deadline one of slack times its burst,
+    # as WorkloadGenerator(deadline_slack=...) does
+    if slack < 1:
+        raise ValueError("A slack below 1 gives deadlines shorter than the bursts")
+    bursts = np.asarray(table.burst)
+    deadlines = bursts * slack
+    if bursts.dtype.kind in 'iu':
+        deadlines = np.ceil(deadlines).astype(np.int64)
+    table.fill('deadline', deadlines)
+
+
+def _table_columns(workload):
+    table = workload.table if isinstance(workload, SchedulerEngine) else workload
+    columns = {name: getattr(table, column) for name, column in _TABLE_COLUMNS.items()}
+    for name in OPTIONAL_TRACE_COLUMNS:
+        column = getattr(table, name)
+        if column is not None:
+            if not isinstance(column, (array, memoryview)):
+                column = np.asarray(column, dtype=np.float64)  # None as NaN
+            columns[name] = column
+    if table.phases is not None and any(table.phases):
+        columns[BURSTS_COLUMN] = [list(phases) if phases else None for phases in table.phases]
+    return columns
+
+
+def write_trace(path, workload, format=None):
+    # Write a ProcessTable (or an engine's workload) as a process trace
+    format = _format(path, format)
+    columns = _table_columns(workload)
+    phases = columns.get(BURSTS_COLUMN)
+    if phases is not None:
+        if format == 'binary':
+            raise ValueError("Processes with I/O bursts cannot be written in binary format; use csv or jsonl")
+        if format == 'csv':
+            columns[BURSTS_COLUMN] = [' '.join(map(str, value)) if value else '' for value in phases]
+    _write_columns(path, columns, format)
+
+
+def read_trace(path, format=None):
+    # Read a process trace into a ProcessTable. Binary traces are memory
+    # mapped, so even very large ones are ready to schedule immediately.
+    format = _format(path, format)
+    columns = _read_columns(path, format)
+    if format == 'jsonl' and not columns:
+        columns = {name: [] for name in TRACE_COLUMNS}  # No rows, so no names either
+    missing = [name for name in TRACE_COLUMNS[:3] if name not in columns]
+    if missing:
+        raise ValueError(f"{path} is missing trace columns: {', '.join(missing)}")
+    optional = [_optional_values(columns.get(name)) for name in OPTIONAL_TRACE_COLUMNS]
+    phases = _phases_values(columns.get(BURSTS_COLUMN))
+    if format == 'binary':
+        if 'priority' not in columns:
+            columns['priority'] = array('q', [0]) * len(columns['pid'])
+        table = ProcessTable.from_columns(*(columns[name] for name in TRACE_COLUMNS))
+        table.deadline, table.period = optional
+        return table
+    table = ProcessTable()
+    table.extend(*(columns.get(name) for name in TRACE_COLUMNS), *optional)
+    table.phases = phases  # burst_time holds each sequence's CPU total
+    return table
+
+
+def load_trace(path, format=None):
+    engine = SchedulerEngine()
+    engine.table = read_trace(path, format)
+    engine.reset()
+    return engine
+
+
+def write_schedule(path, schedule, format=None):
+    # Write (process, start, end) slices. Binary schedules are written while
+    # simulating, with BinaryFileSink.
+    format = _format(path, format)
+    if format == 'binary':
+        raise ValueError("Write binary schedules during the run with BinaryFileSink")
+    if isinstance(schedule, Schedule):
+        columns = schedule.columns()
+    else:
+        processes, starts, ends = zip(*schedule) if schedule else ((), (), ())
+        columns = {'process': processes, 'start': starts, 'end': ends}
+    _write_columns(path, columns, format)
+
+
+def read_schedule(path, format=None):
+    format = _format(path, format)
+    if format == 'binary':
+        return scheduler_engine.read_schedule(path)
+    columns = _read_columns(path, format)
+    return list(zip(*(_python_values(columns.get(name, [])) for name in ('process', 'start', 'end'))))
+
+
+def write_results(path, results, format=None):
+    # One row per completed process: trace columns plus start, finish,
+    # waiting, turnaround and response times
+    _write_columns(path, results['processes'].columns(), _format(path, format))
+
+
+def read_results(path, format=None):
+    return _read_columns(path, _format(path, format))
+
+
+def write_metrics(path, results, format=None):
+    # Metrics as one JSON object (jsonl) or metric,value rows (csv): the
+    # scalar metrics, plus per-CPU lists in jsonl. The schedule, processes
+    # and CPU of every schedule entry are written by the other functions.
+    format = _format(path, format)
+    metrics = {}
+    for key, value in results.items():
+        if key in ('schedule', 'processes', 'cores'):
+            continue
+        if isinstance(value, (list, tuple, array)):
+            if format == 'jsonl':
+                metrics[key] = [item.item() if hasattr(item, 'item') else item for item in value]
+        else:
+            metrics[key] = value.item() if hasattr(value, 'item') else value
+    if format == 'binary':
+        raise ValueError("Metrics are written as csv or jsonl")
+    if format == 'jsonl':
+        with open(path, 'w') as f:
+            f.write(json.dumps(metrics))
+            f.write('\n')
+    else:
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(('metric', 'value'))
+            writer.writerows(metrics.items())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert a process trace between csv, jsonl and binary")
+    parser.add_argument('source')
+    parser.add_argument('destination')
+    parser.add_argument('--deadline-slack', type=float, default=None,
+                        help="give processes without a deadline one of this many times their burst")
+    args = parser.parse_args(argv)
+    table = read_trace(args.source)
+    if args.deadline_slack is not None:
+        if args.deadline_slack < 1:
+            parser.error("--deadline-slack must be at least 1")
+        add_deadlines(table, args.deadline_slack)
+    try:
+        write_trace(args.destination, table)
+    except ValueError as e:
+        parser.error(str(e))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+import numpy as np
+
+from scheduler_engine import ProcessTable, SchedulerEngine
+
+ARRIVALS = ('poisson', 'uniform', 'constant', 'batch')
+BURSTS = ('exponential', 'lognormal', 'pareto', 'bimodal', 'constant')
+PRIORITIES = ('zipf', 'uniform', 'constant')
+
+
+class WorkloadGenerator:
+    # Seeded synthetic workloads, generated with NumPy a chunk at a time.
+    #
+    # Arrivals are a renewal process with the given rate (processes per time
+    # unit): 'poisson' (exponential gaps), 'uniform' gaps in [0, 2/rate],
+    # 'constant' gaps of 1/rate, or 'batch' (everything at time 0).
+    # Bursts have mean burst_mean: 'exponential', 'lognormal' (log-space
+    # sigma burst_sigma), 'pareto' (shape pareto_shape > 1), 'bimodal' (a
+    # bimodal_long share of jobs bimodal_ratio times longer than the rest)
+    # or 'constant'. Priorities are 0..priority_levels-1; under 'zipf' the
+    # most common rank is the lowest priority (largest value).
+    # With deadline_slack, every process also gets a deadline of that many
+    # times its burst after arrival (e.g. 3 for an SLO of 3x the service
+    # time), for EDF and the deadline metrics.
+    #
+    # The generator is stateful: each call continues the pid counter and
+    # arrival clock, so a workload can be produced lazily in chunks. Every
+    # column draws from its own stream, so the same seed gives the same
+    # processes however the workload is chunked.
+    def __init__(self, seed=None, arrival='poisson', rate=0.1, burst='exponential', burst_mean=8.0,
+                 burst_sigma=1.0, pareto_shape=1.5, bimodal_long=0.1, bimodal_ratio=10.0,
+                 priority='zipf', priority_levels=10, zipf_exponent=1.2, integer=True, deadline_slack=None):
+        if arrival not in ARRIVALS:
+            raise ValueError(f"Unknown arrival process: {arrival}")
+        if burst not in BURSTS:
+            raise ValueError(f"Unknown burst distribution: {burst}")
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority distribution: {priority}")
+        if burst == 'pareto' and pareto_shape <= 1:
+            raise ValueError("Pareto bursts need pareto_shape > 1 for a finite mean")
+        if deadline_slack is not None and deadline_slack < 1:
+            raise ValueError("deadline_slack below 1 gives deadlines shorter than the bursts")
+
+        self.arrival = arrival
+        self.rate = rate
+        self.burst = burst
+        self.burst_mean = burst_mean
+        self.burst_sigma = burst_sigma
+        self.pareto_shape = pareto_shape
+        self.bimodal_long = bimodal_long
+        self.bimodal_ratio = bimodal_ratio
+        self.priority = priority
+        self.priority_levels = priority_levels
+        self.zipf_exponent = zipf_exponent
+        self.integer = integer
+        self.deadline_slack = deadline_slack
+
+        arrival_seed, burst_seed, mode_seed, priority_seed = np.random.SeedSequence(seed).spawn(4)
+        self._arrival_rng = np.random.default_rng(arrival_seed)
+        self._burst_rng = np.random.default_rng(burst_seed)
+        self._mode_rng = np.random.default_rng(mode_seed)
+        self._priority_rng = np.random.default_rng(priority_seed)
+        self._next_pid = 0
+        self._clock = 0.0
+
+    def _arrivals(self, n):
+        rng = self._arrival_rng
+        if self.arrival == 'poisson':
+            gaps = rng.exponential(1.0 / self.rate, n)
+        elif self.arrival == 'uniform':
+            gaps = rng.uniform(0.0, 2.0 / self.rate, n)
+        elif self.arrival == 'constant':
+            gaps = np.full(n, 1.0 / self.rate)
+        else:
+            gaps = np.zeros(n)
+        # Accumulate from the running clock in one sequential pass, so
+        # chunked and one-shot workloads round identically
+        gaps = np.concatenate(([self._clock], gaps))
+        arrivals = np.add.accumulate(gaps)[1:]
+        if n:
+            self._clock = arrivals[-1]
+        return np.floor(arrivals).astype(np.int64) if self.integer else arrivals
+
+    def _bursts(self, n):
+        rng = self._burst_rng
+        mean = self.burst_mean
+        if self.burst == 'exponential':
+            bursts = rng.exponential(mean, n)
+        elif self.burst == 'lognormal':
+            bursts = rng.lognormal(np.log(mean) - self.burst_sigma ** 2 / 2, self.burst_sigma, n)
+        elif self.burst == 'pareto':
+            scale = mean * (self.pareto_shape - 1) / self.pareto_shape
+            bursts = scale * (1.0 + rng.pareto(self.pareto_shape, n))
+        elif self.burst == 'bimodal':
+            # Short and long modes are exponential and keep the overall mean
+            short = mean / (1 - self.bimodal_long + self.bimodal_long * self.bimodal_ratio)
+            long_jobs = self._mode_rng.random(n) < self.bimodal_long
+            bursts = rng.exponential(1.0, n) * np.where(long_jobs, short * self.bimodal_ratio, short)
+        else:
+            bursts = np.full(n, float(mean))
+        if self.integer:
+            return np.maximum(1, np.ceil(bursts)).astype(np.int64)
+        return bursts
+
+    def _priorities(self, n):
+        levels = self.priority_levels
+        if self.priority == 'zipf':
+            weights = 1.0 / np.arange(1, levels + 1) ** self.zipf_exponent
+            cdf = np.cumsum(weights / weights.sum())
+            ranks = np.minimum(np.searchsorted(cdf, self._priority_rng.random(n), side='right'), levels - 1)
+            return (levels - 1 - ranks).astype(np.int64)
+        if self.priority == 'uniform':
+            return self._priority_rng.integers(0, levels, n)
+        return np.zeros(n, dtype=np.int64)
+
+    def columns(self, n):
+        # The next n processes as NumPy columns
+        pids = np.arange(self._next_pid, self._next_pid + n, dtype=np.int64)
+        self._next_pid += n
+        columns = {
+            'pids': pids,
+            'arrival_times': self._arrivals(n),
+            'burst_times': self._bursts(n),
+            'priorities': self._priorities(n),
+        }
+        if self.deadline_slack is not None:
+            deadlines = columns['burst_times'] * self.deadline_slack
+            columns['deadlines'] = np.ceil(deadlines).astype(np.int64) if self.integer else deadlines
+        return columns
+
+    def table(self, n):
+        table = ProcessTable()
+        table.extend(**self.columns(n))
+        return table
+
+    def chunks(self, n, chunk_size=1 << 20):
+        # Lazily yield the next n processes as tables of up to chunk_size rows
+        while n > 0:
+            size = min(n, chunk_size)
+            n -= size
+            yield self.table(size)
+
+    def fill(self, engine, n):
+        # Add the next n processes to an existing SchedulerEngine
+        engine.add_processes(**self.columns(n))
+        return engine
+
+    def engine(self, n):
+        return self.fill(SchedulerEngine(), n)